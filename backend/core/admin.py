@@ -1,7 +1,16 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from .models import Document
 
 
+class DocumentChangeList(ChangeList):
+    """Changelist that only loads the columns shown in list_display."""
+
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        return queryset.only(*self.model_admin.list_display)
+
+
 @admin.register(Document)
 class DocumentAdmin(admin.ModelAdmin):
     list_display = ['id', 'title', 'document_type', 'source', 'created_at']
@@ -23,3 +32,7 @@ class DocumentAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+    def get_changelist(self, request, **kwargs):
+        # Keep the JSON payload columns out of changelist page loads
+        return DocumentChangeList
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+from watson.db import PostgresRunSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        # jsonb_path_ops keeps the index small and serves raw_content__contains (@>)
+        PostgresRunSQL(
+            sql='CREATE INDEX IF NOT EXISTS doc_raw_gin ON core_document USING gin (raw_content jsonb_path_ops);',
+            reverse_sql='DROP INDEX IF EXISTS doc_raw_gin;',
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:26
+
+from django.db import migrations, models
+
+from watson.db import PostgresRunSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_document_raw_content_gin'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='document_type',
+            field=models.CharField(blank=True, db_index=True, help_text='Type of clinical document (e.g., session_note, intake, assessment)', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='source',
+            field=models.CharField(blank=True, db_index=True, help_text='Source system or origin of the document', max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-created_at'], name='doc_created_at_idx'),
+        ),
+        # Trigram indexes for DocumentViewSet search. icontains compiles to
+        # UPPER(col::text) LIKE UPPER(%s) on PostgreSQL, so index the same
+        # expression. Every search field needs one for the OR to use indexes.
+        # The pg_trgm extension is left installed on reverse.
+        PostgresRunSQL(
+            sql=[
+                'CREATE EXTENSION IF NOT EXISTS pg_trgm;',
+                'CREATE INDEX IF NOT EXISTS doc_title_trgm ON core_document USING gin ((UPPER(title::text)) gin_trgm_ops);',
+                'CREATE INDEX IF NOT EXISTS doc_source_trgm ON core_document USING gin ((UPPER(source::text)) gin_trgm_ops);',
+                'CREATE INDEX IF NOT EXISTS doc_document_type_trgm ON core_document USING gin ((UPPER(document_type::text)) gin_trgm_ops);',
+            ],
+            reverse_sql=[
+                'DROP INDEX IF EXISTS doc_title_trgm;',
+                'DROP INDEX IF EXISTS doc_source_trgm;',
+                'DROP INDEX IF EXISTS doc_document_type_trgm;',
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:29
+
+import watson.encoders
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_document_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='metadata',
+            field=models.JSONField(blank=True, decoder=watson.encoders.OrjsonDecoder, default=dict, encoder=watson.encoders.OrjsonEncoder, help_text='Additional metadata about the document'),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='raw_content',
+            field=models.JSONField(decoder=watson.encoders.OrjsonDecoder, encoder=watson.encoders.OrjsonEncoder, help_text='Raw JSON content of the clinical note'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:31
+
+import django.db.models.fields.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_document_orjson_json_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('patient_id', 'raw_content'), name='doc_patient_id_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 import uuid
 from django.db import models
+from django.db.models.fields.json import KeyTextTransform
+
+from watson.encoders import OrjsonDecoder, OrjsonEncoder
 
 
 class Document(models.Model):
@@ -16,16 +19,21 @@ class Document(models.Model):
     source = models.CharField(
         max_length=100,
         blank=True,
+        db_index=True,
         help_text="Source system or origin of the document"
     )
     document_type = models.CharField(
         max_length=50,
         blank=True,
+        db_index=True,
         help_text="Type of clinical document (e.g., session_note, intake, assessment)"
     )
 
-    # Raw content stored as JSON
+    # Raw content stored as JSON. On PostgreSQL a jsonb_path_ops GIN index
+    # (migration 0002) serves raw_content__contains lookups.
     raw_content = models.JSONField(
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         help_text="Raw JSON content of the clinical note"
     )
 
@@ -33,6 +41,8 @@ class Document(models.Model):
     metadata = models.JSONField(
         default=dict,
         blank=True,
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         help_text="Additional metadata about the document"
     )
 
@@ -42,8 +52,23 @@ class Document(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='doc_created_at_idx'),
+            # Expression index on raw_content->>'patient_id'; see patient_id_expression()
+            models.Index(KeyTextTransform('patient_id', 'raw_content'), name='doc_patient_id_idx'),
+        ]
         verbose_name = "Document"
         verbose_name_plural = "Documents"
 
+    @staticmethod
+    def patient_id_expression():
+        """
+        Text value of raw_content's patient_id key.
+
+        Filter through this expression (rather than raw_content__patient_id)
+        so the query matches doc_patient_id_idx.
+        """
+        return KeyTextTransform('patient_id', 'raw_content')
+
     def __str__(self):
         return f"{self.title or 'Untitled'} ({self.id})"
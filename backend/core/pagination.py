@@ -0,0 +1,56 @@
+import functools
+import hashlib
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from rest_framework.pagination import PageNumberPagination
+
+
+class CachedCountPaginator(Paginator):
+    """Django paginator whose total count is supplied instead of queried."""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Page number pagination with a cached COUNT(*).
+
+    Counts are cached per model and filter signature so repeated page loads
+    skip the full-table count. Requesting the first page always refreshes the
+    cached value. Pagination only applies when a page is requested, so clients
+    expecting a plain list keep working.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    count_cache_timeout = 300
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.page_query_param not in request.query_params:
+            return None
+
+        count = self.get_count(queryset, request)
+        self.django_paginator_class = functools.partial(CachedCountPaginator, count=count)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count_cache_key(self, queryset, request):
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            if key not in (self.page_query_param, self.page_size_query_param)
+            for value in values
+        )
+        digest = hashlib.md5(urlencode(params).encode('utf-8')).hexdigest()
+        return f'count:{queryset.model._meta.label_lower}:{digest}'
+
+    def get_count(self, queryset, request):
+        key = self.get_count_cache_key(queryset, request)
+        if request.query_params.get(self.page_query_param) == '1':
+            count = queryset.count()
+            cache.set(key, count, self.count_cache_timeout)
+            return count
+        return cache.get_or_set(key, queryset.count, self.count_cache_timeout)
@@ -1,8 +1,50 @@
+import copy
+
 from rest_framework import serializers
 from .models import Document
 
+# Unbound field instances per serializer class, built once from model introspection
+_FIELD_CACHE: dict[type, dict] = {}
+
+
+class CachedFieldsMixin:
+    """
+    Memoize ModelSerializer field construction per serializer class.
+
+    DRF rebuilds the field mapping from model metadata for every serializer
+    instance. The result only depends on the class and its Meta, so build it
+    once and hand each instance shallow copies to bind. Only suitable for
+    serializers without nested serializer fields.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        if cls not in _FIELD_CACHE:
+            _FIELD_CACHE[cls] = super().get_fields()
+        return {name: copy.copy(field) for name, field in _FIELD_CACHE[cls].items()}
+
+
+class UpdateFieldsMixin:
+    """
+    Save only the columns an update touched.
+
+    ModelSerializer.update() calls instance.save(), which rewrites every
+    column. This writes the validated fields plus any auto_now timestamps.
+    Not for serializers with writable many-to-many fields.
+    """
 
-class DocumentSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        auto_now = [
+            field.name for field in instance._meta.concrete_fields
+            if getattr(field, 'auto_now', False)
+        ]
+        instance.save(update_fields=[*validated_data, *auto_now])
+        return instance
+
+
+class DocumentSerializer(UpdateFieldsMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Document model."""
 
     class Meta:
@@ -17,10 +59,10 @@ class DocumentSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        # id (editable=False) and the auto_now timestamps are inferred read-only
 
 
-class DocumentListSerializer(serializers.ModelSerializer):
+class DocumentListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for Document lists."""
 
     class Meta:
@@ -32,4 +74,30 @@ class DocumentListSerializer(serializers.ModelSerializer):
             'document_type',
             'created_at',
         ]
-        read_only_fields = ['id', 'created_at']
+
+
+def _format_datetime(value):
+    """Format a datetime the way DRF's DateTimeField renders ISO 8601."""
+    if value is None:
+        return None
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def serialize_document_rows(rows):
+    """
+    Serialize Document ``values()`` rows for list responses.
+
+    Produces the same output as DocumentListSerializer without walking
+    model instances through DRF's per-field attribute lookups.
+    """
+    return [
+        {
+            **row,
+            'id': str(row['id']),
+            'created_at': _format_datetime(row['created_at']),
+        }
+        for row in rows
+    ]
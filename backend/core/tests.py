@@ -1,66 +1,30 @@
 """
 Tests for core app models and views.
 """
+import datetime
+import functools
 import uuid
-import time
 from unittest.mock import patch
 
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
-from django.urls import reverse
-from rest_framework.test import APITestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.backends import default_backend
-from jose import jwt
+from watson.testing import create_test_token, patch_jwt_auth
 
 from .models import Document
+from .serializers import DocumentSerializer, DocumentListSerializer
+from .views import _now_s
 
 
 # =============================================================================
 # Test JWT Authentication Helpers
 # =============================================================================
 
-# Generate test RSA key pair for authentication
-_test_private_key = rsa.generate_private_key(
-    public_exponent=65537,
-    key_size=2048,
-    backend=default_backend()
-)
-
-TEST_PRIVATE_KEY = _test_private_key.private_bytes(
-    encoding=serialization.Encoding.PEM,
-    format=serialization.PrivateFormat.TraditionalOpenSSL,
-    encryption_algorithm=serialization.NoEncryption()
-).decode('utf-8')
-
-TEST_PUBLIC_KEY = _test_private_key.public_key().public_bytes(
-    encoding=serialization.Encoding.PEM,
-    format=serialization.PublicFormat.SubjectPublicKeyInfo
-).decode('utf-8')
-
-
-def create_test_token(
-    sub='test-user-123',
-    email='test@example.com',
-    role='clinician',
-    exp_offset=3600,
-):
-    """Create a test JWT token for API authentication."""
-    now = int(time.time())
-    payload = {
-        'sub': sub,
-        'email': email,
-        'role': role,
-        'iat': now,
-        'exp': now + exp_offset,
-        'iss': 'https://passport.oceanheart.ai',
-        'aud': 'watson.oceanheart.ai',
-    }
-    return jwt.encode(payload, TEST_PRIVATE_KEY, algorithm='RS256')
-
-
 class AuthenticatedAPITestCase(APITestCase):
     """
     Base test case class that provides JWT authentication for API tests.
@@ -69,34 +33,20 @@ class AuthenticatedAPITestCase(APITestCase):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        cls.jwt_public_key_patcher = patch(
-            'watson.middleware.jwt_auth.JWT_PUBLIC_KEY',
-            TEST_PUBLIC_KEY
-        )
-        cls.passport_issuer_patcher = patch(
-            'watson.middleware.jwt_auth.PASSPORT_ISSUER',
-            'https://passport.oceanheart.ai'
-        )
-        cls.passport_audience_patcher = patch(
-            'watson.middleware.jwt_auth.PASSPORT_AUDIENCE',
-            'watson.oceanheart.ai'
+        cls.jwt_patcher = patch_jwt_auth()
+        cls.jwt_patcher.start()
+        # Sign once per class; every test's client sends the same
+        # long-lived token as a default header
+        cls._shared_token = create_test_token(exp_offset=86400)
+        cls.client_class = functools.partial(
+            APIClient, HTTP_AUTHORIZATION=f'Bearer {cls._shared_token}'
         )
-        cls.jwt_public_key_patcher.start()
-        cls.passport_issuer_patcher.start()
-        cls.passport_audience_patcher.start()
 
     @classmethod
     def tearDownClass(cls):
-        cls.jwt_public_key_patcher.stop()
-        cls.passport_issuer_patcher.stop()
-        cls.passport_audience_patcher.stop()
+        cls.jwt_patcher.stop()
         super().tearDownClass()
 
-    def setUp(self):
-        super().setUp()
-        self.token = create_test_token()
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
-
 
 class DocumentModelTestCase(TestCase):
     """Tests for the Document model."""
@@ -139,9 +89,17 @@ class DocumentModelTestCase(TestCase):
 
     def test_document_ordering(self):
         """Test that documents are ordered by created_at descending."""
-        doc1 = Document.objects.create(title="First", raw_content={})
-        doc2 = Document.objects.create(title="Second", raw_content={})
-        doc3 = Document.objects.create(title="Third", raw_content={})
+        docs = Document.objects.bulk_create([
+            Document(title="First", raw_content={}),
+            Document(title="Second", raw_content={}),
+            Document(title="Third", raw_content={}),
+        ])
+        # auto_now_add overwrites created_at on insert, so set explicit,
+        # distinct timestamps afterwards rather than relying on insert order
+        base = timezone.now()
+        for offset, doc in enumerate(docs):
+            doc.created_at = base + datetime.timedelta(seconds=offset)
+        Document.objects.bulk_update(docs, ['created_at'])
 
         docs = list(Document.objects.all())
         self.assertEqual(docs[0].title, "Third")
@@ -160,41 +118,146 @@ class DocumentModelTestCase(TestCase):
         self.assertEqual(doc.metadata, {})
 
 
+class DocumentSerializerTestCase(TestCase):
+    """Tests for Document serializers."""
+
+    def test_fields_are_not_shared_between_instances(self):
+        """Test that cached fields are copied and bound per instance."""
+        first = DocumentSerializer()
+        second = DocumentSerializer()
+        self.assertIsNot(first.fields['title'], second.fields['title'])
+        self.assertIs(first.fields['title'].parent, first)
+        self.assertIs(second.fields['title'].parent, second)
+
+    def test_cached_fields_preserve_read_only(self):
+        """Test that model-inferred read-only fields survive field caching."""
+        DocumentSerializer()
+        fields = DocumentSerializer().fields
+        self.assertTrue(fields['id'].read_only)
+        self.assertTrue(fields['created_at'].read_only)
+        self.assertTrue(fields['updated_at'].read_only)
+        self.assertFalse(fields['title'].read_only)
+
+    def test_serialize_document(self):
+        """Test serializing a document with cached fields."""
+        doc = Document.objects.create(title="Cached", raw_content={"text": "x"})
+        data = DocumentListSerializer(doc).data
+        self.assertEqual(data['title'], "Cached")
+        self.assertEqual(set(data), {'id', 'title', 'source', 'document_type', 'created_at'})
+
+
 class DocumentAPITestCase(AuthenticatedAPITestCase):
     """Tests for Document API endpoints. Requires JWT authentication."""
 
     def setUp(self):
         super().setUp()  # Sets up authentication
-        self.doc1 = Document.objects.create(
-            title="Test Doc 1",
-            source="test",
-            document_type="note",
-            raw_content={"text": "Content 1"}
-        )
-        self.doc2 = Document.objects.create(
-            title="Test Doc 2",
-            source="test",
-            document_type="assessment",
-            raw_content={"text": "Content 2"}
-        )
+        self.doc1, self.doc2 = Document.objects.bulk_create([
+            Document(
+                title="Test Doc 1",
+                source="test",
+                document_type="note",
+                raw_content={"text": "Content 1"}
+            ),
+            Document(
+                title="Test Doc 2",
+                source="test",
+                document_type="assessment",
+                raw_content={"text": "Content 2"}
+            ),
+        ])
 
     def test_list_documents(self):
         """Test listing all documents."""
-        url = reverse('document-list')
+        url = '/api/documents/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)
 
+    def test_list_documents_matches_list_serializer(self):
+        """Test that list rows match DocumentListSerializer output."""
+        url = '/api/documents/'
+        response = self.client.get(url)
+        expected = DocumentListSerializer(Document.objects.all(), many=True).data
+        self.assertEqual(response.json(), [dict(item) for item in expected])
+
+    def test_list_documents_paginated(self):
+        """Test that requesting a page returns a paginated envelope."""
+        url = '/api/documents/'
+        response = self.client.get(url, {'page': 1, 'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_list_documents_cached_count(self):
+        """Test that later pages reuse the count cached by the first page."""
+        url = '/api/documents/'
+        self.client.get(url, {'page': 1, 'page_size': 1})
+        Document.objects.create(title="Uncounted", raw_content={})
+
+        response = self.client.get(url, {'page': 2, 'page_size': 1})
+        self.assertEqual(response.data['count'], 2)
+
+        response = self.client.get(url, {'page': 1, 'page_size': 1})
+        self.assertEqual(response.data['count'], 3)
+
+    def test_filter_documents_by_patient_id(self):
+        """Test filtering documents by raw_content patient_id."""
+        Document.objects.create(
+            title="Patient Doc",
+            raw_content={"patient_id": "p-42", "text": "Content 3"}
+        )
+        url = '/api/documents/'
+        response = self.client.get(url, {'patient_id': 'p-42'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['title'], 'Patient Doc')
+
+    def test_order_documents_by_title(self):
+        """Test ordering documents by an allowed field."""
+        url = '/api/documents/'
+        response = self.client.get(url, {'ordering': 'title'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['title'] for item in response.data],
+            ['Test Doc 1', 'Test Doc 2'],
+        )
+
+    def test_reads_skip_atomic_requests(self):
+        """Test that ATOMIC_REQUESTS wraps writes but not reads."""
+        url = '/api/documents/'
+        with patch.dict(connection.settings_dict, {'ATOMIC_REQUESTS': True}):
+            with CaptureQueriesContext(connection) as reads:
+                self.client.get(url)
+            with CaptureQueriesContext(connection) as writes:
+                self.client.post(url, {'raw_content': {}}, format='json')
+        self.assertFalse(any('SAVEPOINT' in q['sql'] for q in reads.captured_queries))
+        self.assertTrue(any('SAVEPOINT' in q['sql'] for q in writes.captured_queries))
+
     def test_retrieve_document(self):
         """Test retrieving a single document."""
-        url = reverse('document-detail', kwargs={'pk': self.doc1.pk})
+        url = f'/api/documents/{self.doc1.pk}/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['title'], 'Test Doc 1')
 
+    def test_retrieve_raw_content(self):
+        """Test retrieving a document's raw JSON content."""
+        url = f'/api/documents/{self.doc1.pk}/raw/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json(), {"text": "Content 1"})
+
+    def test_retrieve_raw_content_not_found(self):
+        """Test that raw content for a missing document returns 404."""
+        url = f'/api/documents/{uuid.uuid4()}/raw/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_create_document(self):
         """Test creating a new document."""
-        url = reverse('document-list')
+        url = '/api/documents/'
         data = {
             'title': 'New Document',
             'source': 'api_test',
@@ -207,7 +270,7 @@ class DocumentAPITestCase(AuthenticatedAPITestCase):
 
     def test_update_document(self):
         """Test updating a document."""
-        url = reverse('document-detail', kwargs={'pk': self.doc1.pk})
+        url = f'/api/documents/{self.doc1.pk}/'
         data = {'title': 'Updated Title'}
         response = self.client.patch(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -216,14 +279,14 @@ class DocumentAPITestCase(AuthenticatedAPITestCase):
 
     def test_delete_document(self):
         """Test deleting a document."""
-        url = reverse('document-detail', kwargs={'pk': self.doc1.pk})
+        url = f'/api/documents/{self.doc1.pk}/'
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Document.objects.count(), 1)
 
     def test_search_documents(self):
         """Test searching documents by title."""
-        url = reverse('document-list')
+        url = '/api/documents/'
         response = self.client.get(url, {'search': 'Doc 1'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
@@ -233,6 +296,9 @@ class DocumentAPITestCase(AuthenticatedAPITestCase):
 class HealthCheckTestCase(APITestCase):
     """Tests for health check endpoints."""
 
+    def setUp(self):
+        cache.clear()
+
     def test_health_check(self):
         """Test health check endpoint."""
         response = self.client.get('/health/')
@@ -245,3 +311,23 @@ class HealthCheckTestCase(APITestCase):
         # Readiness might return 200 or 503 depending on static files
         self.assertIn(response.status_code, [status.HTTP_200_OK, status.HTTP_503_SERVICE_UNAVAILABLE])
         self.assertIn('ready', response.json())
+
+    def test_probe_timestamp_is_cached(self):
+        """Test that probes within a second reuse the same timestamp."""
+        first = _now_s()
+        with patch('core.views.time.time', return_value=0):
+            self.assertEqual(_now_s(), first)
+
+    def test_health_check_caches_database_probe(self):
+        """Test that consecutive health checks share the database probe."""
+        self.client.get('/health/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/')
+        self.assertEqual(response.json()['database'], 'connected')
+
+    def test_health_check_database_error(self):
+        """Test that a failing database probe returns 503 and isn't cached."""
+        with patch('core.views._probe_database', side_effect=Exception('down')):
+            response = self.client.get('/health/')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIsNone(cache.get('health:db'))
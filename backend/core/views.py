@@ -1,15 +1,64 @@
 from django.shortcuts import render
-from django.http import JsonResponse
-from django.db import connection
+from django.http import Http404, HttpResponse, JsonResponse
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.db.models.lookups import Exact
 from django.conf import settings
+import os
 import time
 
 from rest_framework import viewsets, filters
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
+from rest_framework.response import Response
 
 from watson.middleware import JWTAuthentication
 from .models import Document
-from .serializers import DocumentSerializer, DocumentListSerializer
+from .pagination import CachedCountPagination
+from .serializers import DocumentSerializer, DocumentListSerializer, serialize_document_rows
+
+
+# Probe results are shared for a short window so frequent load balancer
+# and orchestrator probes don't each run a database round-trip.
+PROBE_CACHE_TIMEOUT = 2
+
+# Collected static files don't disappear at runtime, so once STATIC_ROOT
+# is found it is not probed again for the life of the process.
+_static_files_ok = False
+
+# [wall-clock seconds, monotonic time it was read]; probes share a
+# timestamp that is refreshed at most once per second.
+_ts_cache = [0, float('-inf')]
+
+
+def _now_s():
+    t = time.monotonic()
+    if t - _ts_cache[1] > 1.0:
+        _ts_cache[:] = [int(time.time()), t]
+    return _ts_cache[0]
+
+
+def _static_files_available():
+    global _static_files_ok
+    if not _static_files_ok:
+        static_root = getattr(settings, 'STATIC_ROOT', None)
+        _static_files_ok = bool(static_root and os.path.exists(static_root))
+    return _static_files_ok
+
+
+def _probe_database():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return "connected"
+
+
+def _probe_migrations():
+    # Stops at the first applied migration instead of counting the table
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM django_migrations LIMIT 1")
+        return "applied" if cursor.fetchone() is not None else "none applied"
 
 
 def health_check(request):
@@ -17,16 +66,14 @@ def health_check(request):
     
     health_data = {
         "status": "healthy",
-        "timestamp": int(time.time()),
+        "timestamp": _now_s(),
         "service": "watson-api",
         "version": "1.0.0"
     }
     
     try:
-        # Check database connection
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            health_data["database"] = "connected"
+        # Check database connection (failures are never cached)
+        health_data["database"] = cache.get_or_set('health:db', _probe_database, PROBE_CACHE_TIMEOUT)
     except Exception as e:
         health_data["status"] = "unhealthy"
         health_data["database"] = f"error: {str(e)}"
@@ -44,21 +91,18 @@ def readiness_check(request):
     
     readiness_data = {
         "ready": True,
-        "timestamp": int(time.time()),
+        "timestamp": _now_s(),
         "checks": {}
     }
     
     try:
         # Database readiness
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT COUNT(*) FROM django_migrations")
-            migration_count = cursor.fetchone()[0]
-            readiness_data["checks"]["migrations"] = f"{migration_count} applied"
+        readiness_data["checks"]["migrations"] = cache.get_or_set(
+            'ready:migrations', _probe_migrations, PROBE_CACHE_TIMEOUT
+        )
             
         # Check if static files are collected
-        import os
-        static_root = getattr(settings, 'STATIC_ROOT', None)
-        if static_root and os.path.exists(static_root):
+        if _static_files_available():
             readiness_data["checks"]["static_files"] = "available"
         else:
             readiness_data["checks"]["static_files"] = "missing"
@@ -73,6 +117,10 @@ def readiness_check(request):
     return JsonResponse(readiness_data, status=status_code)
 
 
+# Instantiated filter backends per viewset class
+_FILTER_BACKENDS: dict[type, tuple] = {}
+
+
 class DocumentViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Document model.
@@ -83,12 +131,77 @@ class DocumentViewSet(viewsets.ModelViewSet):
     queryset = Document.objects.all()
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'source', 'document_type']
-    ordering_fields = ['created_at', 'updated_at', 'title']
-    ordering = ['-created_at']
+    pagination_class = CachedCountPagination
+    filter_backends = (filters.SearchFilter, filters.OrderingFilter)
+    search_fields = ('title', 'source', 'document_type')
+    ordering_fields = ('created_at', 'updated_at', 'title')
+    ordering = ('-created_at',)
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        # ATOMIC_REQUESTS would wrap every verb; dispatch() applies it to writes only
+        view = super().as_view(actions, **initkwargs)
+        return transaction.non_atomic_requests(view)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS or not connection.settings_dict['ATOMIC_REQUESTS']:
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            return super().dispatch(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        patient_id = self.request.query_params.get('patient_id')
+        if patient_id:
+            # Plain Exact compares as text; the JSON key lookup would
+            # JSON-encode the value and miss the expression index
+            queryset = queryset.filter(Exact(Document.patient_id_expression(), patient_id))
+        if self.action == 'list':
+            # List responses never include the JSON payload columns
+            return queryset.defer('raw_content', 'metadata')
+        return queryset
+
+    def filter_queryset(self, queryset):
+        # Filter backends keep no per-request state; reuse one instance of
+        # each per viewset class instead of constructing them every request
+        cls = type(self)
+        if cls not in _FILTER_BACKENDS:
+            _FILTER_BACKENDS[cls] = tuple(backend() for backend in self.filter_backends)
+        for backend in _FILTER_BACKENDS[cls]:
+            queryset = backend.filter_queryset(self.request, queryset, self)
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'list':
             return DocumentListSerializer
         return DocumentSerializer
+
+    def list(self, request, *args, **kwargs):
+        # Feed plain rows instead of model instances; output matches DocumentListSerializer
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*DocumentListSerializer.Meta.fields)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_document_rows(page))
+
+        return Response(serialize_document_rows(rows))
+
+    @action(detail=True, methods=['get'], url_path='raw')
+    def raw(self, request, pk=None):
+        """
+        Return a document's raw_content exactly as stored.
+
+        The column is cast to text in the database and sent as-is, skipping
+        the decode into Python objects and re-encode through the renderer.
+        """
+        content = (
+            self.get_queryset()
+            .filter(pk=pk)
+            .annotate(raw_text=Cast('raw_content', TextField()))
+            .values_list('raw_text', flat=True)
+            .first()
+        )
+        if content is None:
+            raise Http404
+        return HttpResponse(content, content_type='application/json')
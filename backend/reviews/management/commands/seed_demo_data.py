@@ -5,9 +5,289 @@ Creates clinical documents, LLM outputs with intentional errors,
 classification labels, and sample edits for demonstration.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from core.models import Document
-from reviews.models import LLMOutput, Label, Edit
+from reviews.models import LLMOutput, Label, Edit, EditLabel
+
+# Rows per multi-row INSERT when seeding
+SEED_BATCH_SIZE = int(os.environ.get('WATSON_SEED_BATCH_SIZE', 500))
+
+
+# Demo fixtures. Module-level so seeding doesn't rebuild the literals and
+# tests can import them; treat them as read-only.
+LABEL_FIXTURES = (
+    {
+        'name': 'hallucination',
+        'display_name': 'Hallucination',
+        'description': 'LLM generated factually incorrect information not present in source',
+        'category': 'accuracy',
+        'severity': 'critical',
+        'color': '#ef4444',
+        'icon': 'alert-triangle',
+    },
+    {
+        'name': 'missing_risk',
+        'display_name': 'Missing Risk Factor',
+        'description': 'Important risk information was omitted from the summary',
+        'category': 'safety',
+        'severity': 'critical',
+        'color': '#f97316',
+        'icon': 'shield-alert',
+    },
+    {
+        'name': 'clinical_inaccuracy',
+        'display_name': 'Clinical Inaccuracy',
+        'description': 'Medical/clinical information is incorrect',
+        'category': 'accuracy',
+        'severity': 'major',
+        'color': '#eab308',
+        'icon': 'file-warning',
+    },
+    {
+        'name': 'wrong_dosage',
+        'display_name': 'Wrong Medication Dosage',
+        'description': 'Medication dosage is incorrectly stated',
+        'category': 'safety',
+        'severity': 'critical',
+        'color': '#dc2626',
+        'icon': 'pill',
+    },
+    {
+        'name': 'severity_underestimate',
+        'display_name': 'Severity Underestimate',
+        'description': 'Risk or severity level was underestimated',
+        'category': 'safety',
+        'severity': 'critical',
+        'color': '#b91c1c',
+        'icon': 'trending-down',
+    },
+    {
+        'name': 'formatting_issue',
+        'display_name': 'Formatting Issue',
+        'description': 'Output format does not match expected structure',
+        'category': 'style',
+        'severity': 'minor',
+        'color': '#6b7280',
+        'icon': 'layout',
+    },
+    {
+        'name': 'missing_context',
+        'display_name': 'Missing Context',
+        'description': 'Important contextual information was omitted',
+        'category': 'completeness',
+        'severity': 'major',
+        'color': '#8b5cf6',
+        'icon': 'file-minus',
+    },
+    {
+        'name': 'good_output',
+        'display_name': 'Accurate Output',
+        'description': 'Output is clinically accurate and complete',
+        'category': 'quality',
+        'severity': 'info',
+        'color': '#22c55e',
+        'icon': 'check-circle',
+    },
+)
+
+DOCUMENT_FIXTURES = (
+    {
+        'title': 'Intake Assessment - Patient Alpha',
+        'source': 'intake_system',
+        'document_type': 'clinical_assessment',
+        'raw_content': {
+            'presenting_concerns': [
+                'Generalized Anxiety Disorder',
+                'Sleep disturbances',
+                'Work stress'
+            ],
+            'risk_assessment': {
+                'suicide_risk': 'low',
+                'violence_risk': 'low',
+                'self_harm': 'low',
+                'substance_abuse': 'moderate',
+            },
+            'mental_status_exam': {
+                'appearance': 'Well-groomed, appropriate attire',
+                'mood': 'Anxious',
+                'affect': 'Congruent, mildly restricted range',
+                'thought_process': 'Linear, goal-directed',
+                'thought_content': 'No delusions, no hallucinations',
+                'cognition': 'Alert, oriented x4',
+                'insight': 'Good',
+                'judgment': 'Fair',
+            },
+            'medications': [
+                {'name': 'Sertraline', 'dosage': '50mg', 'frequency': 'daily'},
+                {'name': 'Trazodone', 'dosage': '50mg', 'frequency': 'PRN for sleep'},
+            ],
+            'diagnosis': ['F41.1 - Generalized Anxiety Disorder'],
+        },
+    },
+    {
+        'title': 'Progress Note - Patient Beta',
+        'source': 'progress_notes',
+        'document_type': 'progress_note',
+        'raw_content': {
+            'session_number': 5,
+            'session_type': 'Individual Therapy',
+            'presenting_concerns': ['Depression', 'Relationship difficulties'],
+            'interventions': ['CBT techniques', 'Behavioral activation'],
+            'progress': 'Patient showing gradual improvement in mood',
+            'risk_assessment': {
+                'suicide_risk': 'low',
+                'violence_risk': 'none',
+            },
+            'plan': 'Continue weekly sessions, maintain medication',
+        },
+    },
+    {
+        'title': 'Crisis Assessment - Patient Gamma',
+        'source': 'crisis_team',
+        'document_type': 'crisis_assessment',
+        'raw_content': {
+            'presenting_concerns': [
+                'Acute suicidal ideation',
+                'Recent job loss',
+                'Social isolation'
+            ],
+            'risk_assessment': {
+                'suicide_risk': 'high',
+                'violence_risk': 'low',
+                'immediate_safety': 'requires monitoring',
+            },
+            'safety_plan': {
+                'warning_signs': ['Withdrawal', 'Increased alcohol use'],
+                'coping_strategies': ['Call crisis line', 'Contact friend'],
+                'emergency_contacts': ['Sister: 555-0123', 'Therapist: 555-0456'],
+            },
+            'disposition': 'Voluntary inpatient admission recommended',
+        },
+    },
+)
+
+# LLM outputs with intentional errors for testing; document_index points
+# into DOCUMENT_FIXTURES
+OUTPUT_FIXTURES = (
+    {
+        'document_index': 0,
+        'model_name': 'clinical-summary-v2',
+        'model_version': '2.1.0',
+        'output_content': {
+            # ERROR: Wrong dosage (50mg -> 100mg)
+            'summary': 'Patient presents with generalized anxiety disorder. Currently prescribed Sertraline 100mg daily.',
+            'risk_level': 'low',
+            'recommendations': [
+                'Continue current medication regimen',
+                'Weekly therapy sessions',
+                'Sleep hygiene education',
+            ],
+            'key_findings': ['Anxiety symptoms', 'Sleep disturbances', 'Good insight'],
+        },
+        'raw_response': 'Based on the intake assessment, the patient is experiencing symptoms consistent with GAD...',
+        'prompt_template': 'clinical_summary_v2',
+        'generation_params': {'temperature': 0.3, 'max_tokens': 500},
+    },
+    {
+        'document_index': 1,
+        'model_name': 'progress-note-analyzer',
+        'model_version': '1.5.0',
+        'output_content': {
+            'summary': 'Patient showing improvement in depressive symptoms after 5 sessions of CBT.',
+            'progress_rating': 'moderate_improvement',
+            'treatment_adherence': 'good',
+            # MISSING: Risk assessment summary
+            'next_steps': ['Continue CBT', 'Consider group therapy'],
+        },
+        'raw_response': 'Analysis of session 5 indicates positive treatment response...',
+        'prompt_template': 'progress_analysis_v1',
+        'generation_params': {'temperature': 0.2, 'max_tokens': 400},
+    },
+    {
+        'document_index': 2,
+        'model_name': 'crisis-triage-assistant',
+        'model_version': '3.0.0',
+        'output_content': {
+            # ERROR: Should be 'high' based on assessment
+            'risk_classification': 'moderate',
+            'summary': 'Patient experiencing suicidal thoughts following job loss.',
+            # ERROR: Contradicts inpatient recommendation
+            'recommended_disposition': 'outpatient follow-up',
+            'safety_concerns': ['Active ideation', 'Limited support system'],
+            # ERROR: Should be urgent
+            'urgency_level': 'routine',
+        },
+        'raw_response': 'Crisis assessment analysis indicates patient requires...',
+        'prompt_template': 'crisis_triage_v3',
+        'generation_params': {'temperature': 0.1, 'max_tokens': 600},
+    },
+)
+
+# Sample edits with corrections; output_index points into OUTPUT_FIXTURES
+# and label names the LABEL_FIXTURES entry applied to the edit
+EDIT_FIXTURES = (
+    # Draft edit with corrected content for first output
+    {
+        'output_index': 0,
+        'editor_id': 'demo-clinician-001',
+        'editor_name': 'Dr. Demo Clinician',
+        'edited_content': {
+            # Corrected dosage
+            'summary': 'Patient presents with generalized anxiety disorder. Currently prescribed Sertraline 50mg daily.',
+            'risk_level': 'low',
+            'recommendations': [
+                'Continue current medication regimen',
+                'Weekly therapy sessions',
+                'Sleep hygiene education',
+            ],
+            'key_findings': ['Anxiety symptoms', 'Sleep disturbances', 'Good insight'],
+        },
+        'status': 'draft',
+        'editor_notes': 'Corrected medication dosage from 100mg to 50mg (hallucination error)',
+        'label': 'wrong_dosage',
+    },
+    # In-review edit for second output
+    {
+        'output_index': 1,
+        'editor_id': 'demo-clinician-002',
+        'editor_name': 'Dr. Second Reviewer',
+        'edited_content': {
+            'summary': 'Patient showing improvement in depressive symptoms after 5 sessions of CBT.',
+            'progress_rating': 'moderate_improvement',
+            'treatment_adherence': 'good',
+            # Added missing risk assessment
+            'risk_assessment': 'Low suicide risk, no violence risk as documented in session.',
+            'next_steps': ['Continue CBT', 'Consider group therapy'],
+        },
+        'status': 'in_review',
+        'editor_notes': 'Added missing risk assessment summary that was omitted from original output',
+        'label': 'missing_risk',
+    },
+    # Edit for third output (critical error correction)
+    {
+        'output_index': 2,
+        'editor_id': 'demo-clinician-001',
+        'editor_name': 'Dr. Demo Clinician',
+        'edited_content': {
+            # Corrected risk classification
+            'risk_classification': 'high',
+            'summary': 'Patient experiencing acute suicidal ideation with recent job loss and social isolation.',
+            # Corrected disposition
+            'recommended_disposition': 'voluntary inpatient admission',
+            'safety_concerns': ['Active ideation', 'Limited support system', 'Recent major stressor'],
+            # Corrected urgency
+            'urgency_level': 'urgent',
+        },
+        'status': 'draft',
+        'editor_notes': 'CRITICAL: Corrected severe underestimate of risk level and disposition. Original output dangerously underestimated patient risk.',
+        'label': 'severity_underestimate',
+    },
+)
 
 
 class Command(BaseCommand):
@@ -19,6 +299,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing demo data before seeding',
         )
+        parser.add_argument(
+            '--parallel',
+            action='store_true',
+            help='Seed independent tables concurrently on separate connections',
+        )
 
     def handle(self, *args, **options):
         # Check if demo data already exists
@@ -26,14 +311,46 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS('Demo data already exists, skipping...'))
             return
 
-        if options['clear']:
-            self.stdout.write('Clearing existing data...')
-            Edit.objects.all().delete()
-            LLMOutput.objects.all().delete()
-            Document.objects.all().delete()
-            Label.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Cleared all data'))
+        parallel = options['parallel']
+        if parallel and connection.vendor == 'sqlite':
+            # SQLite allows a single writer, and in-memory databases aren't
+            # shared across connections
+            self.stdout.write(self.style.WARNING('--parallel is not supported on SQLite, seeding serially'))
+            parallel = False
+
+        if parallel:
+            labels, documents, outputs, edits = self._seed_parallel(options['clear'])
+        else:
+            # One transaction for the whole run: a single commit instead of one
+            # per statement, and a failed seed leaves the database untouched
+            with transaction.atomic():
+                self._relax_commit()
+                if options['clear']:
+                    self._clear_with_progress()
+                labels, documents, outputs, edits = self._seed_serial()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\nDemo data seeding complete!\n'
+            f'  - Documents: {len(documents)}\n'
+            f'  - LLM Outputs: {len(outputs)}\n'
+            f'  - Labels: {len(labels)}\n'
+            f'  - Edits: {len(edits)}'
+        ))
+
+    def _relax_commit(self):
+        """Skip waiting on WAL flushes for the current transaction."""
+        if connection.vendor == 'postgresql':
+            # Seed data can be regenerated, so don't wait on WAL flushes
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL synchronous_commit = OFF")
 
+    def _clear_with_progress(self):
+        self.stdout.write('Clearing existing data...')
+        self._clear_data()
+        self.stdout.write(self.style.SUCCESS('Cleared all data'))
+
+    def _seed_serial(self):
+        """Create every section in order on the current connection."""
         self.stdout.write('Seeding demo data...')
 
         # Create labels
@@ -52,336 +369,124 @@ class Command(BaseCommand):
         edits = self._create_edits(outputs, labels)
         self.stdout.write(f'Created {len(edits)} sample edits')
 
-        self.stdout.write(self.style.SUCCESS(
-            f'\nDemo data seeding complete!\n'
-            f'  - Documents: {len(documents)}\n'
-            f'  - LLM Outputs: {len(outputs)}\n'
-            f'  - Labels: {len(labels)}\n'
-            f'  - Edits: {len(edits)}'
-        ))
+        return labels, documents, outputs, edits
 
-    def _create_labels(self):
-        """Create classification labels for issues."""
-        label_data = [
-            {
-                'name': 'hallucination',
-                'display_name': 'Hallucination',
-                'description': 'LLM generated factually incorrect information not present in source',
-                'category': 'accuracy',
-                'severity': 'critical',
-                'color': '#ef4444',
-                'icon': 'alert-triangle',
-            },
-            {
-                'name': 'missing_risk',
-                'display_name': 'Missing Risk Factor',
-                'description': 'Important risk information was omitted from the summary',
-                'category': 'safety',
-                'severity': 'critical',
-                'color': '#f97316',
-                'icon': 'shield-alert',
-            },
-            {
-                'name': 'clinical_inaccuracy',
-                'display_name': 'Clinical Inaccuracy',
-                'description': 'Medical/clinical information is incorrect',
-                'category': 'accuracy',
-                'severity': 'major',
-                'color': '#eab308',
-                'icon': 'file-warning',
-            },
-            {
-                'name': 'wrong_dosage',
-                'display_name': 'Wrong Medication Dosage',
-                'description': 'Medication dosage is incorrectly stated',
-                'category': 'safety',
-                'severity': 'critical',
-                'color': '#dc2626',
-                'icon': 'pill',
-            },
-            {
-                'name': 'severity_underestimate',
-                'display_name': 'Severity Underestimate',
-                'description': 'Risk or severity level was underestimated',
-                'category': 'safety',
-                'severity': 'critical',
-                'color': '#b91c1c',
-                'icon': 'trending-down',
-            },
-            {
-                'name': 'formatting_issue',
-                'display_name': 'Formatting Issue',
-                'description': 'Output format does not match expected structure',
-                'category': 'style',
-                'severity': 'minor',
-                'color': '#6b7280',
-                'icon': 'layout',
-            },
-            {
-                'name': 'missing_context',
-                'display_name': 'Missing Context',
-                'description': 'Important contextual information was omitted',
-                'category': 'completeness',
-                'severity': 'major',
-                'color': '#8b5cf6',
-                'icon': 'file-minus',
-            },
-            {
-                'name': 'good_output',
-                'display_name': 'Accurate Output',
-                'description': 'Output is clinically accurate and complete',
-                'category': 'quality',
-                'severity': 'info',
-                'color': '#22c55e',
-                'icon': 'check-circle',
-            },
-        ]
+    def _seed_parallel(self, clear):
+        """
+        Create independent sections concurrently.
+
+        Labels and documents don't reference each other, so they are seeded
+        side by side; outputs wait for documents and edits for both. Each
+        stage commits on its own, so a failure can leave earlier stages in
+        place - rerun with --clear.
+        """
+        if clear:
+            self._in_transaction(self._clear_with_progress)
+
+        self.stdout.write('Seeding demo data (parallel)...')
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            labels_future = pool.submit(self._in_worker, self._create_labels)
+            documents_future = pool.submit(self._in_worker, self._create_documents)
+
+            documents = documents_future.result()
+            self.stdout.write(f'Created {len(documents)} documents')
+            outputs_future = pool.submit(self._in_worker, self._create_outputs, documents)
+
+            labels = labels_future.result()
+            self.stdout.write(f'Created {len(labels)} labels')
+            outputs = outputs_future.result()
+            self.stdout.write(f'Created {len(outputs)} LLM outputs')
 
-        labels = []
-        for data in label_data:
-            label, created = Label.objects.get_or_create(
-                name=data['name'],
-                defaults=data
+        edits = self._in_transaction(self._create_edits, outputs, labels)
+        self.stdout.write(f'Created {len(edits)} sample edits')
+
+        return labels, documents, outputs, edits
+
+    def _in_transaction(self, func, *args):
+        with transaction.atomic():
+            self._relax_commit()
+            return func(*args)
+
+    def _in_worker(self, func, *args):
+        # Django connections are per thread, so each worker commits on its
+        # own connection; close it before the thread is reused or exits
+        try:
+            return self._in_transaction(func, *args)
+        finally:
+            connection.close()
+
+    def _clear_data(self):
+        """Delete all review data and documents."""
+        if connection.vendor == 'postgresql' and getattr(settings, 'ENVIRONMENT', None) != 'production':
+            # TRUNCATE skips loading rows into Python and per-row deletes;
+            # never used against production
+            tables = ', '.join(
+                connection.ops.quote_name(model._meta.db_table)
+                for model in (EditLabel, Edit, LLMOutput, Document, Label)
             )
-            if created:
-                labels.append(label)
-            else:
-                # Update existing
-                for key, value in data.items():
-                    setattr(label, key, value)
-                label.save()
-                labels.append(label)
+            with connection.cursor() as cursor:
+                cursor.execute(f'TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE')
+            return
 
-        return labels
+        Edit.objects.all().delete()
+        LLMOutput.objects.all().delete()
+        Document.objects.all().delete()
+        Label.objects.all().delete()
 
-    def _create_documents(self):
-        """Create clinical documents."""
-        documents_data = [
-            {
-                'title': 'Intake Assessment - Patient Alpha',
-                'source': 'intake_system',
-                'document_type': 'clinical_assessment',
-                'raw_content': {
-                    'presenting_concerns': [
-                        'Generalized Anxiety Disorder',
-                        'Sleep disturbances',
-                        'Work stress'
-                    ],
-                    'risk_assessment': {
-                        'suicide_risk': 'low',
-                        'violence_risk': 'low',
-                        'self_harm': 'low',
-                        'substance_abuse': 'moderate',
-                    },
-                    'mental_status_exam': {
-                        'appearance': 'Well-groomed, appropriate attire',
-                        'mood': 'Anxious',
-                        'affect': 'Congruent, mildly restricted range',
-                        'thought_process': 'Linear, goal-directed',
-                        'thought_content': 'No delusions, no hallucinations',
-                        'cognition': 'Alert, oriented x4',
-                        'insight': 'Good',
-                        'judgment': 'Fair',
-                    },
-                    'medications': [
-                        {'name': 'Sertraline', 'dosage': '50mg', 'frequency': 'daily'},
-                        {'name': 'Trazodone', 'dosage': '50mg', 'frequency': 'PRN for sleep'},
-                    ],
-                    'diagnosis': ['F41.1 - Generalized Anxiety Disorder'],
-                },
-            },
-            {
-                'title': 'Progress Note - Patient Beta',
-                'source': 'progress_notes',
-                'document_type': 'progress_note',
-                'raw_content': {
-                    'session_number': 5,
-                    'session_type': 'Individual Therapy',
-                    'presenting_concerns': ['Depression', 'Relationship difficulties'],
-                    'interventions': ['CBT techniques', 'Behavioral activation'],
-                    'progress': 'Patient showing gradual improvement in mood',
-                    'risk_assessment': {
-                        'suicide_risk': 'low',
-                        'violence_risk': 'none',
-                    },
-                    'plan': 'Continue weekly sessions, maintain medication',
-                },
-            },
-            {
-                'title': 'Crisis Assessment - Patient Gamma',
-                'source': 'crisis_team',
-                'document_type': 'crisis_assessment',
-                'raw_content': {
-                    'presenting_concerns': [
-                        'Acute suicidal ideation',
-                        'Recent job loss',
-                        'Social isolation'
-                    ],
-                    'risk_assessment': {
-                        'suicide_risk': 'high',
-                        'violence_risk': 'low',
-                        'immediate_safety': 'requires monitoring',
-                    },
-                    'safety_plan': {
-                        'warning_signs': ['Withdrawal', 'Increased alcohol use'],
-                        'coping_strategies': ['Call crisis line', 'Contact friend'],
-                        'emergency_contacts': ['Sister: 555-0123', 'Therapist: 555-0456'],
-                    },
-                    'disposition': 'Voluntary inpatient admission recommended',
-                },
-            },
-        ]
+    def _create_labels(self):
+        """Create classification labels for issues."""
+        # Upsert every label in one INSERT ... ON CONFLICT (name) DO UPDATE
+        Label.objects.bulk_create(
+            [Label(**data) for data in LABEL_FIXTURES],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=[
+                'display_name', 'description', 'category',
+                'severity', 'color', 'icon', 'updated_at',
+            ],
+        )
 
-        documents = []
-        for data in documents_data:
-            doc = Document.objects.create(**data)
-            documents.append(doc)
+        # Re-read so existing labels carry their stored primary keys
+        return list(Label.objects.filter(name__in=[data['name'] for data in LABEL_FIXTURES]))
 
-        return documents
+    def _create_documents(self):
+        """Create clinical documents."""
+        return Document.objects.bulk_create(
+            [Document(**data) for data in DOCUMENT_FIXTURES],
+            batch_size=SEED_BATCH_SIZE,
+        )
 
     def _create_outputs(self, documents):
         """Create LLM outputs with intentional errors for testing."""
-        outputs_data = [
-            {
-                'document': documents[0],
-                'model_name': 'clinical-summary-v2',
-                'model_version': '2.1.0',
-                'output_content': {
-                    # ERROR: Wrong dosage (50mg -> 100mg)
-                    'summary': 'Patient presents with generalized anxiety disorder. Currently prescribed Sertraline 100mg daily.',
-                    'risk_level': 'low',
-                    'recommendations': [
-                        'Continue current medication regimen',
-                        'Weekly therapy sessions',
-                        'Sleep hygiene education',
-                    ],
-                    'key_findings': ['Anxiety symptoms', 'Sleep disturbances', 'Good insight'],
-                },
-                'raw_response': 'Based on the intake assessment, the patient is experiencing symptoms consistent with GAD...',
-                'prompt_template': 'clinical_summary_v2',
-                'generation_params': {'temperature': 0.3, 'max_tokens': 500},
-            },
-            {
-                'document': documents[1],
-                'model_name': 'progress-note-analyzer',
-                'model_version': '1.5.0',
-                'output_content': {
-                    'summary': 'Patient showing improvement in depressive symptoms after 5 sessions of CBT.',
-                    'progress_rating': 'moderate_improvement',
-                    'treatment_adherence': 'good',
-                    # MISSING: Risk assessment summary
-                    'next_steps': ['Continue CBT', 'Consider group therapy'],
-                },
-                'raw_response': 'Analysis of session 5 indicates positive treatment response...',
-                'prompt_template': 'progress_analysis_v1',
-                'generation_params': {'temperature': 0.2, 'max_tokens': 400},
-            },
-            {
-                'document': documents[2],
-                'model_name': 'crisis-triage-assistant',
-                'model_version': '3.0.0',
-                'output_content': {
-                    # ERROR: Should be 'high' based on assessment
-                    'risk_classification': 'moderate',
-                    'summary': 'Patient experiencing suicidal thoughts following job loss.',
-                    # ERROR: Contradicts inpatient recommendation
-                    'recommended_disposition': 'outpatient follow-up',
-                    'safety_concerns': ['Active ideation', 'Limited support system'],
-                    # ERROR: Should be urgent
-                    'urgency_level': 'routine',
-                },
-                'raw_response': 'Crisis assessment analysis indicates patient requires...',
-                'prompt_template': 'crisis_triage_v3',
-                'generation_params': {'temperature': 0.1, 'max_tokens': 600},
-            },
-        ]
-
         outputs = []
-        for data in outputs_data:
-            output = LLMOutput.objects.create(**data)
-            outputs.append(output)
+        for data in OUTPUT_FIXTURES:
+            data = dict(data)
+            outputs.append(LLMOutput(document=documents[data.pop('document_index')], **data))
 
-        return outputs
+        # Primary keys are generated in Python, so the documents passed in
+        # can be linked without reading them back
+        return LLMOutput.objects.bulk_create(outputs, batch_size=SEED_BATCH_SIZE)
 
     def _create_edits(self, outputs, labels):
         """Create sample edits with corrections."""
-        edits = []
+        labels_by_name = {l.name: l for l in labels}
 
-        # Create a draft edit with corrected content for first output
-        edit = Edit.objects.create(
-            llm_output=outputs[0],
-            editor_id='demo-clinician-001',
-            editor_name='Dr. Demo Clinician',
-            edited_content={
-                # Corrected dosage
-                'summary': 'Patient presents with generalized anxiety disorder. Currently prescribed Sertraline 50mg daily.',
-                'risk_level': 'low',
-                'recommendations': [
-                    'Continue current medication regimen',
-                    'Weekly therapy sessions',
-                    'Sleep hygiene education',
-                ],
-                'key_findings': ['Anxiety symptoms', 'Sleep disturbances', 'Good insight'],
-            },
-            status='draft',
-            editor_notes='Corrected medication dosage from 100mg to 50mg (hallucination error)',
-        )
-
-        # Apply wrong_dosage label
-        wrong_dosage_label = next((l for l in labels if l.name == 'wrong_dosage'), None)
-        if wrong_dosage_label:
-            edit.labels.add(wrong_dosage_label)
-
-        edits.append(edit)
-
-        # Create an in_review edit for second output
-        edit2 = Edit.objects.create(
-            llm_output=outputs[1],
-            editor_id='demo-clinician-002',
-            editor_name='Dr. Second Reviewer',
-            edited_content={
-                'summary': 'Patient showing improvement in depressive symptoms after 5 sessions of CBT.',
-                'progress_rating': 'moderate_improvement',
-                'treatment_adherence': 'good',
-                # Added missing risk assessment
-                'risk_assessment': 'Low suicide risk, no violence risk as documented in session.',
-                'next_steps': ['Continue CBT', 'Consider group therapy'],
-            },
-            status='in_review',
-            editor_notes='Added missing risk assessment summary that was omitted from original output',
-        )
-
-        # Apply missing_risk label
-        missing_risk_label = next((l for l in labels if l.name == 'missing_risk'), None)
-        if missing_risk_label:
-            edit2.labels.add(missing_risk_label)
-
-        edits.append(edit2)
-
-        # Create a submitted edit for third output (critical error correction)
-        edit3 = Edit.objects.create(
-            llm_output=outputs[2],
-            editor_id='demo-clinician-001',
-            editor_name='Dr. Demo Clinician',
-            edited_content={
-                # Corrected risk classification
-                'risk_classification': 'high',
-                'summary': 'Patient experiencing acute suicidal ideation with recent job loss and social isolation.',
-                # Corrected disposition
-                'recommended_disposition': 'voluntary inpatient admission',
-                'safety_concerns': ['Active ideation', 'Limited support system', 'Recent major stressor'],
-                # Corrected urgency
-                'urgency_level': 'urgent',
-            },
-            status='draft',
-            editor_notes='CRITICAL: Corrected severe underestimate of risk level and disposition. Original output dangerously underestimated patient risk.',
+        edits = []
+        pairs = []
+        for data in EDIT_FIXTURES:
+            data = dict(data)
+            label = labels_by_name.get(data.pop('label'))
+            edit = Edit(llm_output=outputs[data.pop('output_index')], **data)
+            edits.append(edit)
+            if label is not None:
+                pairs.append((edit, label))
+
+        edits = Edit.objects.bulk_create(edits, batch_size=SEED_BATCH_SIZE)
+
+        # Apply each edit's label with one INSERT into the through table
+        EditLabel.objects.bulk_create(
+            [EditLabel(edit=e, label=l) for e, l in pairs],
+            ignore_conflicts=True,
         )
 
-        # Apply severity_underestimate label
-        severity_label = next((l for l in labels if l.name == 'severity_underestimate'), None)
-        if severity_label:
-            edit3.labels.add(severity_label)
-
-        edits.append(edit3)
-
         return edits
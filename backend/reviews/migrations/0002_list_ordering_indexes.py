@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_document_patient_id_index'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='edit',
+            index=models.Index(fields=['llm_output', '-updated_at'], name='edit_output_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='edit',
+            index=models.Index(fields=['status', '-updated_at'], name='edit_status_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='llmoutput',
+            index=models.Index(fields=['document', '-created_at'], name='llmoutput_doc_created_idx'),
+        ),
+    ]
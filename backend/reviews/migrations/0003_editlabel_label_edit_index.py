@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_list_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='editlabel',
+            index=models.Index(fields=['label', 'edit'], name='editlabel_label_edit_idx'),
+        ),
+    ]
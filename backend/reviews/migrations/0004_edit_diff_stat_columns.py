@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:40
+
+from django.db import migrations, models
+
+
+def backfill_diff_stat_columns(apps, schema_editor):
+    Edit = apps.get_model('reviews', 'Edit')
+    edits = list(Edit.objects.exclude(diff_stats={}).only('id', 'diff_stats'))
+    for edit in edits:
+        edit.additions = edit.diff_stats.get('token_additions', 0)
+        edit.deletions = edit.diff_stats.get('token_deletions', 0)
+        edit.change_rate = edit.diff_stats.get('change_rate', 0)
+    Edit.objects.bulk_update(edits, ['additions', 'deletions', 'change_rate'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_editlabel_label_edit_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='edit',
+            name='additions',
+            field=models.IntegerField(default=0, help_text='Tokens added (diff_stats token_additions)'),
+        ),
+        migrations.AddField(
+            model_name='edit',
+            name='change_rate',
+            field=models.FloatField(default=0.0, help_text='Percentage of original tokens affected (diff_stats change_rate)'),
+        ),
+        migrations.AddField(
+            model_name='edit',
+            name='deletions',
+            field=models.IntegerField(default=0, help_text='Tokens deleted (diff_stats token_deletions)'),
+        ),
+        migrations.RunPython(backfill_diff_stat_columns, migrations.RunPython.noop),
+    ]
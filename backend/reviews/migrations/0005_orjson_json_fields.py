@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:40
+
+import watson.encoders
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_edit_diff_stat_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='edit',
+            name='diff_stats',
+            field=models.JSONField(blank=True, decoder=watson.encoders.OrjsonDecoder, default=dict, encoder=watson.encoders.OrjsonEncoder, help_text='Statistics about the diff (additions, deletions, change rate)'),
+        ),
+        migrations.AlterField(
+            model_name='edit',
+            name='edited_content',
+            field=models.JSONField(decoder=watson.encoders.OrjsonDecoder, encoder=watson.encoders.OrjsonEncoder, help_text='The edited/revised JSON content'),
+        ),
+        migrations.AlterField(
+            model_name='edit',
+            name='structural_diff',
+            field=models.JSONField(blank=True, decoder=watson.encoders.OrjsonDecoder, default=dict, encoder=watson.encoders.OrjsonEncoder, help_text='Structural/JSON diff between original and edited'),
+        ),
+        migrations.AlterField(
+            model_name='edit',
+            name='token_diff',
+            field=models.JSONField(blank=True, decoder=watson.encoders.OrjsonDecoder, default=dict, encoder=watson.encoders.OrjsonEncoder, help_text='Token-level diff between original and edited'),
+        ),
+        migrations.AlterField(
+            model_name='llmoutput',
+            name='generation_params',
+            field=models.JSONField(blank=True, decoder=watson.encoders.OrjsonDecoder, default=dict, encoder=watson.encoders.OrjsonEncoder, help_text='Parameters used for generation (temperature, max_tokens, etc.)'),
+        ),
+        migrations.AlterField(
+            model_name='llmoutput',
+            name='output_content',
+            field=models.JSONField(decoder=watson.encoders.OrjsonDecoder, encoder=watson.encoders.OrjsonEncoder, help_text='Structured JSON output from the LLM'),
+        ),
+    ]
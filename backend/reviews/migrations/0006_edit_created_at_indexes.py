@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-14 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_orjson_json_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='edit',
+            index=models.Index(fields=['created_at', 'status'], name='edit_created_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='edit',
+            index=models.Index(fields=['created_at', 'llm_output'], name='edit_created_output_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-14 16:40
+
+from django.db import migrations
+
+DIFF_FIELDS = [
+    'token_diff', 'structural_diff', 'diff_stats',
+    'additions', 'deletions', 'change_rate',
+]
+BATCH_SIZE = 500
+
+
+def recompute_dict_diffs(apps, schema_editor):
+    # Dict content is now token-diffed leaf by leaf rather than as rendered
+    # JSON; recompute stored diffs so change_rate averages and exports
+    # don't mix the two measures
+    from reviews.services.diff_engine import compute_all_diffs
+
+    Edit = apps.get_model('reviews', 'Edit')
+    edits = (
+        Edit.objects.exclude(diff_stats={})
+        .select_related('llm_output')
+        .only('id', 'edited_content', 'llm_output__output_content')
+    )
+    batch = []
+    for edit in edits.iterator(chunk_size=BATCH_SIZE):
+        original = edit.llm_output.output_content
+        if not (isinstance(original, dict) and isinstance(edit.edited_content, dict)):
+            continue
+        edit.token_diff, edit.structural_diff, edit.diff_stats = compute_all_diffs(
+            original, edit.edited_content
+        )
+        edit.additions = edit.diff_stats['token_additions']
+        edit.deletions = edit.diff_stats['token_deletions']
+        edit.change_rate = edit.diff_stats['change_rate']
+        batch.append(edit)
+        if len(batch) == BATCH_SIZE:
+            Edit.objects.bulk_update(batch, DIFF_FIELDS)
+            batch = []
+    Edit.objects.bulk_update(batch, DIFF_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_edit_created_at_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_dict_diffs, migrations.RunPython.noop),
+    ]
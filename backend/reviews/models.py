@@ -3,6 +3,7 @@ from django.db import models
 from django.conf import settings
 
 from core.models import Document
+from watson.encoders import OrjsonDecoder, OrjsonEncoder
 
 
 class LLMOutput(models.Model):
@@ -34,6 +35,8 @@ class LLMOutput(models.Model):
 
     # Generated content
     output_content = models.JSONField(
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         help_text="Structured JSON output from the LLM"
     )
     raw_response = models.TextField(
@@ -48,6 +51,8 @@ class LLMOutput(models.Model):
         help_text="Identifier for the prompt template used"
     )
     generation_params = models.JSONField(
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         default=dict,
         blank=True,
         help_text="Parameters used for generation (temperature, max_tokens, etc.)"
@@ -58,6 +63,10 @@ class LLMOutput(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Outputs for a document, newest first
+            models.Index(fields=['document', '-created_at'], name='llmoutput_doc_created_idx'),
+        ]
         verbose_name = "LLM Output"
         verbose_name_plural = "LLM Outputs"
 
@@ -175,26 +184,49 @@ class Edit(models.Model):
 
     # Edited content
     edited_content = models.JSONField(
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         help_text="The edited/revised JSON content"
     )
 
     # Diff data (computed on submit)
     token_diff = models.JSONField(
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         default=dict,
         blank=True,
         help_text="Token-level diff between original and edited"
     )
     structural_diff = models.JSONField(
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         default=dict,
         blank=True,
         help_text="Structural/JSON diff between original and edited"
     )
     diff_stats = models.JSONField(
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         default=dict,
         blank=True,
         help_text="Statistics about the diff (additions, deletions, change rate)"
     )
 
+    # Scalar copies of diff_stats values so aggregates and sorts run on
+    # plain columns instead of JSON extraction
+    additions = models.IntegerField(
+        default=0,
+        help_text="Tokens added (diff_stats token_additions)"
+    )
+    deletions = models.IntegerField(
+        default=0,
+        help_text="Tokens deleted (diff_stats token_deletions)"
+    )
+    change_rate = models.FloatField(
+        default=0.0,
+        help_text="Percentage of original tokens affected (diff_stats change_rate)"
+    )
+
     # Status tracking
     status = models.CharField(
         max_length=20,
@@ -231,6 +263,15 @@ class Edit(models.Model):
 
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            # Edits for an output / with a status, in list order
+            models.Index(fields=['llm_output', '-updated_at'], name='edit_output_updated_idx'),
+            models.Index(fields=['status', '-updated_at'], name='edit_status_updated_idx'),
+            # Analytics and exports range-scan created_at, grouping by
+            # status or output (and the output's model)
+            models.Index(fields=['created_at', 'status'], name='edit_created_status_idx'),
+            models.Index(fields=['created_at', 'llm_output'], name='edit_created_output_idx'),
+        ]
         verbose_name = "Edit"
         verbose_name_plural = "Edits"
 
@@ -255,6 +296,9 @@ class Edit(models.Model):
         self.token_diff = token_diff
         self.structural_diff = structural_diff
         self.diff_stats = diff_stats
+        self.additions = diff_stats['token_additions']
+        self.deletions = diff_stats['token_deletions']
+        self.change_rate = diff_stats['change_rate']
 
         # Update status and timestamp
         self.status = self.Status.SUBMITTED
@@ -311,6 +355,10 @@ class EditLabel(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['edit', 'label']
+        indexes = [
+            # unique_together covers (edit, label); this serves "edits with label X"
+            models.Index(fields=['label', 'edit'], name='editlabel_label_edit_idx'),
+        ]
         verbose_name = "Edit Label"
         verbose_name_plural = "Edit Labels"
 
@@ -1,9 +1,10 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import LLMOutput, Label, Edit, EditLabel
-from core.serializers import DocumentSerializer, DocumentListSerializer
+from core.serializers import DocumentSerializer, DocumentListSerializer, UpdateFieldsMixin
 
 
-class LLMOutputSerializer(serializers.ModelSerializer):
+class LLMOutputSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     """Serializer for LLMOutput model."""
     document = DocumentListSerializer(read_only=True)
     document_id = serializers.UUIDField(write_only=True)
@@ -24,10 +25,17 @@ class LLMOutputSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load the nested document with the output."""
+        return queryset.select_related('document')
+
     def create(self, validated_data):
         document_id = validated_data.pop('document_id')
         from core.models import Document
-        document = Document.objects.get(id=document_id)
+        # The response nests the document, so load it here but only the
+        # columns DocumentListSerializer renders (skips raw_content)
+        document = Document.objects.only(*DocumentListSerializer.Meta.fields).get(id=document_id)
         return LLMOutput.objects.create(document=document, **validated_data)
 
 
@@ -47,8 +55,13 @@ class LLMOutputListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load document.title with the output."""
+        return queryset.select_related('document')
+
 
-class LabelSerializer(serializers.ModelSerializer):
+class LabelSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     """Serializer for Label model."""
 
     class Meta:
@@ -69,7 +82,7 @@ class LabelSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class EditLabelSerializer(serializers.ModelSerializer):
+class EditLabelSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     """Serializer for EditLabel model."""
     label = LabelSerializer(read_only=True)
     label_id = serializers.UUIDField(write_only=True)
@@ -88,8 +101,13 @@ class EditLabelSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load the nested label with the edit label."""
+        return queryset.select_related('label')
 
-class EditSerializer(serializers.ModelSerializer):
+
+class EditSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     """Serializer for Edit model."""
     llm_output = LLMOutputListSerializer(read_only=True)
     llm_output_id = serializers.UUIDField(write_only=True)
@@ -125,7 +143,18 @@ class EditSerializer(serializers.ModelSerializer):
             'submitted_at',
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load the nested LLM output, its document and labels up front."""
+        edit_labels = EditLabelSerializer.setup_eager_loading(EditLabel.objects.all())
+        return queryset.select_related('llm_output__document').prefetch_related(
+            Prefetch('edit_labels', queryset=edit_labels)
+        )
+
     def create(self, validated_data):
         llm_output_id = validated_data.pop('llm_output_id')
-        llm_output = LLMOutput.objects.get(id=llm_output_id)
+        # One query for both levels the response nests (llm_output.document)
+        llm_output = LLMOutput.objects.select_related('document').only(
+            'id', 'document_id', 'model_name', 'model_version', 'created_at', 'document__title',
+        ).get(id=llm_output_id)
         return Edit.objects.create(llm_output=llm_output, **validated_data)
@@ -1,8 +1,10 @@
 from .diff_engine import (
     tokenize,
+    myers_diff,
     compute_token_diff,
     compute_structural_diff,
     compute_diff_stats,
+    compute_leaf_token_diff,
     compute_all_diffs,
 )
 
@@ -10,21 +12,43 @@ from .export import (
     export_to_jsonl,
     export_to_csv,
     export_to_json,
+    write_jsonl,
+    write_csv,
+    write_json,
+    iter_jsonl,
+    iter_csv,
+    iter_json,
+    iter_chunked,
+    iter_export_bundle,
+    write_export_bundle,
     create_export_bundle,
+    export_bundle_filename,
     get_export_queryset,
 )
 
 __all__ = [
     # Diff engine
     'tokenize',
+    'myers_diff',
     'compute_token_diff',
     'compute_structural_diff',
     'compute_diff_stats',
+    'compute_leaf_token_diff',
     'compute_all_diffs',
     # Export
     'export_to_jsonl',
     'export_to_csv',
     'export_to_json',
+    'write_jsonl',
+    'write_csv',
+    'write_json',
+    'iter_jsonl',
+    'iter_csv',
+    'iter_json',
+    'iter_chunked',
+    'iter_export_bundle',
+    'write_export_bundle',
     'create_export_bundle',
+    'export_bundle_filename',
     'get_export_queryset',
 ]
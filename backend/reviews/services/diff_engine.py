@@ -7,8 +7,29 @@ between original LLM outputs and clinician-edited versions.
 import difflib
 import json
 import re
+from collections import Counter
 from typing import Any
 
+import orjson
+
+# Below this combined token count difflib's setup cost is lower than
+# running the Myers search
+MYERS_MIN_TOKENS = 64
+
+# Myers' search time and backtrack memory grow with the square of the
+# edit distance D. Past this many inserted plus deleted tokens (a heavy
+# rewrite rather than an edit) the diff falls back to difflib, whose cost
+# doesn't depend on D.
+MYERS_MAX_EDIT_DISTANCE = 500
+
+# Words, or single characters that are neither word nor whitespace
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]', re.UNICODE)
+
+# Same tokens for pure-ASCII text, which skips the Unicode tables. ASCII
+# \s lacks the \x1c-\x1f separators Unicode treats as whitespace, so
+# they are excluded explicitly.
+_TOKEN_RE_ASCII = re.compile(r'\w+|[^\w\s\x1c-\x1f]', re.ASCII)
+
 
 def tokenize(text: str) -> list[str]:
     """
@@ -23,15 +44,147 @@ def tokenize(text: str) -> list[str]:
     if not text:
         return []
     # Split on whitespace and punctuation, keeping punctuation as separate tokens
-    tokens = re.findall(r'\w+|[^\w\s]', text, re.UNICODE)
-    return tokens
+    if text.isascii():
+        return _TOKEN_RE_ASCII.findall(text)
+    return _TOKEN_RE.findall(text)
+
+
+def _myers_matching_blocks(
+    a: list, b: list, max_d: int | None = None
+) -> list[tuple[int, int, int]] | None:
+    """
+    Find the matching blocks of a shortest edit script with Myers' algorithm.
+
+    Runs in O((N+M)D) time, where D is the number of inserted and deleted
+    tokens, so near-identical inputs are cheap however long they are.
+
+    Returns:
+        List of (i, j, size) triples like SequenceMatcher.get_matching_blocks(),
+        ending with the (len(a), len(b), 0) sentinel; None if the edit
+        distance exceeds max_d
+    """
+    n, m = len(a), len(b)
+
+    # Common prefix and suffix never take part in the search
+    start = 0
+    while start < n and start < m and a[start] == b[start]:
+        start += 1
+    end_a, end_b = n, m
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+
+    blocks = []
+    if start:
+        blocks.append((0, 0, start))
+
+    # Compare small ints in the search loop rather than token strings
+    vocab = {}
+    a_mid = [vocab.setdefault(t, len(vocab)) for t in a[start:end_a]]
+    b_mid = [vocab.setdefault(t, len(vocab)) for t in b[start:end_b]]
+    n_mid, m_mid = len(a_mid), len(b_mid)
+
+    if n_mid and m_mid:
+        # V[k] is the furthest x reached on diagonal k = x - y; negative k
+        # wraps to the end of the list. trace[d] keeps diagonals -d..d of V
+        # as they were before step d, which is all the backtrack needs.
+        limit = n_mid + m_mid if max_d is None else min(max_d, n_mid + m_mid)
+        v = [0] * (2 * limit + 2)
+        trace = []
+        found = False
+        for d in range(limit + 1):
+            trace.append(v[-d:] + v[:d + 1] if d else v[:1])
+            for k in range(-d, d + 1, 2):
+                if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                    x = v[k + 1]
+                else:
+                    x = v[k - 1] + 1
+                y = x - k
+                while x < n_mid and y < m_mid and a_mid[x] == b_mid[y]:
+                    x += 1
+                    y += 1
+                v[k] = x
+                if x >= n_mid and y >= m_mid:
+                    found = True
+                    break
+            if found:
+                break
+        if not found:
+            return None
+
+        # Walk back from the end, collecting each diagonal run (snake)
+        snakes = []
+        x, y = n_mid, m_mid
+        for d in range(len(trace) - 1, 0, -1):
+            prev_v = trace[d]
+            k = x - y
+            if k == -d or (k != d and prev_v[k - 1 + d] < prev_v[k + 1 + d]):
+                prev_k = k + 1
+            else:
+                prev_k = k - 1
+            prev_x = prev_v[prev_k + d]
+            prev_y = prev_x - prev_k
+            # The snake starts after the single insert/delete step
+            snake_x = prev_x if prev_k == k + 1 else prev_x + 1
+            if x > snake_x:
+                snakes.append((snake_x, y - (x - snake_x), x - snake_x))
+            x, y = prev_x, prev_y
+        if x:
+            snakes.append((0, 0, x))
+
+        for i, j, size in reversed(snakes):
+            blocks.append((start + i, start + j, size))
+
+    if n - end_a:
+        blocks.append((end_a, end_b, n - end_a))
+    blocks.append((n, m, 0))
+    return blocks
+
+
+def myers_diff(
+    a: list, b: list, max_d: int | None = MYERS_MAX_EDIT_DISTANCE
+) -> list[tuple[str, int, int, int, int]]:
+    """
+    Diff two token lists with Myers' O((N+M)D) algorithm.
+
+    Unlike difflib.SequenceMatcher there is no autojunk heuristic, so
+    frequent tokens such as JSON punctuation still align. If the edit
+    distance exceeds max_d, difflib.SequenceMatcher's opcodes are returned
+    instead (not necessarily a shortest edit script).
+
+    Args:
+        a: Original tokens
+        b: Edited tokens
+        max_d: Largest edit distance to search for, or None for no limit
+
+    Returns:
+        Opcodes in the SequenceMatcher.get_opcodes() format
+    """
+    blocks = _myers_matching_blocks(a, b, max_d)
+    if blocks is None:
+        return difflib.SequenceMatcher(None, a, b).get_opcodes()
+
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in blocks:
+        if i < ai and j < bj:
+            opcodes.append(('replace', i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(('delete', i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(('insert', i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(('equal', ai, i, bj, j))
+    return opcodes
 
 
 def compute_token_diff(original: str, edited: str) -> dict:
     """
     Compute token-level diff between original and edited text.
 
-    Uses difflib.SequenceMatcher to find differences at the token level.
+    Uses Myers' algorithm to find differences at the token level, or
+    difflib.SequenceMatcher for very short inputs and heavy rewrites.
 
     Args:
         original: Original text from LLM output
@@ -42,14 +195,41 @@ def compute_token_diff(original: str, edited: str) -> dict:
         - operations: List of diff operations (equal, insert, delete, replace)
         - original_tokens: Original token list
         - edited_tokens: Edited token list
+        - original_token_count / edited_token_count: Token list lengths
+        - unchanged_token_count: Tokens inside equal runs
     """
+    if original == edited:
+        # Nothing to match: one equal run over a single tokenization
+        tokens = tokenize(original)
+        n = len(tokens)
+        return {
+            'operations': [{
+                'operation': 'equal',
+                'original_start': 0,
+                'original_end': n,
+                'edited_start': 0,
+                'edited_end': n,
+                'tokens': tokens,
+            }] if n else [],
+            'original_tokens': tokens,
+            'edited_tokens': list(tokens),
+            'original_token_count': n,
+            'edited_token_count': n,
+            'unchanged_token_count': n,
+        }
+
     original_tokens = tokenize(original)
     edited_tokens = tokenize(edited)
 
-    matcher = difflib.SequenceMatcher(None, original_tokens, edited_tokens)
+    if len(original_tokens) + len(edited_tokens) < MYERS_MIN_TOKENS:
+        opcodes = difflib.SequenceMatcher(None, original_tokens, edited_tokens).get_opcodes()
+    else:
+        opcodes = myers_diff(original_tokens, edited_tokens)
+
     operations = []
+    unchanged = 0
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in opcodes:
         op = {
             'operation': tag,
             'original_start': i1,
@@ -60,6 +240,7 @@ def compute_token_diff(original: str, edited: str) -> dict:
 
         if tag == 'equal':
             op['tokens'] = original_tokens[i1:i2]
+            unchanged += i2 - i1
         elif tag == 'delete':
             op['deleted_tokens'] = original_tokens[i1:i2]
         elif tag == 'insert':
@@ -76,102 +257,161 @@ def compute_token_diff(original: str, edited: str) -> dict:
         'edited_tokens': edited_tokens,
         'original_token_count': len(original_tokens),
         'edited_token_count': len(edited_tokens),
+        'unchanged_token_count': unchanged,
     }
 
 
+# Stands in for a dict key or list item present on one side only
+_MISSING = object()
+
+
+def _render_path(node: tuple | None) -> str:
+    """Render a path link chain as 'a.b[0].c'."""
+    segments = []
+    while node is not None:
+        node, segment, is_index = node
+        segments.append((segment, is_index))
+
+    rendered = ''
+    for segment, is_index in reversed(segments):
+        if is_index:
+            rendered += f"[{segment}]"
+        elif rendered:
+            rendered += f".{segment}"
+        else:
+            rendered = str(segment)
+    return rendered
+
+
+
+def _same_json(original: Any, edited: Any) -> bool:
+    """
+    Whether two JSON values are equal, including the type of every leaf.
+
+    == runs in C and fails fast on real differences, but treats 1, 1.0 and
+    True alike; the sorted orjson encodings tell those apart. Values too
+    deep to compare or that orjson can't encode are reported as different
+    and left to the full walk.
+    """
+    if original is edited:
+        return True
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    try:
+        if original != edited:
+            return False
+        return orjson.dumps(original, option=option) == orjson.dumps(edited, option=option)
+    except (RecursionError, orjson.JSONEncodeError):
+        return False
+
+
 def compute_structural_diff(original: Any, edited: Any, path: str = '') -> list[dict]:
     """
     Compute structural diff between two JSON objects.
 
-    Recursively compares JSON structures and identifies additions,
-    deletions, and modifications at each level.
+    Walks both JSON structures with an explicit stack (so deep nesting
+    can't hit the recursion limit) and identifies additions, deletions,
+    and modifications at each level, in depth-first order.
 
     Args:
         original: Original JSON object
         edited: Edited JSON object
-        path: Current JSON path (for nested structures)
+        path: Path prefix for the reported changes
 
     Returns:
         List of structural changes with paths and values
     """
-    changes = []
-
-    # Handle None cases
-    if original is None and edited is None:
-        return changes
-    if original is None:
-        changes.append({
-            'path': path or '/',
-            'operation': 'add',
-            'value': edited,
-        })
-        return changes
-    if edited is None:
-        changes.append({
-            'path': path or '/',
-            'operation': 'delete',
-            'old_value': original,
-        })
-        return changes
-
-    # Different types
-    if type(original) != type(edited):
-        changes.append({
-            'path': path or '/',
-            'operation': 'replace',
-            'old_value': original,
-            'new_value': edited,
-        })
-        return changes
-
-    # Compare dicts
-    if isinstance(original, dict):
-        all_keys = set(original.keys()) | set(edited.keys())
-        for key in all_keys:
-            new_path = f"{path}.{key}" if path else key
-            if key not in original:
-                changes.append({
-                    'path': new_path,
-                    'operation': 'add',
-                    'value': edited[key],
-                })
-            elif key not in edited:
-                changes.append({
-                    'path': new_path,
-                    'operation': 'delete',
-                    'old_value': original[key],
-                })
-            else:
-                changes.extend(compute_structural_diff(original[key], edited[key], new_path))
-
-    # Compare lists
-    elif isinstance(original, list):
-        max_len = max(len(original), len(edited))
-        for i in range(max_len):
-            new_path = f"{path}[{i}]"
-            if i >= len(original):
-                changes.append({
-                    'path': new_path,
-                    'operation': 'add',
-                    'value': edited[i],
-                })
-            elif i >= len(edited):
-                changes.append({
-                    'path': new_path,
-                    'operation': 'delete',
-                    'old_value': original[i],
-                })
-            else:
-                changes.extend(compute_structural_diff(original[i], edited[i], new_path))
+    # Unchanged content (the common no-op edit) needs no walk
+    if _same_json(original, edited):
+        return []
 
-    # Compare primitives (strings, numbers, bools)
-    elif original != edited:
-        changes.append({
-            'path': path or '/',
-            'operation': 'modify',
-            'old_value': original,
-            'new_value': edited,
-        })
+    changes = []
+    # Paths are kept as (parent, segment, is_index) links while walking and
+    # only rendered as strings for reported changes
+    stack = [(original, edited, (None, path, False) if path else None)]
+
+    while stack:
+        original, edited, path = stack.pop()
+
+        # Shared references (reused defaults, copied-over subtrees) can't differ
+        if original is edited:
+            continue
+
+        # Key or item present on one side only
+        if original is _MISSING:
+            changes.append({
+                'path': _render_path(path),
+                'operation': 'add',
+                'value': edited,
+            })
+            continue
+        if edited is _MISSING:
+            changes.append({
+                'path': _render_path(path),
+                'operation': 'delete',
+                'old_value': original,
+            })
+            continue
+
+        # Handle None cases
+        if original is None and edited is None:
+            continue
+        if original is None:
+            changes.append({
+                'path': _render_path(path) or '/',
+                'operation': 'add',
+                'value': edited,
+            })
+            continue
+        if edited is None:
+            changes.append({
+                'path': _render_path(path) or '/',
+                'operation': 'delete',
+                'old_value': original,
+            })
+            continue
+
+        # Different types
+        original_type = type(original)
+        if original_type is not type(edited):
+            changes.append({
+                'path': _render_path(path) or '/',
+                'operation': 'replace',
+                'old_value': original,
+                'new_value': edited,
+            })
+            continue
+
+        # Compare dicts; children are pushed in reverse so they pop in order
+        if original_type is dict or isinstance(original, dict):
+            children = []
+            for key in set(original.keys()) | set(edited.keys()):
+                children.append((
+                    original.get(key, _MISSING),
+                    edited.get(key, _MISSING),
+                    (path, key, False),
+                ))
+            children.reverse()
+            stack.extend(children)
+
+        # Compare lists
+        elif original_type is list or isinstance(original, list):
+            original_len = len(original)
+            edited_len = len(edited)
+            for i in range(max(original_len, edited_len) - 1, -1, -1):
+                stack.append((
+                    original[i] if i < original_len else _MISSING,
+                    edited[i] if i < edited_len else _MISSING,
+                    (path, i, True),
+                ))
+
+        # Compare primitives (strings, numbers, bools)
+        elif original != edited:
+            changes.append({
+                'path': _render_path(path) or '/',
+                'operation': 'modify',
+                'old_value': original,
+                'new_value': edited,
+            })
 
     return changes
 
@@ -181,7 +421,7 @@ def compute_diff_stats(token_diff: dict, structural_diff: list[dict]) -> dict:
     Compute statistics about the differences.
 
     Args:
-        token_diff: Result from compute_token_diff()
+        token_diff: Result from compute_token_diff() or compute_leaf_token_diff()
         structural_diff: Result from compute_structural_diff()
 
     Returns:
@@ -194,32 +434,42 @@ def compute_diff_stats(token_diff: dict, structural_diff: list[dict]) -> dict:
         - structural_deletions: Number of structural deletions
         - structural_modifications: Number of structural modifications
     """
-    token_additions = 0
-    token_deletions = 0
-    token_unchanged = 0
-
-    for op in token_diff.get('operations', []):
-        operation = op.get('operation')
-        if operation == 'equal':
-            token_unchanged += len(op.get('tokens', []))
-        elif operation == 'delete':
-            token_deletions += len(op.get('deleted_tokens', []))
-        elif operation == 'insert':
-            token_additions += len(op.get('inserted_tokens', []))
-        elif operation == 'replace':
-            token_deletions += len(op.get('deleted_tokens', []))
-            token_additions += len(op.get('inserted_tokens', []))
-
     original_count = token_diff.get('original_token_count', 0)
+    edited_count = token_diff.get('edited_token_count', 0)
+
+    if 'unchanged_token_count' in token_diff:
+        # Every token is either unchanged or added/deleted, so the counts
+        # follow from the totals without walking the operations
+        token_unchanged = token_diff['unchanged_token_count']
+        token_additions = edited_count - token_unchanged
+        token_deletions = original_count - token_unchanged
+    else:
+        # Token diffs stored before the counts were recorded
+        token_additions = 0
+        token_deletions = 0
+        token_unchanged = 0
+
+        for op in token_diff.get('operations', []):
+            operation = op.get('operation')
+            if operation == 'equal':
+                token_unchanged += len(op.get('tokens', []))
+            elif operation == 'delete':
+                token_deletions += len(op.get('deleted_tokens', []))
+            elif operation == 'insert':
+                token_additions += len(op.get('inserted_tokens', []))
+            elif operation == 'replace':
+                token_deletions += len(op.get('deleted_tokens', []))
+                token_additions += len(op.get('inserted_tokens', []))
 
     # Calculate change rate (tokens affected / original tokens)
     tokens_affected = token_deletions  # Deletions and replacements
     change_rate = (tokens_affected / original_count * 100) if original_count > 0 else 0
 
     # Structural stats
-    structural_additions = sum(1 for c in structural_diff if c.get('operation') == 'add')
-    structural_deletions = sum(1 for c in structural_diff if c.get('operation') == 'delete')
-    structural_modifications = sum(1 for c in structural_diff if c.get('operation') in ('modify', 'replace'))
+    operation_counts = Counter(c.get('operation') for c in structural_diff)
+    structural_additions = operation_counts['add']
+    structural_deletions = operation_counts['delete']
+    structural_modifications = operation_counts['modify'] + operation_counts['replace']
 
     return {
         'token_additions': token_additions,
@@ -227,7 +477,7 @@ def compute_diff_stats(token_diff: dict, structural_diff: list[dict]) -> dict:
         'token_unchanged': token_unchanged,
         'change_rate': round(change_rate, 2),
         'original_token_count': original_count,
-        'edited_token_count': token_diff.get('edited_token_count', 0),
+        'edited_token_count': edited_count,
         'structural_additions': structural_additions,
         'structural_deletions': structural_deletions,
         'structural_modifications': structural_modifications,
@@ -235,11 +485,126 @@ def compute_diff_stats(token_diff: dict, structural_diff: list[dict]) -> dict:
     }
 
 
+def _content_text(content: Any) -> str:
+    """Render content as text for token comparison."""
+    if isinstance(content, dict):
+        # Same layout as json.dumps(indent=2, ensure_ascii=False)
+        try:
+            return orjson.dumps(
+                content,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            ).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # Integers past 64 bits
+            return json.dumps(content, default=str, indent=2, ensure_ascii=False)
+    return str(content)
+
+
+def _leaf_text(value: Any) -> str:
+    # Strings as-is; other primitives as their JSON literal (true, null, 1.5)
+    if isinstance(value, str):
+        return value
+    try:
+        return orjson.dumps(value, default=str).decode('utf-8')
+    except orjson.JSONEncodeError:
+        return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _value_tokens(value: Any) -> list[str]:
+    """Tokens of every primitive leaf in a JSON value, in document order."""
+    tokens = []
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+        else:
+            tokens.extend(tokenize(_leaf_text(node)))
+    return tokens
+
+
+def compute_leaf_token_diff(original: Any, edited: Any, structural_diff: list[dict]) -> dict:
+    """
+    Compute a token diff from the leaves a structural diff reports as changed.
+
+    Instead of diffing the rendered JSON (mostly brace, quote and key
+    tokens), only the values that changed are tokenized and diffed.
+    Operation offsets are relative to the leaf named by each operation's
+    'path'; added and deleted subtrees count all of their leaf tokens.
+
+    Args:
+        original: Original JSON object
+        edited: Edited JSON object
+        structural_diff: Result from compute_structural_diff(original, edited)
+
+    Returns:
+        Dict containing:
+        - operations: Diff operations, each tagged with its 'path'
+        - original_token_count: Leaf tokens in the original
+        - edited_token_count: Leaf tokens in the edited version
+        - unchanged_token_count: Original tokens not deleted or replaced
+    """
+    operations = []
+    deleted = 0
+
+    for change in structural_diff:
+        operation = change['operation']
+        path = change['path']
+
+        if operation == 'modify':
+            leaf_diff = compute_token_diff(
+                _leaf_text(change['old_value']),
+                _leaf_text(change['new_value']),
+            )
+            for op in leaf_diff['operations']:
+                op['path'] = path
+                operations.append(op)
+                deleted += len(op.get('deleted_tokens', ()))
+            continue
+
+        # Whole subtree added, deleted or replaced by a different type
+        old_tokens = _value_tokens(change['old_value']) if operation != 'add' else []
+        if operation == 'add':
+            new_tokens = _value_tokens(change['value'])
+        elif operation == 'replace':
+            new_tokens = _value_tokens(change['new_value'])
+        else:
+            new_tokens = []
+
+        op = {
+            'operation': 'insert' if operation == 'add' else operation,
+            'path': path,
+            'original_start': 0,
+            'original_end': len(old_tokens),
+            'edited_start': 0,
+            'edited_end': len(new_tokens),
+        }
+        if operation != 'add':
+            op['deleted_tokens'] = old_tokens
+        if operation != 'delete':
+            op['inserted_tokens'] = new_tokens
+        operations.append(op)
+        deleted += len(old_tokens)
+
+    original_count = len(_value_tokens(original))
+    return {
+        'operations': operations,
+        'original_token_count': original_count,
+        'edited_token_count': len(_value_tokens(edited)),
+        'unchanged_token_count': original_count - deleted,
+    }
+
+
 def compute_all_diffs(original_content: Any, edited_content: Any) -> tuple[dict, list[dict], dict]:
     """
     Compute all diffs for an edit submission.
 
-    Handles both text and JSON content appropriately.
+    Handles both text and JSON content appropriately. When both sides are
+    dicts, token stats come from the changed leaves only; otherwise the
+    rendered text is token-diffed.
 
     Args:
         original_content: Original content (JSON object or dict with text)
@@ -248,16 +613,22 @@ def compute_all_diffs(original_content: Any, edited_content: Any) -> tuple[dict,
     Returns:
         Tuple of (token_diff, structural_diff, diff_stats)
     """
-    # Convert to JSON strings for token comparison if needed
-    if isinstance(original_content, dict):
-        original_text = json.dumps(original_content, indent=2, ensure_ascii=False)
-    else:
-        original_text = str(original_content)
+    if isinstance(original_content, dict) and isinstance(edited_content, dict):
+        # The structural diff already locates every change; token-diff just
+        # those leaves instead of the whole rendered document
+        structural_diff = compute_structural_diff(original_content, edited_content)
+        token_diff = compute_leaf_token_diff(original_content, edited_content, structural_diff)
+        return token_diff, structural_diff, compute_diff_stats(token_diff, structural_diff)
+
+    if _same_json(original_content, edited_content):
+        # Unchanged edit: render once and skip both diff passes
+        text = _content_text(original_content)
+        token_diff = compute_token_diff(text, text)
+        return token_diff, [], compute_diff_stats(token_diff, [])
 
-    if isinstance(edited_content, dict):
-        edited_text = json.dumps(edited_content, indent=2, ensure_ascii=False)
-    else:
-        edited_text = str(edited_content)
+    # Convert to JSON strings for token comparison if needed
+    original_text = _content_text(original_content)
+    edited_text = _content_text(edited_content)
 
     # Compute diffs
     token_diff = compute_token_diff(original_text, edited_text)
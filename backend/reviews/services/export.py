@@ -5,15 +5,65 @@ Supports JSONL and CSV export formats with optional ZIP bundling.
 """
 import csv
 import json
-import io
+import os
 import zipfile
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict, Any, Tuple, Optional
+from itertools import islice
+from typing import List, Dict, Any, AnyStr, Tuple, Optional, Iterable, Iterator, TextIO, BinaryIO
 
+import orjson
+from django.db.models import QuerySet, TextField
+from django.db.models.functions import Cast
 from django.utils import timezone
 
 from reviews.models import Edit, EditLabel
-
+from watson.encoders import OrjsonDecoder
+
+# Edits fetched per round-trip when streaming an export queryset
+EXPORT_CHUNK_SIZE = 500
+
+# Approximate bytes per chunk of a streamed export response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Deflate level for export bundles. JSON compresses well even at level 1,
+# and bundle generation is bound by zlib CPU time at the default level 6
+EXPORT_COMPRESSLEVEL = int(os.environ.get('WATSON_EXPORT_COMPRESSLEVEL', 1))
+
+# Edit and LLM output columns the exporters read
+EXPORT_FIELDS = (
+    'id',
+    'llm_output_id',
+    'editor_id',
+    'editor_name',
+    'status',
+    'edited_content',
+    'diff_stats',
+    'editor_notes',
+    'reviewer_notes',
+    'created_at',
+    'updated_at',
+    'submitted_at',
+    'llm_output__document_id',
+    'llm_output__model_name',
+    'llm_output__model_version',
+    'llm_output__output_content',
+)
+
+# Diff columns computed when an edit is submitted. Export querysets load
+# them as JSON text so JSONL rows can embed them without a decode and
+# re-encode per row.
+RAW_DIFF_FIELDS = ('token_diff', 'structural_diff')
+
+# Label columns exported per edit, in export order
+_LABEL_FIELDS = (
+    'label__name',
+    'label__display_name',
+    'label__category',
+    'label__severity',
+    'notes',
+    'content_path',
+)
 
 def generate_export_metadata(
     format_type: str,
@@ -32,26 +82,77 @@ def generate_export_metadata(
     }
 
 
-def edit_to_dict(edit: Edit) -> Dict[str, Any]:
-    """Convert an Edit model instance to a dictionary for export."""
-    # Get labels for this edit
-    labels = list(
-        EditLabel.objects.filter(edit=edit)
-        .select_related('label')
-        .values(
-            'label__name',
-            'label__display_name',
-            'label__category',
-            'label__severity',
-            'notes',
-            'content_path',
-        )
-    )
-
+def _label_dict(edit_label: EditLabel) -> Dict[str, Any]:
     return {
-        "id": str(edit.id),
-        "llm_output_id": str(edit.llm_output_id),
-        "document_id": str(edit.llm_output.document_id),
+        "name": edit_label.label.name,
+        "display_name": edit_label.label.display_name,
+        "category": edit_label.label.category,
+        "severity": edit_label.label.severity,
+        "notes": edit_label.notes,
+        "content_path": edit_label.content_path,
+    }
+
+
+def labels_by_edit(edit_ids: Iterable[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    Fetch export labels for a batch of edits in one query.
+
+    Returns:
+        Dict mapping edit id to its list of label dicts; edits without
+        labels are absent
+    """
+    grouped = defaultdict(list)
+    rows = EditLabel.objects.filter(edit_id__in=edit_ids).values_list('edit_id', *_LABEL_FIELDS)
+    for edit_id, name, display_name, category, severity, notes, content_path in rows:
+        grouped[edit_id].append({
+            "name": name,
+            "display_name": display_name,
+            "category": category,
+            "severity": severity,
+            "notes": notes,
+            "content_path": content_path,
+        })
+    return grouped
+
+
+def _raw_diffs(edit: Edit) -> Optional[Dict[str, Optional[str]]]:
+    """Stored diff JSON text annotated by get_export_queryset, if present."""
+    try:
+        return {name: edit.__dict__[f"{name}_json"] for name in RAW_DIFF_FIELDS}
+    except KeyError:
+        return None
+
+
+def _diff_value(edit: Edit, name: str) -> Any:
+    raw = edit.__dict__.get(f"{name}_json")
+    if raw is not None:
+        return json.loads(raw, cls=OrjsonDecoder)
+    return getattr(edit, name)
+
+
+def edit_to_dict(
+    edit: Edit,
+    labels: Optional[List[Dict[str, Any]]] = None,
+    include_diffs: bool = True,
+) -> Dict[str, Any]:
+    """
+    Convert an Edit model instance to a dictionary for export.
+
+    Pass labels from labels_by_edit() when exporting in bulk; without
+    them the edit's own edit_labels are read. With include_diffs=False
+    the token_diff and structural_diff keys are left out.
+
+    UUIDs and datetimes are left as objects for orjson to encode natively
+    (hyphenated hex and ISO 8601, the same text str() and isoformat()
+    give).
+    """
+    if labels is None:
+        labels = [_label_dict(edit_label) for edit_label in edit.edit_labels.all()]
+
+    data = {
+        "id": edit.id,
+        "llm_output_id": edit.llm_output_id,
+        "document_id": edit.llm_output.document_id,
         "model_name": edit.llm_output.model_name,
         "model_version": edit.llm_output.model_version,
         "editor_id": edit.editor_id,
@@ -59,159 +160,291 @@ def edit_to_dict(edit: Edit) -> Dict[str, Any]:
         "status": edit.status,
         "original_content": edit.llm_output.output_content,
         "edited_content": edit.edited_content,
-        "token_diff": edit.token_diff,
-        "structural_diff": edit.structural_diff,
         "diff_stats": edit.diff_stats,
         "editor_notes": edit.editor_notes,
         "reviewer_notes": edit.reviewer_notes,
-        "labels": [
-            {
-                "name": label['label__name'],
-                "display_name": label['label__display_name'],
-                "category": label['label__category'],
-                "severity": label['label__severity'],
-                "notes": label['notes'],
-                "content_path": label['content_path'],
-            }
-            for label in labels
-        ],
-        "created_at": edit.created_at.isoformat(),
-        "updated_at": edit.updated_at.isoformat(),
-        "submitted_at": edit.submitted_at.isoformat() if edit.submitted_at else None,
+        "labels": labels,
+        "created_at": edit.created_at,
+        "updated_at": edit.updated_at,
+        "submitted_at": edit.submitted_at,
     }
+    if include_diffs:
+        for name in RAW_DIFF_FIELDS:
+            data[name] = _diff_value(edit, name)
+    return data
+
+
+# CSV columns, in order
+CSV_FIELDS = (
+    "id",
+    "llm_output_id",
+    "document_id",
+    "model_name",
+    "model_version",
+    "editor_id",
+    "editor_name",
+    "status",
+    "token_additions",
+    "token_deletions",
+    "token_unchanged",
+    "change_rate",
+    "original_token_count",
+    "edited_token_count",
+    "structural_additions",
+    "structural_deletions",
+    "structural_modifications",
+    "total_structural_changes",
+    "labels",
+    "label_count",
+    "editor_notes",
+    "reviewer_notes",
+    "created_at",
+    "updated_at",
+    "submitted_at",
+)
+
+
+def edit_to_flat_row(edit: Edit, labels: Optional[List[Dict[str, Any]]] = None) -> Tuple[Any, ...]:
+    """Convert an Edit to a CSV row with values in CSV_FIELDS order."""
+    if labels is None:
+        labels = [_label_dict(edit_label) for edit_label in edit.edit_labels.all()]
+    label_names = [label["name"] for label in labels]
+
+    diff_stats = edit.diff_stats or {}
+    stat = diff_stats.get
+
+    # csv.writer stringifies the UUIDs itself
+    return (
+        edit.id,
+        edit.llm_output_id,
+        edit.llm_output.document_id,
+        edit.llm_output.model_name,
+        edit.llm_output.model_version,
+        edit.editor_id,
+        edit.editor_name,
+        edit.status,
+        stat("token_additions", 0),
+        stat("token_deletions", 0),
+        stat("token_unchanged", 0),
+        stat("change_rate", 0),
+        stat("original_token_count", 0),
+        stat("edited_token_count", 0),
+        stat("structural_additions", 0),
+        stat("structural_deletions", 0),
+        stat("structural_modifications", 0),
+        stat("total_structural_changes", 0),
+        "|".join(label_names),
+        len(label_names),
+        edit.editor_notes,
+        edit.reviewer_notes,
+        edit.created_at.isoformat(),
+        edit.updated_at.isoformat(),
+        edit.submitted_at.isoformat() if edit.submitted_at else "",
+    )
 
 
-def edit_to_flat_dict(edit: Edit) -> Dict[str, Any]:
+def edit_to_flat_dict(edit: Edit, labels: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """Convert an Edit to a flat dictionary for CSV export."""
-    labels = list(
-        EditLabel.objects.filter(edit=edit)
-        .select_related('label')
-        .values_list('label__name', flat=True)
+    return dict(zip(CSV_FIELDS, edit_to_flat_row(edit, labels)))
+
+
+def _iter_edits(edits: Iterable[Edit]) -> Iterator[Tuple[Edit, List[Dict[str, Any]]]]:
+    """
+    Yield (edit, labels) pairs, fetching labels once per batch of edits.
+
+    Querysets are streamed in chunks instead of being cached.
+    """
+    if isinstance(edits, QuerySet):
+        edits = edits.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    edits = iter(edits)
+    while True:
+        batch = list(islice(edits, EXPORT_CHUNK_SIZE))
+        if not batch:
+            return
+        labels = labels_by_edit([edit.id for edit in batch])
+        for edit in batch:
+            yield edit, labels.get(edit.id, [])
+
+
+def _count_edits(edits: Iterable[Edit]) -> int:
+    if isinstance(edits, QuerySet):
+        return edits.count()
+    return len(edits)
+
+
+def _dumps(value: Any, option: int = 0) -> bytes:
+    # orjson writes UTF-8 directly; anything it can't encode is stringified
+    try:
+        return orjson.dumps(value, default=str, option=option)
+    except orjson.JSONEncodeError:
+        # Integers past 64 bits; same layout as orjson's output
+        if option & orjson.OPT_INDENT_2:
+            text = json.dumps(value, default=_json_default, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(value, default=_json_default, separators=(',', ':'), ensure_ascii=False)
+        return text.encode('utf-8')
+
+
+def _json_default(value: Any) -> str:
+    # Datetimes in orjson's ISO format; everything else stringified
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _edit_json_line(edit: Edit, labels: List[Dict[str, Any]]) -> bytes:
+    raw = _raw_diffs(edit)
+    if raw is None:
+        return _dumps(edit_to_dict(edit, labels))
+
+    # Splice the stored diff JSON in as-is before the closing brace
+    line = bytearray(_dumps(edit_to_dict(edit, labels, include_diffs=False)))
+    line.pop()
+    for name, text in raw.items():
+        line += b',"%s":' % name.encode()
+        line += text.encode('utf-8') if text is not None else b'null'
+    line += b'}'
+    return bytes(line)
+
+
+def iter_jsonl(edits: Iterable[Edit]) -> Iterator[bytes]:
+    """Yield edits in JSONL format, one encoded row at a time."""
+    separator = b""
+    for edit, labels in _iter_edits(edits):
+        yield separator + _edit_json_line(edit, labels)
+        separator = b"\n"
+
+
+class _Echo:
+    """File-like object whose write() hands back what csv.writer wrote."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(edits: Iterable[Edit]) -> Iterator[str]:
+    """
+    Yield edits in CSV format, one row at a time.
+
+    Nothing is yielded when there are no edits.
+    """
+    rows = (edit_to_flat_row(edit, labels) for edit, labels in _iter_edits(edits))
+    first = next(rows, None)
+    if first is None:
+        return
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_FIELDS)
+    yield writer.writerow(first)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _indented(value: Any, level: int) -> bytes:
+    # Lines of a standalone indented dump, shifted to sit `level` levels
+    # deep, are byte-identical to dumping the enclosing document at once
+    data = _dumps(value, orjson.OPT_INDENT_2)
+    return data.replace(b"\n", b"\n" + b"  " * level)
+
+
+def iter_json(edits: Iterable[Edit], time_range: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Yield edits in full JSON format with metadata, one edit at a time.
+
+    Output matches dumping the whole document with two-space indentation,
+    but each edit is encoded on its own.
+    """
+    metadata = generate_export_metadata(
+        format_type="json",
+        time_range=time_range,
+        total_records=_count_edits(edits),
     )
+    yield b'{\n  "metadata": ' + _indented(metadata, 1) + b',\n  "edits": ['
 
-    diff_stats = edit.diff_stats or {}
+    separator = b"\n    "
+    for edit, labels in _iter_edits(edits):
+        yield separator + _indented(edit_to_dict(edit, labels), 2)
+        separator = b",\n    "
 
-    return {
-        "id": str(edit.id),
-        "llm_output_id": str(edit.llm_output_id),
-        "document_id": str(edit.llm_output.document_id),
-        "model_name": edit.llm_output.model_name,
-        "model_version": edit.llm_output.model_version,
-        "editor_id": edit.editor_id,
-        "editor_name": edit.editor_name,
-        "status": edit.status,
-        "token_additions": diff_stats.get("token_additions", 0),
-        "token_deletions": diff_stats.get("token_deletions", 0),
-        "token_unchanged": diff_stats.get("token_unchanged", 0),
-        "change_rate": diff_stats.get("change_rate", 0),
-        "original_token_count": diff_stats.get("original_token_count", 0),
-        "edited_token_count": diff_stats.get("edited_token_count", 0),
-        "structural_additions": diff_stats.get("structural_additions", 0),
-        "structural_deletions": diff_stats.get("structural_deletions", 0),
-        "structural_modifications": diff_stats.get("structural_modifications", 0),
-        "total_structural_changes": diff_stats.get("total_structural_changes", 0),
-        "labels": "|".join(labels),
-        "label_count": len(labels),
-        "editor_notes": edit.editor_notes,
-        "reviewer_notes": edit.reviewer_notes,
-        "created_at": edit.created_at.isoformat(),
-        "updated_at": edit.updated_at.isoformat(),
-        "submitted_at": edit.submitted_at.isoformat() if edit.submitted_at else "",
-    }
+    # An empty list is written as []
+    yield b"]\n}" if separator == b"\n    " else b"\n  ]\n}"
 
 
-def export_to_jsonl(edits: List[Edit]) -> str:
-    """Export edits to JSONL format (one JSON object per line)."""
-    lines = []
-    for edit in edits:
-        edit_dict = edit_to_dict(edit)
-        lines.append(json.dumps(edit_dict, ensure_ascii=False))
-    return "\n".join(lines)
+def write_jsonl(edits: Iterable[Edit], fh: BinaryIO) -> None:
+    """Write edits to a binary stream in JSONL format, one row at a time."""
+    for chunk in iter_jsonl(edits):
+        fh.write(chunk)
 
 
-def export_to_csv(edits: List[Edit]) -> str:
-    """Export edits to CSV format."""
-    if not edits:
-        return ""
+def write_csv(edits: Iterable[Edit], fh: TextIO) -> None:
+    """Write edits to a text stream in CSV format, one row at a time."""
+    for chunk in iter_csv(edits):
+        fh.write(chunk)
 
-    # Get all flat dicts
-    rows = [edit_to_flat_dict(edit) for edit in edits]
 
-    # Get fieldnames from first row
-    fieldnames = list(rows[0].keys())
+def write_json(
+    edits: Iterable[Edit],
+    fh: BinaryIO,
+    time_range: Optional[str] = None,
+) -> None:
+    """Write edits to a binary stream in full JSON format with metadata."""
+    for chunk in iter_json(edits, time_range):
+        fh.write(chunk)
 
-    # Write to string buffer
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(rows)
 
-    return output.getvalue()
+def export_to_jsonl(edits: Iterable[Edit]) -> str:
+    """Export edits to JSONL format (one JSON object per line)."""
+    return b"".join(iter_jsonl(edits)).decode('utf-8')
+
+
+def export_to_csv(edits: Iterable[Edit]) -> str:
+    """Export edits to CSV format."""
+    return "".join(iter_csv(edits))
 
 
-def export_to_json(edits: List[Edit], time_range: Optional[str] = None) -> str:
+def export_to_json(edits: Iterable[Edit], time_range: Optional[str] = None) -> str:
     """Export edits to full JSON format with metadata."""
-    data = {
-        "metadata": generate_export_metadata(
-            format_type="json",
-            time_range=time_range,
-            total_records=len(edits),
-        ),
-        "edits": [edit_to_dict(edit) for edit in edits],
-    }
-    return json.dumps(data, indent=2, ensure_ascii=False)
+    return b"".join(iter_json(edits, time_range)).decode('utf-8')
 
 
-def create_export_bundle(
-    edits: List[Edit],
-    formats: List[str] = ["jsonl", "csv"],
-    time_range: Optional[str] = None,
-) -> Tuple[bytes, str]:
-    """
-    Create a ZIP bundle containing exports in multiple formats.
+def iter_chunked(chunks: Iterable[AnyStr], size: int = STREAM_CHUNK_SIZE) -> Iterator[AnyStr]:
+    """Join small chunks into pieces of about `size` for streaming responses."""
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= size:
+            yield pending[0][:0].join(pending)
+            pending = []
+            pending_size = 0
+    if pending:
+        yield pending[0][:0].join(pending)
 
-    Args:
-        edits: List of Edit objects to export
-        formats: List of formats to include (jsonl, csv, json)
-        time_range: Optional time range for metadata
 
-    Returns:
-        Tuple of (zip_bytes, filename)
-    """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"watson_export_{timestamp}.zip"
+class _ChunkSink:
+    """Unseekable write target that collects ZIP output until drained."""
 
-    # Create in-memory ZIP file
-    zip_buffer = io.BytesIO()
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-        # Add metadata file
-        metadata = generate_export_metadata(
-            format_type="bundle",
-            time_range=time_range,
-            total_records=len(edits),
-        )
-        metadata["included_formats"] = formats
-        zf.writestr(
-            "metadata.json",
-            json.dumps(metadata, indent=2)
-        )
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
 
-        # Add exports in requested formats
-        if "jsonl" in formats:
-            jsonl_content = export_to_jsonl(edits)
-            zf.writestr("edits.jsonl", jsonl_content)
+    def flush(self) -> None:
+        pass
 
-        if "csv" in formats:
-            csv_content = export_to_csv(edits)
-            zf.writestr("edits.csv", csv_content)
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
 
-        if "json" in formats:
-            json_content = export_to_json(edits, time_range)
-            zf.writestr("edits.json", json_content)
 
-        # Add a README
-        readme = """# Watson Export Bundle
+README = """# Watson Export Bundle
 
 ## Contents
 
@@ -242,17 +475,139 @@ In JSON/JSONL formats, labels are stored as arrays with full metadata.
 ## Generated by Watson
 https://watson.oceanheart.ai
 """
-        zf.writestr("README.md", readme)
 
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue(), filename
+
+class _EditSnapshot:
+    """
+    The edits of a queryset, pinned by primary key when it's created.
+
+    Each pass re-reads the edits EXPORT_CHUNK_SIZE ids at a time, one short
+    query per batch, so the bundle's count and members cover the same edits
+    without a transaction (and its connection and snapshot) held open for
+    the whole download. An edit deleted mid-download is left out of the
+    members still to be written; one changed mid-download may differ
+    between members.
+    """
+
+    def __init__(self, edits: QuerySet):
+        self._edits = edits.order_by()
+        self._ids = list(edits.values_list('pk', flat=True))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[Edit]:
+        for start in range(0, len(self._ids), EXPORT_CHUNK_SIZE):
+            batch = self._ids[start:start + EXPORT_CHUNK_SIZE]
+            found = {edit.pk: edit for edit in self._edits.filter(pk__in=batch)}
+            for pk in batch:
+                if pk in found:
+                    yield found[pk]
+
+
+def export_bundle_filename() -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"watson_export_{timestamp}.zip"
+
+
+def iter_export_bundle(
+    edits: Iterable[Edit],
+    formats: List[str] = ["jsonl", "csv"],
+    time_range: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Yield a ZIP bundle containing exports in multiple formats.
+
+    Rows are compressed into their member as they are encoded, and the
+    compressed output is handed on in pieces of about STREAM_CHUNK_SIZE,
+    so memory stays flat whatever the export size, apart from the list of
+    edit ids. The ZIP is written
+    without seeking (data descriptors), so it can go straight to a
+    StreamingHttpResponse. A queryset's ids are read once up front and
+    each member re-reads the edits by id (see _EditSnapshot).
+
+    Args:
+        edits: Edits to export (a queryset is streamed in chunks)
+        formats: List of formats to include (jsonl, csv, json)
+        time_range: Optional time range for metadata
+    """
+    if isinstance(edits, QuerySet):
+        edits = _EditSnapshot(edits)
+    sink = _ChunkSink()
+
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, compresslevel=EXPORT_COMPRESSLEVEL) as zf:
+        # Add metadata file
+        metadata = generate_export_metadata(
+            format_type="bundle",
+            time_range=time_range,
+            total_records=_count_edits(edits),
+        )
+        metadata["included_formats"] = formats
+        zf.writestr(
+            "metadata.json",
+            _dumps(metadata, orjson.OPT_INDENT_2)
+        )
+
+        # Add exports in requested formats
+        members = []
+        if "jsonl" in formats:
+            members.append(("edits.jsonl", iter_jsonl(edits)))
+        if "csv" in formats:
+            members.append(("edits.csv", (row.encode('utf-8') for row in iter_csv(edits))))
+        if "json" in formats:
+            members.append(("edits.json", iter_json(edits, time_range)))
+
+        for name, chunks in members:
+            with zf.open(name, 'w', force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    if sink.size >= STREAM_CHUNK_SIZE:
+                        yield sink.drain()
+
+        # Add a README
+        zf.writestr("README.md", README)
+
+    yield sink.drain()
+
+
+def write_export_bundle(
+    edits: Iterable[Edit],
+    dest: BinaryIO,
+    formats: List[str] = ["jsonl", "csv"],
+    time_range: Optional[str] = None,
+) -> None:
+    """Write a ZIP bundle (see iter_export_bundle) to a binary stream."""
+    for chunk in iter_export_bundle(edits, formats, time_range):
+        dest.write(chunk)
+
+
+def create_export_bundle(
+    edits: Iterable[Edit],
+    formats: List[str] = ["jsonl", "csv"],
+    time_range: Optional[str] = None,
+) -> Tuple[bytes, str]:
+    """
+    Create a ZIP bundle containing exports in multiple formats in memory.
+
+    Prefer iter_export_bundle() for responses; this keeps the whole
+    archive in memory.
+
+    Args:
+        edits: Edits to export (a queryset is streamed in chunks)
+        formats: List of formats to include (jsonl, csv, json)
+        time_range: Optional time range for metadata
+
+    Returns:
+        Tuple of (zip_bytes, filename)
+    """
+    return b"".join(iter_export_bundle(edits, formats, time_range)), export_bundle_filename()
 
 
 def get_export_queryset(
     time_range: Optional[str] = None,
     status: Optional[str] = None,
     model_name: Optional[str] = None,
-) -> List[Edit]:
+) -> QuerySet:
     """
     Get edits for export based on filters.
 
@@ -262,16 +617,17 @@ def get_export_queryset(
         model_name: Filter by LLM model name
 
     Returns:
-        List of Edit objects
+        Unevaluated queryset of edits; exports stream it in chunks
     """
     from datetime import timedelta
 
-    queryset = Edit.objects.select_related(
-        'llm_output',
-        'llm_output__document'
-    ).prefetch_related(
-        'edit_labels__label'
-    )
+    # Labels are fetched per batch by the exporters (see labels_by_edit).
+    # Only the columns edit_to_dict/edit_to_flat_row read are loaded; the
+    # document itself is never needed, only llm_output.document_id. The
+    # diff columns come back as JSON text (see RAW_DIFF_FIELDS).
+    queryset = Edit.objects.select_related('llm_output').only(*EXPORT_FIELDS).annotate(**{
+        f"{name}_json": Cast(name, TextField()) for name in RAW_DIFF_FIELDS
+    })
 
     # Apply time range filter
     if time_range and time_range != 'all':
@@ -288,4 +644,4 @@ def get_export_queryset(
     if model_name:
         queryset = queryset.filter(llm_output__model_name=model_name)
 
-    return list(queryset.order_by('-created_at'))
+    return queryset.order_by('-created_at')
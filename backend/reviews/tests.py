@@ -1,21 +1,32 @@
-import uuid
+import difflib
+import functools
 import time
+import uuid
+from io import StringIO
+from unittest import skipUnless
 from unittest.mock import patch
 
-from django.test import TestCase
-from django.urls import reverse
-from rest_framework.test import APITestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.backends import default_backend
-from jose import jwt
-
 from core.models import Document
+from watson.testing import create_test_token, patch_jwt_auth
 from reviews.models import LLMOutput, Edit, Label, EditLabel
+from reviews.management.commands.seed_demo_data import (
+    Command,
+    LABEL_FIXTURES,
+    DOCUMENT_FIXTURES,
+    OUTPUT_FIXTURES,
+    EDIT_FIXTURES,
+)
 from reviews.services import (
     tokenize,
+    myers_diff,
     compute_token_diff,
     compute_structural_diff,
     compute_diff_stats,
@@ -32,45 +43,6 @@ from reviews.services import (
 # Test JWT Authentication Helpers
 # =============================================================================
 
-# Generate test RSA key pair for authentication
-_test_private_key = rsa.generate_private_key(
-    public_exponent=65537,
-    key_size=2048,
-    backend=default_backend()
-)
-
-TEST_PRIVATE_KEY = _test_private_key.private_bytes(
-    encoding=serialization.Encoding.PEM,
-    format=serialization.PrivateFormat.TraditionalOpenSSL,
-    encryption_algorithm=serialization.NoEncryption()
-).decode('utf-8')
-
-TEST_PUBLIC_KEY = _test_private_key.public_key().public_bytes(
-    encoding=serialization.Encoding.PEM,
-    format=serialization.PublicFormat.SubjectPublicKeyInfo
-).decode('utf-8')
-
-
-def create_test_token(
-    sub='test-user-123',
-    email='test@example.com',
-    role='clinician',
-    exp_offset=3600,
-):
-    """Create a test JWT token for API authentication."""
-    now = int(time.time())
-    payload = {
-        'sub': sub,
-        'email': email,
-        'role': role,
-        'iat': now,
-        'exp': now + exp_offset,
-        'iss': 'https://passport.oceanheart.ai',
-        'aud': 'watson.oceanheart.ai',
-    }
-    return jwt.encode(payload, TEST_PRIVATE_KEY, algorithm='RS256')
-
-
 class AuthenticatedAPITestCase(APITestCase):
     """
     Base test case class that provides JWT authentication for API tests.
@@ -82,37 +54,22 @@ class AuthenticatedAPITestCase(APITestCase):
     def setUpClass(cls):
         super().setUpClass()
         # Start patches for JWT authentication
-        cls.jwt_public_key_patcher = patch(
-            'watson.middleware.jwt_auth.JWT_PUBLIC_KEY',
-            TEST_PUBLIC_KEY
-        )
-        cls.passport_issuer_patcher = patch(
-            'watson.middleware.jwt_auth.PASSPORT_ISSUER',
-            'https://passport.oceanheart.ai'
-        )
-        cls.passport_audience_patcher = patch(
-            'watson.middleware.jwt_auth.PASSPORT_AUDIENCE',
-            'watson.oceanheart.ai'
+        cls.jwt_patcher = patch_jwt_auth()
+        cls.jwt_patcher.start()
+        # Sign once per class; every test's client sends the same
+        # long-lived token as a default header
+        cls._shared_token = create_test_token(exp_offset=86400)
+        cls.client_class = functools.partial(
+            APIClient, HTTP_AUTHORIZATION=f'Bearer {cls._shared_token}'
         )
-        cls.jwt_public_key_patcher.start()
-        cls.passport_issuer_patcher.start()
-        cls.passport_audience_patcher.start()
 
     @classmethod
     def tearDownClass(cls):
-        cls.jwt_public_key_patcher.stop()
-        cls.passport_issuer_patcher.stop()
-        cls.passport_audience_patcher.stop()
+        cls.jwt_patcher.stop()
         super().tearDownClass()
 
-    def setUp(self):
-        super().setUp()
-        # Create and set authentication token
-        self.token = create_test_token()
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
-
 
-class TokenizeTestCase(TestCase):
+class TokenizeTestCase(SimpleTestCase):
     """Tests for the tokenize function."""
 
     def test_tokenize_simple_text(self):
@@ -136,8 +93,18 @@ class TokenizeTestCase(TestCase):
         expected = ["Patient", "reports", "anxiety", "(", "moderate", ")", ".", "Recommend", "CBT", "."]
         self.assertEqual(result, expected)
 
+    def test_tokenize_non_ascii_text(self):
+        """Test tokenizing text with non-ASCII words."""
+        result = tokenize("Zoë feels calmer—mostly.")
+        self.assertEqual(result, ["Zoë", "feels", "calmer", "—", "mostly", "."])
+
+    def test_tokenize_ascii_separators_are_whitespace(self):
+        """Test ASCII text splits on the same whitespace as Unicode text."""
+        self.assertEqual(tokenize("a\x1cb\x1fc"), ["a", "b", "c"])
+        self.assertEqual(tokenize("a\x1cé"), ["a", "é"])
 
-class ComputeTokenDiffTestCase(TestCase):
+
+class ComputeTokenDiffTestCase(SimpleTestCase):
     """Tests for the compute_token_diff function."""
 
     def test_identical_text(self):
@@ -146,6 +113,25 @@ class ComputeTokenDiffTestCase(TestCase):
         self.assertEqual(len(result['operations']), 1)
         self.assertEqual(result['operations'][0]['operation'], 'equal')
 
+    def test_identical_text_spans_all_tokens(self):
+        """Test identical text short-circuits to one equal run."""
+        result = compute_token_diff("one, two", "one, two")
+        self.assertEqual(result['operations'], [{
+            'operation': 'equal',
+            'original_start': 0,
+            'original_end': 3,
+            'edited_start': 0,
+            'edited_end': 3,
+            'tokens': ["one", ",", "two"],
+        }])
+        self.assertEqual(result['edited_tokens'], ["one", ",", "two"])
+
+    def test_identical_empty_text(self):
+        """Test identical empty text has no operations."""
+        result = compute_token_diff("", "")
+        self.assertEqual(result['operations'], [])
+        self.assertEqual(result['original_token_count'], 0)
+
     def test_insertion(self):
         """Test text with insertion."""
         result = compute_token_diff("Hello world", "Hello beautiful world")
@@ -171,7 +157,80 @@ class ComputeTokenDiffTestCase(TestCase):
         self.assertEqual(result['edited_token_count'], 4)
 
 
-class ComputeStructuralDiffTestCase(TestCase):
+class MyersDiffTestCase(SimpleTestCase):
+    """Tests for the myers_diff function."""
+
+    def _apply(self, a, b, opcodes):
+        """Rebuild b from a and the opcodes, checking they are contiguous."""
+        result = []
+        i = j = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            self.assertEqual((i1, j1), (i, j))
+            if tag == 'equal':
+                self.assertEqual(a[i1:i2], b[j1:j2])
+            result.extend(b[j1:j2])
+            i, j = i2, j2
+        self.assertEqual((i, j), (len(a), len(b)))
+        return result
+
+    def test_identical(self):
+        """Test identical lists give a single equal opcode."""
+        tokens = ["a", "b", "c"]
+        self.assertEqual(myers_diff(tokens, tokens), [('equal', 0, 3, 0, 3)])
+
+    def test_empty_sides(self):
+        """Test diffs against an empty list."""
+        self.assertEqual(myers_diff([], ["a"]), [('insert', 0, 0, 0, 1)])
+        self.assertEqual(myers_diff(["a"], []), [('delete', 0, 1, 0, 0)])
+        self.assertEqual(myers_diff([], []), [])
+
+    def test_replace_collapses_delete_insert(self):
+        """Test adjacent delete and insert are reported as replace."""
+        opcodes = myers_diff(["Hello", "world"], ["Hello", "universe"])
+        self.assertEqual(opcodes, [('equal', 0, 1, 0, 1), ('replace', 1, 2, 1, 2)])
+
+    def test_shortest_edit(self):
+        """Test the edit script is minimal and reproduces the edited list."""
+        a = list("ABCABBA")
+        b = list("CBABAC")
+        opcodes = myers_diff(a, b)
+        self.assertEqual(self._apply(a, b, opcodes), b)
+        # LCS of the classic Myers example has length 4
+        self.assertEqual(sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == 'equal'), 4)
+
+    def test_frequent_tokens_align(self):
+        """Test repeated punctuation is matched rather than junked."""
+        a = tokenize(", ".join(f'"item{i}"' for i in range(150)))
+        b = list(a)
+        b[10] = "changed"
+        opcodes = myers_diff(a, b)
+        self.assertEqual(self._apply(a, b, opcodes), b)
+        self.assertEqual([op[0] for op in opcodes], ['equal', 'replace', 'equal'])
+
+    def test_rewrite_falls_back_to_difflib(self):
+        """Test a full rewrite stops the Myers search at the edit distance cap."""
+        a = [f"old{i}" for i in range(5000)]
+        b = [f"new{i}" for i in range(5000)]
+        start = time.perf_counter()
+        with patch('reviews.services.diff_engine.difflib.SequenceMatcher',
+                   wraps=difflib.SequenceMatcher) as matcher:
+            opcodes = myers_diff(a, b)
+        # An uncapped search is D^2 = 10^8 steps, minutes in Python
+        self.assertLess(time.perf_counter() - start, 2)
+        matcher.assert_called_once()
+        self.assertEqual(self._apply(a, b, opcodes), b)
+
+    def test_compute_token_diff_long_input(self):
+        """Test compute_token_diff on input long enough to use Myers."""
+        original = " ".join(f"word{i}" for i in range(100))
+        edited = original.replace("word50", "word50 inserted")
+        result = compute_token_diff(original, edited)
+        inserts = [op for op in result['operations'] if op['operation'] == 'insert']
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(inserts[0]['inserted_tokens'], ["inserted"])
+
+
+class ComputeStructuralDiffTestCase(SimpleTestCase):
     """Tests for the compute_structural_diff function."""
 
     def test_identical_objects(self):
@@ -180,6 +239,13 @@ class ComputeStructuralDiffTestCase(TestCase):
         result = compute_structural_diff(obj, obj)
         self.assertEqual(result, [])
 
+    def test_equal_values_of_different_types(self):
+        """Test values that compare equal in Python are still reported by type."""
+        self.assertEqual(compute_structural_diff({"a": [1, {"b": None}]}, {"a": [1, {"b": None}]}), [])
+        result = compute_structural_diff({"a": 1, "b": True}, {"a": 1.0, "b": 1})
+        self.assertEqual([change['operation'] for change in result], ['replace', 'replace'])
+        self.assertEqual(sorted(change['path'] for change in result), ['a', 'b'])
+
     def test_added_key(self):
         """Test detecting added key."""
         original = {"a": 1}
@@ -224,8 +290,61 @@ class ComputeStructuralDiffTestCase(TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]['operation'], 'add')
 
+    def test_shared_subtree_is_skipped(self):
+        """Test a subtree shared by both sides is not walked."""
+        class Unwalkable(dict):
+            def keys(self):
+                raise AssertionError("shared subtree was walked")
+
+        shared = {"boilerplate": [Unwalkable(a=1)]}
+        result = compute_structural_diff({"a": 1, "s": shared}, {"a": 2, "s": shared})
+        self.assertEqual([change['path'] for change in result], ['a'])
+
+    def test_missing_key_with_none_value(self):
+        """Test a key added with a null value is still reported."""
+        result = compute_structural_diff({"a": 1}, {"a": 1, "b": None})
+        self.assertEqual(result, [{'path': 'b', 'operation': 'add', 'value': None}])
+
+    def test_list_changes_in_order(self):
+        """Test list item changes are reported in index order."""
+        result = compute_structural_diff({"items": [1, 2]}, {"items": [3, 4, 5]})
+        self.assertEqual(
+            [change['path'] for change in result],
+            ['items[0]', 'items[1]', 'items[2]'],
+        )
+
+    def test_paths_for_mixed_nesting(self):
+        """Test paths render keys with dots and list items with brackets."""
+        original = {"plan": [{"steps": ["a"]}], "risk": None}
+        edited = {"plan": [{"steps": ["b"]}], "risk": "low"}
+        result = compute_structural_diff(original, edited)
+        self.assertEqual(
+            sorted(change['path'] for change in result),
+            ['plan[0].steps[0]', 'risk'],
+        )
+        self.assertEqual(compute_structural_diff([1], [2])[0]['path'], '[0]')
+        self.assertEqual(compute_structural_diff(1, 2)[0]['path'], '/')
+        self.assertEqual(compute_structural_diff({"a": 1}, {"a": 2}, path='root')[0]['path'], 'root.a')
+
+    def test_deep_nesting(self):
+        """Test nesting deeper than the recursion limit."""
+        import sys
+
+        def nested(value):
+            root = node = {}
+            for _ in range(sys.getrecursionlimit() + 100):
+                node['child'] = {}
+                node = node['child']
+            node['value'] = value
+            return root
+
+        result = compute_structural_diff(nested(1), nested(2))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]['operation'], 'modify')
+        self.assertTrue(result[0]['path'].endswith('.child.value'))
+
 
-class ComputeDiffStatsTestCase(TestCase):
+class ComputeDiffStatsTestCase(SimpleTestCase):
     """Tests for the compute_diff_stats function."""
 
     def test_stats_no_changes(self):
@@ -245,6 +364,25 @@ class ComputeDiffStatsTestCase(TestCase):
         self.assertGreater(result['token_additions'], 0)
         self.assertEqual(result['structural_additions'], 1)
 
+    def test_stats_from_counts_match_operations(self):
+        """Test recorded counts give the same stats as walking operations."""
+        token_diff = compute_token_diff("one two three four five", "one six three four five seven")
+        legacy = {k: v for k, v in token_diff.items() if k != 'unchanged_token_count'}
+        self.assertEqual(compute_diff_stats(token_diff, []), compute_diff_stats(legacy, []))
+        self.assertEqual(compute_diff_stats(token_diff, [])['token_additions'], 2)
+
+    def test_structural_counts(self):
+        """Test structural changes are counted by operation."""
+        structural_diff = [
+            {'operation': 'add'}, {'operation': 'add'}, {'operation': 'delete'},
+            {'operation': 'modify'}, {'operation': 'replace'},
+        ]
+        result = compute_diff_stats(compute_token_diff("a", "a"), structural_diff)
+        self.assertEqual(result['structural_additions'], 2)
+        self.assertEqual(result['structural_deletions'], 1)
+        self.assertEqual(result['structural_modifications'], 2)
+        self.assertEqual(result['total_structural_changes'], 5)
+
     def test_change_rate_calculation(self):
         """Test change rate calculation."""
         token_diff = compute_token_diff("one two three four", "one five three four")
@@ -254,7 +392,7 @@ class ComputeDiffStatsTestCase(TestCase):
         self.assertLessEqual(result['change_rate'], 100)
 
 
-class ComputeAllDiffsTestCase(TestCase):
+class ComputeAllDiffsTestCase(SimpleTestCase):
     """Tests for the compute_all_diffs function."""
 
     def test_dict_content(self):
@@ -267,6 +405,57 @@ class ComputeAllDiffsTestCase(TestCase):
         self.assertIsInstance(structural_diff, list)
         self.assertIn('change_rate', diff_stats)
 
+    def test_unchanged_content(self):
+        """Test unchanged content reports no changes."""
+        content = {"summary": "Patient is anxious", "items": [1, 2]}
+        token_diff, structural_diff, diff_stats = compute_all_diffs(content, dict(content))
+
+        self.assertEqual(structural_diff, [])
+        self.assertEqual(token_diff['operations'], [])
+        self.assertEqual(diff_stats['change_rate'], 0)
+        # "Patient is anxious", 1 and 2
+        self.assertEqual(diff_stats['original_token_count'], 5)
+        self.assertEqual(diff_stats['token_unchanged'], 5)
+
+    def test_int_to_float_is_a_change(self):
+        """Test an int rewritten as a float isn't treated as unchanged."""
+        _, structural_diff, _ = compute_all_diffs({"score": 1}, {"score": 1.0})
+        self.assertEqual(structural_diff[0]['operation'], 'replace')
+        token_diff, _, _ = compute_all_diffs([1], [1.0])
+        self.assertNotEqual(token_diff['operations'], [])
+
+    def test_large_integer_leaf(self):
+        """Test integers past 64 bits are diffed as their JSON literal."""
+        token_diff, structural_diff, _ = compute_all_diffs({"n": 10**20}, {"n": 10**20 + 1})
+        self.assertEqual(structural_diff[0]['operation'], 'modify')
+        self.assertEqual(token_diff['operations'][0]['inserted_tokens'], ['100000000000000000001'])
+
+    def test_unchanged_text_content(self):
+        """Test unchanged non-dict content is a single equal run."""
+        token_diff, structural_diff, diff_stats = compute_all_diffs("Same text", "Same text")
+
+        self.assertEqual(structural_diff, [])
+        self.assertEqual([op['operation'] for op in token_diff['operations']], ['equal'])
+        self.assertEqual(diff_stats['token_unchanged'], 2)
+
+    def test_dict_content_diffs_changed_leaves_only(self):
+        """Test dict content is token-diffed per changed leaf."""
+        original = {"summary": "Patient is anxious", "plan": "CBT", "risk": "low"}
+        edited = {"summary": "Patient is moderately anxious", "plan": "CBT", "notes": "Follow up"}
+        token_diff, structural_diff, diff_stats = compute_all_diffs(original, edited)
+
+        changed_paths = {op['path'] for op in token_diff['operations'] if op['operation'] != 'equal'}
+        self.assertEqual(changed_paths, {'summary', 'risk', 'notes'})
+        self.assertNotIn('original_tokens', token_diff)
+
+        # Leaf tokens only: no braces, quotes or keys
+        self.assertEqual(diff_stats['original_token_count'], 5)
+        self.assertEqual(diff_stats['edited_token_count'], 7)
+        self.assertEqual(diff_stats['token_additions'], 3)
+        self.assertEqual(diff_stats['token_deletions'], 1)
+        self.assertEqual(diff_stats['token_unchanged'], 4)
+        self.assertEqual(diff_stats['change_rate'], 20.0)
+
     def test_complex_json(self):
         """Test computing diffs for complex JSON."""
         original = {
@@ -293,15 +482,16 @@ class ComputeAllDiffsTestCase(TestCase):
 class EditSubmitTestCase(TestCase):
     """Tests for the Edit.submit() method with diff computation."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Create test data."""
-        self.document = Document.objects.create(
+        cls.document = Document.objects.create(
             title="Test Session Note",
             document_type="session_note",
             raw_content={"text": "Patient session notes here"}
         )
-        self.llm_output = LLMOutput.objects.create(
-            document=self.document,
+        cls.llm_output = LLMOutput.objects.create(
+            document=cls.document,
             model_name="gpt-4-turbo",
             output_content={
                 "summary": "Patient reports feeling anxious.",
@@ -339,6 +529,11 @@ class EditSubmitTestCase(TestCase):
         self.assertIsInstance(edit.structural_diff, list)
         self.assertIn('change_rate', edit.diff_stats)
 
+        # Verify scalar stats mirror diff_stats
+        self.assertEqual(edit.additions, edit.diff_stats['token_additions'])
+        self.assertEqual(edit.deletions, edit.diff_stats['token_deletions'])
+        self.assertEqual(edit.change_rate, edit.diff_stats['change_rate'])
+
     def test_submit_with_no_changes(self):
         """Test submit with identical content."""
         edit = Edit.objects.create(
@@ -374,6 +569,27 @@ class EditSubmitTestCase(TestCase):
 
         self.assertGreater(edit.diff_stats['structural_additions'], 0)
 
+    def test_failed_diffs_leave_edit_draft(self):
+        """Test that an edit whose diffs fail stays a draft and can be resubmitted."""
+        edit = Edit.objects.create(
+            llm_output=self.llm_output,
+            editor_name="Dr. Smith",
+            edited_content={"summary": "Changed."}
+        )
+
+        with patch('reviews.services.compute_all_diffs', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                edit.submit()
+
+        edit.refresh_from_db()
+        self.assertEqual(edit.status, Edit.Status.DRAFT)
+        self.assertIsNone(edit.submitted_at)
+
+        edit.submit()
+        edit.refresh_from_db()
+        self.assertEqual(edit.status, Edit.Status.SUBMITTED)
+        self.assertIn('change_rate', edit.diff_stats)
+
 
 # =============================================================================
 # Model Tests
@@ -382,8 +598,9 @@ class EditSubmitTestCase(TestCase):
 class LLMOutputModelTestCase(TestCase):
     """Tests for the LLMOutput model."""
 
-    def setUp(self):
-        self.document = Document.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.document = Document.objects.create(
             title="Test Document",
             raw_content={"text": "Test content"}
         )
@@ -431,6 +648,21 @@ class LLMOutputModelTestCase(TestCase):
         self.assertFalse(LLMOutput.objects.filter(id=output_id).exists())
 
 
+class UUIDStorageTestCase(TestCase):
+    """Tests that UUID keys use compact column types."""
+
+    def test_uuid_keys_are_not_varchar(self):
+        """Test UUID primary and foreign keys map to uuid (PostgreSQL) or char(32) (SQLite)."""
+        expected = {'postgresql': 'uuid', 'sqlite': 'char(32)'}.get(connection.vendor)
+        if expected is None:
+            self.skipTest(f'No expectation for {connection.vendor}')
+        for model in (Document, LLMOutput, Label, Edit, EditLabel):
+            for field in model._meta.concrete_fields:
+                if field.primary_key or field.is_relation:
+                    with self.subTest(field=f'{model.__name__}.{field.name}'):
+                        self.assertEqual(field.db_type(connection), expected)
+
+
 class LabelModelTestCase(TestCase):
     """Tests for the Label model."""
 
@@ -480,13 +712,14 @@ class LabelModelTestCase(TestCase):
 class EditModelTestCase(TestCase):
     """Tests for the Edit model."""
 
-    def setUp(self):
-        self.document = Document.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.document = Document.objects.create(
             title="Test Document",
             raw_content={"text": "Test content"}
         )
-        self.llm_output = LLMOutput.objects.create(
-            document=self.document,
+        cls.llm_output = LLMOutput.objects.create(
+            document=cls.document,
             model_name="gpt-4",
             output_content={"summary": "Test"}
         )
@@ -533,21 +766,22 @@ class EditModelTestCase(TestCase):
 class EditLabelModelTestCase(TestCase):
     """Tests for the EditLabel model."""
 
-    def setUp(self):
-        self.document = Document.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.document = Document.objects.create(
             title="Test Document",
             raw_content={}
         )
-        self.llm_output = LLMOutput.objects.create(
-            document=self.document,
+        cls.llm_output = LLMOutput.objects.create(
+            document=cls.document,
             model_name="gpt-4",
             output_content={}
         )
-        self.edit = Edit.objects.create(
-            llm_output=self.llm_output,
+        cls.edit = Edit.objects.create(
+            llm_output=cls.llm_output,
             edited_content={}
         )
-        self.label = Label.objects.create(
+        cls.label = Label.objects.create(
             name="test_label",
             display_name="Test Label"
         )
@@ -594,35 +828,43 @@ class EditLabelModelTestCase(TestCase):
 class LLMOutputAPITestCase(AuthenticatedAPITestCase):
     """Tests for LLMOutput API endpoints."""
 
-    def setUp(self):
-        super().setUp()  # Sets up JWT authentication
-        self.document = Document.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.document = Document.objects.create(
             title="Test Document",
             raw_content={"text": "Content"}
         )
-        self.output = LLMOutput.objects.create(
-            document=self.document,
+        cls.output = LLMOutput.objects.create(
+            document=cls.document,
             model_name="gpt-4-turbo",
             output_content={"summary": "Test summary"}
         )
 
     def test_list_outputs(self):
         """Test listing LLM outputs."""
-        url = reverse('output-list')
+        url = '/api/outputs/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
 
+    def test_list_outputs_skips_content(self):
+        """Test that listing outputs loads only the rendered columns."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/outputs/')
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertNotIn('output_content', queries.captured_queries[0]['sql'])
+        self.assertEqual(response.data[0]['document_title'], 'Test Document')
+
     def test_retrieve_output(self):
         """Test retrieving a single LLM output."""
-        url = reverse('output-detail', kwargs={'pk': self.output.pk})
+        url = f'/api/outputs/{self.output.pk}/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['model_name'], 'gpt-4-turbo')
 
     def test_create_output(self):
         """Test creating an LLM output."""
-        url = reverse('output-list')
+        url = '/api/outputs/'
         data = {
             'document_id': str(self.document.id),
             'model_name': 'claude-3-opus',
@@ -631,14 +873,15 @@ class LLMOutputAPITestCase(AuthenticatedAPITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(LLMOutput.objects.count(), 2)
+        self.assertEqual(response.data['document']['title'], 'Test Document')
 
 
 class LabelAPITestCase(AuthenticatedAPITestCase):
     """Tests for Label API endpoints."""
 
-    def setUp(self):
-        super().setUp()  # Sets up JWT authentication
-        self.label = Label.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.label = Label.objects.create(
             name="hallucination",
             display_name="Hallucination",
             category="accuracy",
@@ -647,21 +890,21 @@ class LabelAPITestCase(AuthenticatedAPITestCase):
 
     def test_list_labels(self):
         """Test listing labels."""
-        url = reverse('label-list')
+        url = '/api/labels/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
 
     def test_retrieve_label(self):
         """Test retrieving a single label."""
-        url = reverse('label-detail', kwargs={'pk': self.label.pk})
+        url = f'/api/labels/{self.label.pk}/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], 'hallucination')
 
     def test_create_label(self):
         """Test creating a label."""
-        url = reverse('label-list')
+        url = '/api/labels/'
         data = {
             'name': 'missing_risk',
             'display_name': 'Missing Risk Assessment',
@@ -676,40 +919,52 @@ class LabelAPITestCase(AuthenticatedAPITestCase):
 class EditAPITestCase(AuthenticatedAPITestCase):
     """Tests for Edit API endpoints."""
 
-    def setUp(self):
-        super().setUp()  # Sets up JWT authentication
-        self.document = Document.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.document = Document.objects.create(
             title="Test Document",
             raw_content={"text": "Content"}
         )
-        self.llm_output = LLMOutput.objects.create(
-            document=self.document,
+        cls.llm_output = LLMOutput.objects.create(
+            document=cls.document,
             model_name="gpt-4",
             output_content={"summary": "Original summary"}
         )
-        self.edit = Edit.objects.create(
-            llm_output=self.llm_output,
+        cls.edit = Edit.objects.create(
+            llm_output=cls.llm_output,
             editor_name="Dr. Smith",
             edited_content={"summary": "Edited summary"}
         )
 
     def test_list_edits(self):
         """Test listing edits."""
-        url = reverse('edit-list')
+        url = '/api/edits/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
 
+    def test_list_edits_query_count(self):
+        """Test that listing edits doesn't query per edit."""
+        label = Label.objects.create(name="test", display_name="Test")
+        for _ in range(3):
+            edit = Edit.objects.create(llm_output=self.llm_output, edited_content={})
+            EditLabel.objects.create(edit=edit, label=label)
+        url = '/api/edits/'
+        # Edits joined to output and document, then prefetched labels
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 4)
+
     def test_retrieve_edit(self):
         """Test retrieving a single edit."""
-        url = reverse('edit-detail', kwargs={'pk': self.edit.pk})
+        url = f'/api/edits/{self.edit.pk}/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['editor_name'], 'Dr. Smith')
 
     def test_create_edit(self):
         """Test creating an edit."""
-        url = reverse('edit-list')
+        url = '/api/edits/'
         data = {
             'llm_output_id': str(self.llm_output.id),
             'editor_name': 'Dr. Jones',
@@ -718,19 +973,41 @@ class EditAPITestCase(AuthenticatedAPITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Edit.objects.count(), 2)
+        self.assertEqual(response.data['llm_output']['document_title'], 'Test Document')
+
+    def test_create_edit_query_count(self):
+        """Test that creating an edit loads its LLM output and document together."""
+        url = '/api/edits/'
+        data = {
+            'llm_output_id': str(self.llm_output.id),
+            'edited_content': {'summary': 'New edit'}
+        }
+        # SELECT llm_output + document, INSERT edit, SELECT edit_labels
+        with self.assertNumQueries(3):
+            self.client.post(url, data, format='json')
 
     def test_update_edit(self):
         """Test updating an edit."""
-        url = reverse('edit-detail', kwargs={'pk': self.edit.pk})
+        url = f'/api/edits/{self.edit.pk}/'
         data = {'editor_notes': 'Added clarification'}
         response = self.client.patch(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.edit.refresh_from_db()
         self.assertEqual(self.edit.editor_notes, 'Added clarification')
 
+    def test_update_edit_writes_only_changed_columns(self):
+        """Test that a partial update doesn't rewrite untouched columns."""
+        url = f'/api/edits/{self.edit.pk}/'
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(url, {'editor_notes': 'Note'}, format='json')
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('editor_notes', updates[0])
+        self.assertNotIn('edited_content', updates[0])
+
     def test_submit_edit_action(self):
         """Test the submit action on edit."""
-        url = reverse('edit-submit', kwargs={'pk': self.edit.pk})
+        url = f'/api/edits/{self.edit.pk}/submit/'
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.edit.refresh_from_db()
@@ -740,7 +1017,7 @@ class EditAPITestCase(AuthenticatedAPITestCase):
         """Test that submitting non-draft edit fails."""
         self.edit.status = Edit.Status.SUBMITTED
         self.edit.save()
-        url = reverse('edit-submit', kwargs={'pk': self.edit.pk})
+        url = f'/api/edits/{self.edit.pk}/submit/'
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
@@ -763,18 +1040,39 @@ class AnalyticsAPITestCase(AuthenticatedAPITestCase):
         super().tearDownClass()
 
     def setUp(self):
-        super().setUp()  # Sets up JWT authentication
+        # Responses are cached per range; each test computes its own
+        cache.clear()
+
+    @classmethod
+    def setUpTestData(cls):
         # Create test data
-        self.document = Document.objects.create(
+        cls.document = Document.objects.create(
             title="Test Document",
             raw_content={}
         )
-        self.llm_output = LLMOutput.objects.create(
-            document=self.document,
+        cls.llm_output = LLMOutput.objects.create(
+            document=cls.document,
             model_name="gpt-4",
             output_content={}
         )
 
+    @classmethod
+    def _seed_edits(cls, n):
+        """Insert n submitted edits with change rates 0..n-1 in one query."""
+        return Edit.objects.bulk_create(
+            [
+                Edit(
+                    llm_output=cls.llm_output,
+                    edited_content={"summary": f"s{i}"},
+                    status=Edit.Status.SUBMITTED,
+                    diff_stats={"change_rate": float(i)},
+                    change_rate=float(i),
+                )
+                for i in range(n)
+            ],
+            batch_size=500,
+        )
+
     def test_get_analytics_empty(self):
         """Test getting analytics with no edits."""
         response = self.client.get('/api/analytics/')
@@ -783,23 +1081,88 @@ class AnalyticsAPITestCase(AuthenticatedAPITestCase):
 
     def test_get_analytics_with_data(self):
         """Test getting analytics with edits."""
-        # Create some edits
-        edit = Edit.objects.create(
-            llm_output=self.llm_output,
-            edited_content={"summary": "Test"},
-            status=Edit.Status.SUBMITTED,
-            diff_stats={"change_rate": 25.5}
-        )
+        self._seed_edits(1)
         response = self.client.get('/api/analytics/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['total_edits'], 1)
 
+    def test_get_analytics_aggregates_many_edits(self):
+        """Test analytics totals and averages over a larger set of edits."""
+        self._seed_edits(100)
+        response = self.client.get('/api/analytics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_edits'], 100)
+        self.assertEqual(response.data['average_edit_rate'], 49.5)
+        self.assertEqual(response.data['edits_by_status'], {'submitted': 100})
+
+    def test_edits_by_model_averages_edits_with_stats(self):
+        """Test per-model averages skip edits without diff stats."""
+        self._seed_edits(4)
+        Edit.objects.create(llm_output=self.llm_output, edited_content={})
+        response = self.client.get('/api/analytics/')
+        self.assertEqual(response.data['edits_by_model'], [
+            {'model_name': 'gpt-4', 'count': 5, 'avg_change_rate': 1.5},
+        ])
+
+    def test_recent_activity_counts_per_day(self):
+        """Test daily counts are bucketed by day, oldest day first."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self._seed_edits(3)
+        old = Edit.objects.create(llm_output=self.llm_output, edited_content={})
+        Edit.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=2))
+        response = self.client.get('/api/analytics/?range=7d')
+        activity = response.data['recent_activity']
+        self.assertEqual(len(activity), 7)
+        self.assertEqual(activity[-1], {'date': timezone.now().date().isoformat(), 'count': 3})
+        self.assertEqual(activity[-3]['count'], 1)
+        self.assertEqual(sum(day['count'] for day in activity), 4)
+
+    def test_average_edit_rate_skips_edits_without_stats(self):
+        """Test the overall average only covers edits with diff stats."""
+        self._seed_edits(4)
+        Edit.objects.create(llm_output=self.llm_output, edited_content={})
+        response = self.client.get('/api/analytics/')
+        self.assertEqual(response.data['total_edits'], 5)
+        self.assertEqual(response.data['average_edit_rate'], 1.5)
+
+    def test_common_labels_within_range(self):
+        """Test label counts only include edits inside the time range."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        label = Label.objects.create(name="omission", display_name="Omission")
+        recent, old = self._seed_edits(2)
+        EditLabel.objects.bulk_create([
+            EditLabel(edit=recent, label=label),
+            EditLabel(edit=old, label=label),
+        ])
+        Edit.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=10))
+
+        response = self.client.get('/api/analytics/?range=7d')
+        self.assertEqual(response.data['common_labels'], [
+            {'label_name': 'omission', 'count': 1, 'percentage': 100.0},
+        ])
+
     def test_get_analytics_time_ranges(self):
         """Test analytics with different time ranges."""
         for time_range in ['7d', '30d', '90d']:
-            response = self.client.get(f'/api/analytics/?range={time_range}')
-            self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertIn('recent_activity', response.data)
+            with self.subTest(time_range=time_range):
+                response = self.client.get(f'/api/analytics/?range={time_range}')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIn('recent_activity', response.data)
+
+    def test_analytics_cached_per_range(self):
+        """Test repeated polls reuse the cached aggregates for their range."""
+        self.client.get('/api/analytics/?range=7d')
+        self._seed_edits(1)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/analytics/?range=7d')
+        self.assertEqual(response.data['total_edits'], 0)
+
+        response = self.client.get('/api/analytics/?range=90d')
+        self.assertEqual(response.data['total_edits'], 1)
 
     def test_analytics_response_structure(self):
         """Test analytics response has correct structure."""
@@ -820,28 +1183,29 @@ class AnalyticsAPITestCase(AuthenticatedAPITestCase):
 class ExportServiceTestCase(TestCase):
     """Tests for export service functions."""
 
-    def setUp(self):
-        self.document = Document.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.document = Document.objects.create(
             title="Test Document",
             raw_content={"text": "Content"}
         )
-        self.llm_output = LLMOutput.objects.create(
-            document=self.document,
+        cls.llm_output = LLMOutput.objects.create(
+            document=cls.document,
             model_name="gpt-4",
             output_content={"summary": "Test summary"}
         )
-        self.edit = Edit.objects.create(
-            llm_output=self.llm_output,
+        cls.edit = Edit.objects.create(
+            llm_output=cls.llm_output,
             editor_name="Dr. Smith",
             edited_content={"summary": "Edited summary"},
             status=Edit.Status.SUBMITTED,
             diff_stats={"change_rate": 25.5, "token_additions": 5}
         )
-        self.label = Label.objects.create(
+        cls.label = Label.objects.create(
             name="hallucination",
             display_name="Hallucination"
         )
-        EditLabel.objects.create(edit=self.edit, label=self.label)
+        EditLabel.objects.create(edit=cls.edit, label=cls.label)
 
     def test_export_to_jsonl(self):
         """Test JSONL export format."""
@@ -857,6 +1221,31 @@ class ExportServiceTestCase(TestCase):
         self.assertEqual(data['editor_name'], 'Dr. Smith')
         self.assertIn('labels', data)
 
+    def test_export_ids_and_timestamps_format(self):
+        """Test UUIDs and datetimes keep their str()/isoformat() text."""
+        import json
+
+        self.edit.refresh_from_db()
+        row = json.loads(export_to_jsonl([self.edit]))
+        self.assertEqual(row['id'], str(self.edit.id))
+        self.assertEqual(row['document_id'], str(self.document.id))
+        self.assertEqual(row['created_at'], self.edit.created_at.isoformat())
+        self.assertIsNone(row['submitted_at'])
+
+    def test_export_large_integer(self):
+        """Test integers past 64 bits are exported exactly."""
+        import json
+
+        edit = Edit.objects.create(
+            llm_output=self.llm_output,
+            edited_content={"summary": "Edited", "n": 10**20},
+        )
+        edit.submit()
+        row = json.loads(export_to_jsonl(get_export_queryset().filter(pk=edit.pk)))
+        self.assertEqual(row['edited_content']['n'], 10**20)
+        added = [c for c in row['structural_diff'] if c['path'] == 'n']
+        self.assertEqual(added[0]['value'], 10**20)
+
     def test_export_to_csv(self):
         """Test CSV export format."""
         edits = [self.edit]
@@ -872,6 +1261,20 @@ class ExportServiceTestCase(TestCase):
         self.assertIn('editor_name', header)
         self.assertIn('change_rate', header)
 
+    def test_export_to_csv_columns(self):
+        """Test CSV rows line up with the header columns."""
+        import csv
+        import io
+        from reviews.services.export import CSV_FIELDS
+
+        rows = list(csv.DictReader(io.StringIO(export_to_csv([self.edit]))))
+        self.assertEqual(tuple(rows[0].keys()), CSV_FIELDS)
+        self.assertEqual(rows[0]['id'], str(self.edit.id))
+        self.assertEqual(rows[0]['change_rate'], '25.5')
+        self.assertEqual(rows[0]['labels'], 'hallucination')
+        self.assertEqual(rows[0]['label_count'], '1')
+        self.assertEqual(rows[0]['submitted_at'], '')
+
     def test_export_to_json(self):
         """Test JSON export format."""
         edits = [self.edit]
@@ -905,11 +1308,108 @@ class ExportServiceTestCase(TestCase):
         self.assertIn('metadata.json', names)
         self.assertIn('README.md', names)
 
+    def test_export_to_json_matches_full_dump(self):
+        """Test streamed JSON is identical to dumping the whole document."""
+        import json
+        import orjson
+        from reviews.services.export import edit_to_dict
+
+        Edit.objects.create(llm_output=self.llm_output, edited_content={"summary": "Zoë"})
+        for edits in (get_export_queryset(), []):
+            with self.subTest(count=len(edits)):
+                content = export_to_json(edits, '30d')
+                data = json.loads(content)
+                expected = orjson.dumps({
+                    'metadata': data['metadata'],
+                    'edits': [edit_to_dict(edit) for edit in edits],
+                }, option=orjson.OPT_INDENT_2).decode('utf-8')
+                self.assertEqual(content, expected)
+
+    def test_create_export_bundle_from_queryset(self):
+        """Test bundle members stream from a queryset and parse back."""
+        import csv
+        import io
+        import json
+        import zipfile
+
+        zip_bytes, _ = create_export_bundle(get_export_queryset(), formats=['jsonl', 'csv', 'json'])
+        zf = zipfile.ZipFile(io.BytesIO(zip_bytes), 'r')
+
+        rows = [json.loads(line) for line in zf.read('edits.jsonl').decode('utf-8').split('\n')]
+        self.assertEqual([row['id'] for row in rows], [str(self.edit.id)])
+        csv_rows = list(csv.DictReader(io.StringIO(zf.read('edits.csv').decode('utf-8'))))
+        self.assertEqual(csv_rows[0]['labels'], 'hallucination')
+        self.assertEqual(json.loads(zf.read('edits.json'))['metadata']['total_records'], 1)
+        self.assertEqual(json.loads(zf.read('metadata.json'))['total_records'], 1)
+
+    def test_iter_export_bundle_streams_chunks(self):
+        """Test a streamed bundle arrives in pieces and matches the in-memory one."""
+        import io
+        import zipfile
+        from reviews.services import iter_export_bundle
+
+        for i in range(20):
+            Edit.objects.create(llm_output=self.llm_output, edited_content={"summary": f"Edit {i}"})
+        formats = ['jsonl', 'csv', 'json']
+        with patch('reviews.services.export.STREAM_CHUNK_SIZE', 256):
+            chunks = list(iter_export_bundle(get_export_queryset(), formats=formats))
+        self.assertGreater(len(chunks), 2)
+
+        streamed = zipfile.ZipFile(io.BytesIO(b''.join(chunks)), 'r')
+        self.assertIsNone(streamed.testzip())
+        in_memory = zipfile.ZipFile(io.BytesIO(create_export_bundle(get_export_queryset(), formats=formats)[0]), 'r')
+        for name in ('edits.jsonl', 'edits.csv'):
+            self.assertEqual(streamed.read(name), in_memory.read(name))
+
+    def test_export_fetches_labels_per_batch(self):
+        """Test exports fetch labels in one query, not one per edit."""
+        for _ in range(3):
+            edit = Edit.objects.create(llm_output=self.llm_output, edited_content={})
+            EditLabel.objects.create(edit=edit, label=self.label, notes="Check")
+        Edit.objects.create(llm_output=self.llm_output, edited_content={})
+
+        # One query for the edits, one for all of their labels
+        with self.assertNumQueries(2):
+            content = export_to_jsonl(get_export_queryset())
+        with self.assertNumQueries(2):
+            export_to_csv(get_export_queryset())
+
+        import json
+        rows = [json.loads(line) for line in content.split('\n')]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(sum(1 for row in rows if row['labels']), 4)
+        labelled = next(row for row in rows if row['labels'])
+        self.assertEqual(labelled['labels'][0]['name'], 'hallucination')
+        self.assertEqual(labelled['labels'][0]['display_name'], 'Hallucination')
+
     def test_get_export_queryset_no_filter(self):
         """Test getting all edits for export."""
         edits = get_export_queryset()
         self.assertEqual(len(edits), 1)
 
+    def test_export_jsonl_embeds_stored_diffs(self):
+        """Test JSONL rows carry the stored diffs from the export queryset."""
+        import json
+
+        token_diff = {'operations': [{'operation': 'equal', 'tokens': ['Zoë']}]}
+        structural_diff = [{'path': 'summary', 'operation': 'modify'}]
+        Edit.objects.filter(pk=self.edit.pk).update(token_diff=token_diff, structural_diff=structural_diff)
+
+        for edits in (get_export_queryset(), [Edit.objects.get(pk=self.edit.pk)]):
+            row = json.loads(export_to_jsonl(edits))
+            self.assertEqual(row['token_diff'], token_diff)
+            self.assertEqual(row['structural_diff'], structural_diff)
+            self.assertEqual(row['diff_stats'], self.edit.diff_stats)
+
+    def test_get_export_queryset_skips_unused_columns(self):
+        """Test the export query doesn't load documents or raw LLM responses."""
+        with CaptureQueriesContext(connection) as ctx:
+            list(get_export_queryset())
+        sql = ctx.captured_queries[0]['sql']
+        self.assertNotIn('core_document', sql)
+        self.assertNotIn('raw_response', sql)
+        self.assertIn('output_content', sql)
+
     def test_get_export_queryset_with_status(self):
         """Test filtering by status."""
         edits = get_export_queryset(status='submitted')
@@ -928,6 +1428,45 @@ class ExportServiceTestCase(TestCase):
         self.assertEqual(content, '')
 
 
+class ExportSnapshotTestCase(TransactionTestCase):
+    """Tests that an export bundle's members cover the same edits."""
+
+    def test_bundle_members_pinned_to_initial_edits(self):
+        """Test edits written mid-download don't reach later members, and no transaction is held open."""
+        import csv
+        import io
+        import json
+        import zipfile
+        from reviews.services import iter_export_bundle
+
+        document = Document.objects.create(raw_content={})
+        llm_output = LLMOutput.objects.create(
+            document=document, model_name="gpt-4", output_content={"summary": "s"}
+        )
+        edits = [
+            Edit.objects.create(llm_output=llm_output, edited_content={"summary": f"e{i}"})
+            for i in range(3)
+        ]
+
+        # A one-byte chunk size hands back output after every row
+        with patch('reviews.services.export.STREAM_CHUNK_SIZE', 1):
+            chunks = iter_export_bundle(Edit.objects.all(), formats=["jsonl", "csv", "json"])
+            body = [next(chunks)]
+            self.assertFalse(connection.in_atomic_block)
+            Edit.objects.create(llm_output=llm_output, edited_content={"summary": "late"})
+            edits[2].delete()
+            body.extend(chunks)
+
+        zf = zipfile.ZipFile(io.BytesIO(b"".join(body)))
+        metadata = json.loads(zf.read("metadata.json"))
+        self.assertEqual(metadata["total_records"], 3)
+        expected = {str(edit.id) for edit in edits[:2]}
+        csv_ids = {row["id"] for row in csv.DictReader(io.StringIO(zf.read("edits.csv").decode("utf-8")))}
+        json_ids = {row["id"] for row in json.loads(zf.read("edits.json"))["edits"]}
+        self.assertEqual(csv_ids, expected)
+        self.assertEqual(json_ids, expected)
+
+
 class ExportAPITestCase(AuthenticatedAPITestCase):
     """Tests for Export API endpoints."""
 
@@ -945,19 +1484,19 @@ class ExportAPITestCase(AuthenticatedAPITestCase):
         ExportView.throttle_classes = cls._original_throttle_classes
         super().tearDownClass()
 
-    def setUp(self):
-        super().setUp()  # Sets up JWT authentication
-        self.document = Document.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.document = Document.objects.create(
             title="Test Document",
             raw_content={"text": "Content"}
         )
-        self.llm_output = LLMOutput.objects.create(
-            document=self.document,
+        cls.llm_output = LLMOutput.objects.create(
+            document=cls.document,
             model_name="gpt-4",
             output_content={"summary": "Test"}
         )
-        self.edit = Edit.objects.create(
-            llm_output=self.llm_output,
+        cls.edit = Edit.objects.create(
+            llm_output=cls.llm_output,
             editor_name="Dr. Smith",
             edited_content={"summary": "Edited"},
             status=Edit.Status.SUBMITTED
@@ -991,6 +1530,17 @@ class ExportAPITestCase(AuthenticatedAPITestCase):
         self.assertEqual(response['Content-Type'], 'application/zip')
         self.assertIn('watson_export_', response['Content-Disposition'])
 
+    def test_export_zip_streams_valid_bundle(self):
+        """Test the ZIP response is streamed and opens as an archive."""
+        import io
+        import zipfile
+
+        response = self.client.get('/api/exports/?export_format=zip')
+        self.assertTrue(response.streaming)
+        zf = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)), 'r')
+        self.assertIsNone(zf.testzip())
+        self.assertIn('edits.jsonl', zf.namelist())
+
     def test_export_default_format(self):
         """Test default format is ZIP."""
         response = self.client.get('/api/exports/')
@@ -1021,3 +1571,67 @@ class ExportAPITestCase(AuthenticatedAPITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response['Content-Type'], 'application/zip')
+
+
+class SeedDemoDataTestCase(TestCase):
+    """Tests for the seed_demo_data management command."""
+
+    def test_seed_demo_data(self):
+        """Test seeding creates the demo dataset."""
+        call_command('seed_demo_data', stdout=StringIO())
+        self.assertEqual(Label.objects.count(), len(LABEL_FIXTURES))
+        self.assertEqual(Document.objects.count(), len(DOCUMENT_FIXTURES))
+        self.assertEqual(LLMOutput.objects.count(), len(OUTPUT_FIXTURES))
+        self.assertEqual(Edit.objects.count(), len(EDIT_FIXTURES))
+        self.assertEqual(EditLabel.objects.count(), len(EDIT_FIXTURES))
+        self.assertEqual(
+            set(EditLabel.objects.values_list('label__name', flat=True)),
+            {data['label'] for data in EDIT_FIXTURES},
+        )
+
+    def test_seed_clear(self):
+        """Test that --clear removes existing data before seeding."""
+        Document.objects.create(title="Old Document", raw_content={})
+        Label.objects.create(name="old_label", display_name="Old")
+        call_command('seed_demo_data', clear=True, stdout=StringIO())
+        self.assertFalse(Document.objects.filter(title="Old Document").exists())
+        self.assertFalse(Label.objects.filter(name="old_label").exists())
+        self.assertEqual(Document.objects.count(), len(DOCUMENT_FIXTURES))
+
+    def test_seed_does_not_mutate_fixtures(self):
+        """Test that seeding leaves the module-level fixtures intact."""
+        call_command('seed_demo_data', stdout=StringIO())
+        self.assertIn('document_index', OUTPUT_FIXTURES[0])
+        self.assertIn('output_index', EDIT_FIXTURES[0])
+        self.assertIn('label', EDIT_FIXTURES[0])
+
+    def test_seed_updates_existing_labels(self):
+        """Test that seeding upserts labels and keeps existing rows."""
+        existing = Label.objects.create(
+            name='hallucination',
+            display_name='Old Name',
+            severity='minor'
+        )
+        call_command('seed_demo_data', stdout=StringIO())
+
+        label = Label.objects.get(name='hallucination')
+        self.assertEqual(label.id, existing.id)
+        self.assertEqual(label.display_name, 'Hallucination')
+        self.assertEqual(label.severity, 'critical')
+        self.assertEqual(Label.objects.count(), len(LABEL_FIXTURES))
+
+    @skipUnless(connection.vendor == 'sqlite', 'parallel seeding commits from worker threads')
+    def test_seed_parallel_falls_back_on_sqlite(self):
+        """Test that --parallel seeds serially on SQLite."""
+        out = StringIO()
+        call_command('seed_demo_data', parallel=True, stdout=out)
+        self.assertIn('seeding serially', out.getvalue())
+        self.assertEqual(Edit.objects.count(), len(EDIT_FIXTURES))
+
+    def test_seed_labels_single_upsert(self):
+        """Test that labels are upserted in one statement, not saved per row."""
+        Label.objects.create(name='hallucination', display_name='Old Name')
+        # INSERT ... ON CONFLICT DO UPDATE, then SELECT for the stored rows
+        with self.assertNumQueries(2):
+            labels = Command()._create_labels()
+        self.assertEqual(len(labels), len(LABEL_FIXTURES))
@@ -1,9 +1,12 @@
+import functools
 import os
 from datetime import timedelta
 
+from django.core.cache import cache
 from django.shortcuts import render
-from django.db.models import Avg, Count
-from django.http import HttpResponse
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import TruncDate
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
@@ -18,6 +21,10 @@ from .models import LLMOutput, Label, Edit, EditLabel
 # Check if we're in test mode
 JWT_TEST_MODE = os.environ.get('JWT_TEST_MODE', 'false').lower() == 'true'
 
+# Dashboards poll analytics every few seconds; the aggregates are shared
+# per time range for this long instead of being recomputed on every poll.
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', 30))
+
 
 # Custom throttle classes for sensitive endpoints
 class ExportRateThrottle(UserRateThrottle):
@@ -48,10 +55,12 @@ from .serializers import (
     EditLabelSerializer,
 )
 from .services import (
-    export_to_jsonl,
-    export_to_csv,
-    export_to_json,
-    create_export_bundle,
+    iter_chunked,
+    iter_jsonl,
+    iter_csv,
+    iter_json,
+    iter_export_bundle,
+    export_bundle_filename,
     get_export_queryset,
 )
 
@@ -63,7 +72,7 @@ class LLMOutputViewSet(viewsets.ModelViewSet):
     Provides CRUD operations for LLM-generated outputs.
     Requires JWT authentication.
     """
-    queryset = LLMOutput.objects.select_related('document').all()
+    queryset = LLMOutput.objects.all()
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -71,6 +80,15 @@ class LLMOutputViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'model_name']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        queryset = self.get_serializer_class().setup_eager_loading(super().get_queryset())
+        if self.action == 'list':
+            # List rows render only these columns; skip the JSON payloads
+            return queryset.only(
+                'id', 'document_id', 'model_name', 'model_version', 'created_at', 'document__title',
+            )
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'list':
             return LLMOutputListSerializer
@@ -101,7 +119,7 @@ class EditViewSet(viewsets.ModelViewSet):
     Provides CRUD operations for clinician edits/revisions.
     Requires JWT authentication.
     """
-    queryset = Edit.objects.select_related('llm_output', 'llm_output__document').prefetch_related('edit_labels__label').all()
+    queryset = Edit.objects.all()
     serializer_class = EditSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -110,6 +128,23 @@ class EditViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'updated_at', 'status']
     ordering = ['-updated_at']
 
+    # Columns of the joined output and document that EditSerializer never
+    # renders (it nests LLMOutputListSerializer)
+    unrendered_related_fields = (
+        'llm_output__output_content',
+        'llm_output__raw_response',
+        'llm_output__prompt_template',
+        'llm_output__generation_params',
+        'llm_output__document__raw_content',
+        'llm_output__document__metadata',
+    )
+
+    def get_queryset(self):
+        queryset = self.get_serializer_class().setup_eager_loading(super().get_queryset())
+        if self.action == 'list':
+            return queryset.defer(*self.unrendered_related_fields)
+        return queryset
+
     @action(detail=True, methods=['post'])
     def submit(self, request, pk=None):
         """Submit an edit for review."""
@@ -131,12 +166,15 @@ class EditLabelViewSet(viewsets.ModelViewSet):
     Provides CRUD operations for labels applied to edits.
     Requires JWT authentication.
     """
-    queryset = EditLabel.objects.select_related('edit', 'label').all()
+    queryset = EditLabel.objects.all()
     serializer_class = EditLabelSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
+
 
 class AnalyticsView(APIView):
     """
@@ -152,60 +190,63 @@ class AnalyticsView(APIView):
     def get(self, request):
         # Get time range from query params
         time_range = request.query_params.get('range', '30d')
-
-        # Calculate date threshold
         days_map = {'7d': 7, '30d': 30, '90d': 90}
         days = days_map.get(time_range, 30)
+
+        # The numbers cover all edits, not the requesting user's, so every
+        # user shares the cached payload for a range
+        data = cache.get_or_set(
+            f'analytics:{days}d',
+            functools.partial(self.compute_analytics, days),
+            ANALYTICS_CACHE_TIMEOUT,
+        )
+        return Response(data)
+
+    @staticmethod
+    def compute_analytics(days):
+        """Aggregate dashboard statistics over edits from the last `days` days."""
         date_threshold = timezone.now() - timedelta(days=days)
 
         # Filter edits by time range
         edits = Edit.objects.filter(created_at__gte=date_threshold)
 
-        # Total edits count
-        total_edits = edits.count()
-
-        # Average edit rate (change_rate from diff_stats)
-        avg_edit_rate = 0
-        edits_with_stats = edits.exclude(diff_stats={})
-        if edits_with_stats.exists():
-            rates = [
-                e.diff_stats.get('change_rate', 0)
-                for e in edits_with_stats
-                if e.diff_stats
-            ]
-            if rates:
-                avg_edit_rate = sum(rates) / len(rates)
+        # Total edits count and average edit rate (change_rate over edits
+        # that have diff stats) in a single aggregate
+        totals = edits.aggregate(
+            total_edits=Count('id'),
+            avg_edit_rate=Avg('change_rate', filter=~Q(diff_stats={})),
+        )
+        total_edits = totals['total_edits']
+        avg_edit_rate = totals['avg_edit_rate'] or 0
 
         # Edits by status
         edits_by_status = dict(
             edits.values('status').annotate(count=Count('id')).values_list('status', 'count')
         )
 
-        # Edits by model
-        edits_by_model = list(
+        # Edits by model, with each model's average over edits that have
+        # stats, in one GROUP BY on the change_rate column
+        edits_by_model = (
             edits.values('llm_output__model_name')
-            .annotate(count=Count('id'))
+            .annotate(
+                count=Count('id'),
+                avg_change_rate=Avg('change_rate', filter=~Q(diff_stats={})),
+            )
             .order_by('-count')[:10]
         )
-        edits_by_model_formatted = []
-        for item in edits_by_model:
-            model_name = item['llm_output__model_name'] or 'Unknown'
-            model_edits = edits.filter(llm_output__model_name=model_name).exclude(diff_stats={})
-            model_rates = [
-                e.diff_stats.get('change_rate', 0)
-                for e in model_edits
-                if e.diff_stats
-            ]
-            avg_change_rate = sum(model_rates) / len(model_rates) if model_rates else 0
-            edits_by_model_formatted.append({
-                'model_name': model_name,
+        edits_by_model_formatted = [
+            {
+                'model_name': item['llm_output__model_name'] or 'Unknown',
                 'count': item['count'],
-                'avg_change_rate': round(avg_change_rate, 2),
-            })
+                'avg_change_rate': round(item['avg_change_rate'] or 0, 2),
+            }
+            for item in edits_by_model
+        ]
 
-        # Common labels
+        # Common labels; filtering through the join on edit keeps this a
+        # plain JOIN instead of an IN (SELECT ...) over the edits queryset
         common_labels = list(
-            EditLabel.objects.filter(edit__in=edits)
+            EditLabel.objects.filter(edit__created_at__gte=date_threshold)
             .values('label__name')
             .annotate(count=Count('id'))
             .order_by('-count')[:10]
@@ -220,27 +261,32 @@ class AnalyticsView(APIView):
             for l in common_labels
         ]
 
-        # Recent activity (edits per day for the time range)
+        # Recent activity (edits per day for the time range); one GROUP BY
+        # over the window, with days that have no edits filled in as 0
+        daily_counts = dict(
+            edits.annotate(day=TruncDate('created_at'))
+            .values('day')
+            .annotate(count=Count('id'))
+            .values_list('day', 'count')
+        )
+        today = timezone.now().date()
         recent_activity = []
         for i in range(min(days, 30)):  # Limit to 30 days of daily data
-            day = timezone.now().date() - timedelta(days=i)
-            count = edits.filter(
-                created_at__date=day
-            ).count()
+            day = today - timedelta(days=i)
             recent_activity.append({
                 'date': day.isoformat(),
-                'count': count,
+                'count': daily_counts.get(day, 0),
             })
         recent_activity.reverse()  # Chronological order
 
-        return Response({
+        return {
             'total_edits': total_edits,
             'average_edit_rate': round(avg_edit_rate, 2),
             'edits_by_status': edits_by_status,
             'edits_by_model': edits_by_model_formatted,
             'common_labels': common_labels_formatted,
             'recent_activity': recent_activity,
-        })
+        }
 
 
 class ExportView(APIView):
@@ -276,7 +322,7 @@ class ExportView(APIView):
             model_name=model_filter,
         )
 
-        if not edits:
+        if not edits.exists():
             return Response(
                 {'error': 'No edits found matching the specified criteria'},
                 status=status.HTTP_404_NOT_FOUND
@@ -284,31 +330,36 @@ class ExportView(APIView):
 
         # Generate export based on format
         if export_format == 'jsonl':
-            content = export_to_jsonl(edits)
-            response = HttpResponse(content, content_type='application/x-ndjson')
+            response = StreamingHttpResponse(
+                iter_chunked(iter_jsonl(edits)), content_type='application/x-ndjson'
+            )
             response['Content-Disposition'] = 'attachment; filename="edits.jsonl"'
             return response
 
         elif export_format == 'csv':
-            content = export_to_csv(edits)
-            response = HttpResponse(content, content_type='text/csv')
+            response = StreamingHttpResponse(
+                iter_chunked(iter_csv(edits)), content_type='text/csv'
+            )
             response['Content-Disposition'] = 'attachment; filename="edits.csv"'
             return response
 
         elif export_format == 'json':
-            content = export_to_json(edits, time_range)
-            response = HttpResponse(content, content_type='application/json')
+            response = StreamingHttpResponse(
+                iter_chunked(iter_json(edits, time_range)), content_type='application/json'
+            )
             response['Content-Disposition'] = 'attachment; filename="edits.json"'
             return response
 
         elif export_format == 'zip':
-            zip_bytes, filename = create_export_bundle(
-                edits,
-                formats=['jsonl', 'csv', 'json'],
-                time_range=time_range,
+            response = StreamingHttpResponse(
+                iter_export_bundle(
+                    edits,
+                    formats=['jsonl', 'csv', 'json'],
+                    time_range=time_range,
+                ),
+                content_type='application/zip',
             )
-            response = HttpResponse(zip_bytes, content_type='application/zip')
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            response['Content-Disposition'] = f'attachment; filename="{export_bundle_filename()}"'
             return response
 
         else:
@@ -335,19 +386,20 @@ class ExportView(APIView):
             model_name=filters.get('model'),
         )
 
-        if not edits:
+        if not edits.exists():
             return Response(
                 {'error': 'No edits found matching the specified criteria'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Create bundle
-        zip_bytes, filename = create_export_bundle(
-            edits,
-            formats=formats,
-            time_range=filters.get('range'),
+        # Stream the bundle as it is compressed
+        response = StreamingHttpResponse(
+            iter_export_bundle(
+                edits,
+                formats=formats,
+                time_range=filters.get('range'),
+            ),
+            content_type='application/zip',
         )
-
-        response = HttpResponse(zip_bytes, content_type='application/zip')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Content-Disposition'] = f'attachment; filename="{export_bundle_filename()}"'
         return response
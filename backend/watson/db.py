@@ -0,0 +1,27 @@
+"""
+Database helpers shared across Watson apps.
+
+Development and tests run on SQLite while production runs on PostgreSQL,
+so PostgreSQL-only schema features are applied through these helpers.
+"""
+from django.db import migrations
+
+
+class PostgresRunSQL(migrations.RunSQL):
+    """
+    RunSQL operation that only executes on PostgreSQL.
+
+    Used for indexes and other schema objects that SQLite cannot express
+    (GIN, expression indexes on JSONB). Other backends skip the SQL.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return "Raw SQL operation (PostgreSQL only)"
@@ -0,0 +1,56 @@
+"""
+orjson-backed encoder/decoder classes for Django JSONFields.
+
+JSONField calls json.dumps(value, cls=encoder) and json.loads(value,
+cls=decoder); these subclasses route both calls through orjson.
+
+orjson only handles integers in the 64-bit range: it refuses to encode
+larger ones and parses them as floats. Values with integers outside that
+range go through the stdlib json module instead.
+"""
+import json
+import re
+
+import orjson
+from django.core.serializers.json import DjangoJSONEncoder
+
+# orjson parses integers in [-2**63, 2**64) exactly; any integer outside
+# that range has at least 19 digits. Matching digit runs inside strings or
+# float literals only costs a stdlib parse.
+_LONG_DIGITS = re.compile(r'\d{19}')
+
+
+class OrjsonEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder that serializes with orjson.
+
+    Non-ASCII text is written as UTF-8 rather than \\u escapes, matching the
+    ensure_ascii=False output the admin uses to display JSON fields.
+    Types orjson doesn't handle fall back to DjangoJSONEncoder.default;
+    values it can't encode at all (integers past 64 bits) fall back to the
+    stdlib encoder.
+    """
+
+    def encode(self, o):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.indent is not None:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(o, default=self.default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().encode(o)
+
+
+class OrjsonDecoder(json.JSONDecoder):
+    """
+    JSON decoder that parses with orjson.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    catching the stdlib error keep working. Input that may hold integers
+    past 64 bits is parsed by the stdlib decoder so they stay exact.
+    """
+
+    def decode(self, s, _w=None):
+        if _LONG_DIGITS.search(s):
+            return super().decode(s)
+        return orjson.loads(s)
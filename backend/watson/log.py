@@ -0,0 +1,49 @@
+"""
+Logging handlers for Watson.
+"""
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedFileHandler(QueueHandler):
+    """
+    File handler that writes from a background thread.
+
+    Logging threads only format the record and put it on an in-memory
+    queue; a QueueListener thread does the file IO. The listener is started
+    on first use in each process, so gunicorn workers forked from a
+    preloaded master each run their own instead of queueing to a thread
+    that only exists in the master.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False):
+        # Open the file first: if that fails, this handler is never
+        # registered for logging.shutdown() to close half-initialised
+        self.file_handler = logging.FileHandler(filename, mode, encoding, delay)
+        super().__init__(queue.SimpleQueue())
+        self._listener = None
+        self._pid = None
+
+    def _start_listener(self):
+        # A queue inherited across fork() is only drained in the parent
+        self.queue = queue.SimpleQueue()
+        self._listener = QueueListener(self.queue, self.file_handler)
+        self._listener.start()
+        self._pid = os.getpid()
+
+    def emit(self, record):
+        # Handler.handle() holds self.lock around emit(), so only one
+        # thread starts the listener
+        if self._pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
+
+    def close(self):
+        # logging.shutdown() closes handlers at exit: flush what's queued
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+        self._listener = None
+        self.file_handler.close()
+        super().close()
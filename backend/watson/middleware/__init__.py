@@ -5,6 +5,7 @@ from .jwt_auth import (
     verify_jwt_token,
     get_jwks_keys,
     clear_jwks_cache,
+    clear_verified_token_cache,
     require_jwt_auth,
 )
 
@@ -15,5 +16,6 @@ __all__ = [
     'verify_jwt_token',
     'get_jwks_keys',
     'clear_jwks_cache',
+    'clear_verified_token_cache',
     'require_jwt_auth',
 ]
@@ -1,19 +1,25 @@
 """
 JWT Authentication for Watson API.
 
-Implements RS256 JWT verification for passport.oceanheart.ai tokens.
+Implements RS256/ES256 JWT verification for passport.oceanheart.ai tokens.
 Provides both Django middleware and DRF authentication class.
 """
 import os
+import base64
+import hashlib
 import json
 import logging
 import threading
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
 from typing import Optional, Tuple, Any
-from functools import wraps
+from functools import lru_cache, wraps
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
+from django.core.cache import cache
 from django.http import JsonResponse
 from rest_framework import authentication, exceptions
 from jose import jwt, JWTError, jwk
@@ -34,46 +40,168 @@ JWT_PUBLIC_KEY = os.environ.get('JWT_PUBLIC_KEY', None)
 JWT_TEST_MODE = os.environ.get('JWT_TEST_MODE', 'false').lower() == 'true'
 JWT_TEST_SECRET = os.environ.get('JWT_TEST_SECRET', 'watson-e2e-test-secret')
 
+# Signature algorithms accepted for passport's JWKS keys. An ECDSA (ES256)
+# verify is several times cheaper than an RSA one, so passport can move to
+# EC keys without a change here. Each key only verifies tokens signed
+# with its own algorithm.
+JWT_ALGORITHMS = ('ES256', 'RS256')
+_JWK_DEFAULT_ALGORITHMS = {'RSA': 'RS256', 'EC': 'ES256'}
+
 # JWKS cache configuration
 JWKS_CACHE_TTL_SECONDS = int(os.environ.get('JWKS_CACHE_TTL_SECONDS', 3600))  # 1 hour default
 
+# Fetched keys are also shared through Django's cache, so with a shared
+# backend (e.g. Redis) one worker's fetch serves every worker. The shared
+# entry outlives its TTL so stale keys can be served while one worker,
+# holding the refresh lock, fetches new ones.
+JWKS_SHARED_CACHE_KEY = 'jwt_auth:jwks'
+JWKS_REFRESH_LOCK_KEY = 'jwt_auth:jwks:refresh'
+JWKS_REFRESH_LOCK_SECONDS = 10
+
+# Keys are refreshed in the background once they reach this age, so no
+# request waits on the fetch; rotation is still picked up within the TTL.
+JWKS_REFRESH_AFTER_SECONDS = int(JWKS_CACHE_TTL_SECONDS * 0.8)
+
+# Verified token cache configuration. Clients resend the same bearer token
+# on every request; its claims are reused for a few seconds (never past
+# the token's exp) instead of re-verifying the signature each time.
+VERIFIED_TOKEN_CACHE_SIZE = int(os.environ.get('VERIFIED_TOKEN_CACHE_SIZE', 10000))
+VERIFIED_TOKEN_CACHE_TTL_SECONDS = int(os.environ.get('VERIFIED_TOKEN_CACHE_TTL_SECONDS', 5))
+
 
 # Thread-safe JWKS cache with time-based expiration
 class JWKSCache:
-    """Thread-safe cache for JWKS keys with time-based expiration."""
+    """
+    Thread-safe cache for JWKS keys with time-based expiration.
+
+    Keys and their expiry are swapped in as one (keys, expires_at) tuple,
+    so get() reads without taking a lock; expiry uses the monotonic clock.
+    """
 
     def __init__(self, ttl_seconds: int = 3600):
-        self._keys: Optional[dict] = None
-        self._expires_at: Optional[datetime] = None
-        self._ttl = timedelta(seconds=ttl_seconds)
-        self._lock = threading.Lock()
+        self._entry: Optional[Tuple[dict, float]] = None
+        self._ttl = ttl_seconds
 
     def get(self) -> Optional[dict]:
         """Get cached keys if not expired."""
+        entry = self._entry
+        if entry is None:
+            return None
+        keys, expires_at = entry
+        if time.monotonic() > expires_at:
+            logger.debug("JWKS cache expired")
+            return None
+        return keys
+
+    def get_stale(self) -> Optional[dict]:
+        """Get cached keys even if they have expired."""
+        entry = self._entry
+        return entry[0] if entry is not None else None
+
+    def set(self, keys: dict, ttl_seconds: Optional[float] = None) -> None:
+        """Set cached keys, expiring after ttl_seconds (default: the cache TTL)."""
+        ttl = self._ttl if ttl_seconds is None else ttl_seconds
+        self._entry = (keys, time.monotonic() + ttl)
+        logger.debug("JWKS cache set, expires in %.0fs", ttl)
+
+    def clear(self) -> None:
+        """Clear the cache."""
+        self._entry = None
+        logger.debug("JWKS cache cleared")
+
+
+_jwks_cache = JWKSCache(ttl_seconds=JWKS_CACHE_TTL_SECONDS)
+
+# One pooled session for JWKS fetches: refreshes reuse the connection to
+# passport instead of a new TCP+TLS handshake, and transient gateway
+# errors are retried with a short backoff. Connect errors and timeouts
+# are not retried, so an unreachable passport fails one fetch within the
+# (connect, read) timeout rather than several times over, well inside
+# gunicorn's worker timeout.
+JWKS_FETCH_TIMEOUT = (2, 3)
+_jwks_session = requests.Session()
+_jwks_session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=2,
+    max_retries=Retry(
+        total=2,
+        connect=0,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+    ),
+))
+
+# Held around cold-cache fetches so concurrent requests in one process
+# wait for a single fetch instead of each making their own
+_jwks_fetch_lock = threading.Lock()
+
+# After a failed cold fetch, requests skip fetching for this long and use
+# stale keys (or none), so threads queued on the lock during a passport
+# outage don't each wait out another fetch in turn
+JWKS_FETCH_FAILURE_BACKOFF_SECONDS = 5
+_jwks_fetch_failed_until = float('-inf')
+
+
+class VerifiedTokenCache:
+    """
+    Thread-safe LRU cache of verified token claims.
+
+    Entries are keyed by the token's SHA-256 digest, so raw tokens are
+    never held, and expire after the TTL or at the token's exp claim,
+    whichever comes first.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 5):
+        self._entries: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Get cached claims for a token if they haven't expired."""
+        key = self._key(token)
         with self._lock:
-            if self._keys is None:
+            entry = self._entries.get(key)
+            if entry is None:
                 return None
-            if self._expires_at and datetime.now() > self._expires_at:
-                logger.debug("JWKS cache expired")
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
                 return None
-            return self._keys
-
-    def set(self, keys: dict) -> None:
-        """Set cached keys with expiration."""
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, token: str, payload: dict) -> None:
+        """Cache the verified claims for a token."""
+        if self._max_entries <= 0 or self._ttl <= 0:
+            return
+        expires_at = time.time() + self._ttl
+        exp = payload.get('exp')
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+
+        key = self._key(token)
         with self._lock:
-            self._keys = keys
-            self._expires_at = datetime.now() + self._ttl
-            logger.debug(f"JWKS cache set, expires at {self._expires_at}")
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
 
     def clear(self) -> None:
         """Clear the cache."""
         with self._lock:
-            self._keys = None
-            self._expires_at = None
-            logger.debug("JWKS cache cleared")
+            self._entries.clear()
 
 
-_jwks_cache = JWKSCache(ttl_seconds=JWKS_CACHE_TTL_SECONDS)
+_verified_token_cache = VerifiedTokenCache(
+    max_entries=VERIFIED_TOKEN_CACHE_SIZE,
+    ttl_seconds=VERIFIED_TOKEN_CACHE_TTL_SECONDS,
+)
 
 
 class JWTUser:
@@ -101,93 +229,237 @@ class JWTUser:
         return self.email or self.id
 
 
+def _fetch_jwks() -> Optional[dict]:
+    """Fetch JWKS from passport and share it; None if the fetch fails."""
+    try:
+        logger.info("Fetching JWKS from %s", PASSPORT_JWKS_URL)
+        response = _jwks_session.get(PASSPORT_JWKS_URL, timeout=JWKS_FETCH_TIMEOUT)
+        response.raise_for_status()
+        jwks = response.json()
+        logger.info("Successfully fetched JWKS with %d keys", len(jwks.get('keys', [])))
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch JWKS: {e}")
+        return None
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JWKS JSON: {e}")
+        return None
+
+    fetched_at = time.time()
+    cache.set(
+        JWKS_SHARED_CACHE_KEY,
+        {'keys': jwks, 'fetched_at': fetched_at},
+        JWKS_CACHE_TTL_SECONDS * 2,
+    )
+    _jwks_cache.set(jwks, JWKS_REFRESH_AFTER_SECONDS)
+    return jwks
+
+
+def _refresh_jwks_in_background() -> None:
+    threading.Thread(target=_fetch_jwks, name='jwks-refresh', daemon=True).start()
+
+
 def get_jwks_keys() -> dict:
     """
     Fetch and cache JWKS from passport.oceanheart.ai.
 
     Uses time-based cache with configurable TTL (default: 1 hour).
     This ensures key rotation is picked up within the TTL period.
+
+    Keys are looked up in the process cache, then in Django's cache, and
+    only then fetched. Once the shared keys are JWKS_REFRESH_AFTER_SECONDS
+    old, one worker refreshes them in a background thread while every
+    request keeps using the current keys; only a cold cache blocks.
     """
     # If a static public key is configured, use it (for testing)
     if JWT_PUBLIC_KEY:
-        logger.debug("Using configured JWT_PUBLIC_KEY")
         return {'static_key': JWT_PUBLIC_KEY}
 
     # Check cache first
     cached = _jwks_cache.get()
     if cached is not None:
-        logger.debug("Using cached JWKS keys")
         return cached
 
-    # Fetch fresh keys
-    try:
-        logger.info(f"Fetching JWKS from {PASSPORT_JWKS_URL}")
-        response = requests.get(PASSPORT_JWKS_URL, timeout=10)
-        response.raise_for_status()
-        jwks = response.json()
-        logger.info(f"Successfully fetched JWKS with {len(jwks.get('keys', []))} keys")
+    shared = cache.get(JWKS_SHARED_CACHE_KEY)
+    if shared is not None:
+        refresh_at = shared['fetched_at'] + JWKS_REFRESH_AFTER_SECONDS
+        if time.time() < refresh_at:
+            logger.debug("Using shared JWKS keys")
+            _jwks_cache.set(shared['keys'], refresh_at - time.time())
+            return shared['keys']
+
+        # Serve these keys until the refresh lands (or the lock lapses)
+        _jwks_cache.set(shared['keys'], JWKS_REFRESH_LOCK_SECONDS)
+        if cache.add(JWKS_REFRESH_LOCK_KEY, True, JWKS_REFRESH_LOCK_SECONDS):
+            logger.debug("Refreshing JWKS in the background")
+            _refresh_jwks_in_background()
+        return shared['keys']
+
+    # Fetch fresh keys, unless another thread did (or failed to) while
+    # this one waited
+    global _jwks_fetch_failed_until
+    with _jwks_fetch_lock:
+        cached = _jwks_cache.get()
+        if cached is not None:
+            return cached
+        if time.monotonic() >= _jwks_fetch_failed_until:
+            jwks = _fetch_jwks()
+            if jwks is not None:
+                return jwks
+            _jwks_fetch_failed_until = time.monotonic() + JWKS_FETCH_FAILURE_BACKOFF_SECONDS
+
+    # Return cached keys if available (even if expired) as fallback
+    stale = _jwks_cache.get_stale()
+    if stale is not None:
+        logger.warning("Using expired JWKS cache as fallback")
+        return stale
+    return {}
+
+
+def warm_jwks_cache() -> None:
+    """
+    Fetch JWKS and construct its keys ahead of the first request.
 
-        # Cache the keys
-        _jwks_cache.set(jwks)
-        return jwks
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch JWKS: {e}")
-        # Return cached keys if available (even if expired) as fallback
-        if _jwks_cache._keys is not None:
-            logger.warning("Using expired JWKS cache as fallback")
-            return _jwks_cache._keys
-        return {}
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JWKS JSON: {e}")
-        return {}
+    Run in a preloading server's master process (gunicorn's when_ready
+    hook) so forked workers start with the keys already cached. Fetches
+    directly rather than through get_jwks_keys(), so the master never
+    starts a background refresh thread that forked workers would lose.
+    """
+    if JWT_PUBLIC_KEY:
+        return
+    for key in (_fetch_jwks() or {}).get('keys', []):
+        try:
+            _constructed_jwk(key)
+        except JWKError as e:
+            logger.error(f"Failed to construct key: {e}")
+    # A pooled connection opened here would be shared by every forked
+    # worker; each opens its own on its first fetch instead
+    _jwks_session.close()
 
 
 def clear_jwks_cache():
     """Clear the JWKS cache to force a refresh on next request."""
+    global _jwks_fetch_failed_until
+    _jwks_fetch_failed_until = float('-inf')
     _jwks_cache.clear()
+    _constructed_keys.clear()
+    cache.delete_many([JWKS_SHARED_CACHE_KEY, JWKS_REFRESH_LOCK_KEY])
+
+
+def clear_verified_token_cache():
+    """Forget verified tokens so the next request re-verifies them."""
+    _verified_token_cache.clear()
+
+
+# jose re-parses a PEM string or JWK dict on every decode; keys are
+# constructed once and reused. Rotated-out keys age out of the LRU.
+@lru_cache(maxsize=16)
+def _prepared_pem_key(pem: str) -> Any:
+    return jwk.construct(pem, 'RS256')
+
+
+# Constructed JWKS keys and their algorithm by kid, with the JWK each was
+# built from; a key republished under the same kid no longer matches and
+# is rebuilt
+_constructed_keys: dict = {}
+
 
+def _jwk_algorithm(key: dict) -> str:
+    # A JWK's 'alg' is optional; without one, infer it from the key type.
+    # Symmetric (oct) keys are never accepted from a JWKS.
+    algorithm = key.get('alg') or _JWK_DEFAULT_ALGORITHMS.get(key.get('kty'))
+    if algorithm not in JWT_ALGORITHMS:
+        raise JWKError(f"Unsupported key algorithm: {algorithm}")
+    return algorithm
 
-def get_public_key(token: str) -> Optional[Any]:
+
+def _constructed_jwk(key: dict) -> Tuple[Any, str]:
+    kid = key.get('kid')
+    entry = _constructed_keys.get(kid)
+    if entry is None or entry[0] != key:
+        algorithm = _jwk_algorithm(key)
+        entry = (key, jwk.construct(key, algorithm), algorithm)
+        _constructed_keys[kid] = entry
+    return entry[1], entry[2]
+
+
+# Tokens from one issuer share a handful of header segments, so the kid
+# is decoded once per distinct header rather than once per token
+@lru_cache(maxsize=64)
+def _header_kid(header_segment: str) -> Optional[str]:
+    try:
+        padded = header_segment + '=' * (-len(header_segment) % 4)
+        header = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError as e:
+        raise JWTError(f"Error decoding token headers: {e}")
+    if not isinstance(header, dict):
+        raise JWTError("Invalid header string: must be a json object")
+    return header.get('kid')
+
+
+def _find_jwk(jwks: dict, kid: str) -> Optional[dict]:
+    return next((key for key in jwks.get('keys', []) if key.get('kid') == kid), None)
+
+
+def get_public_key(token: str) -> Optional[Tuple[Any, str]]:
     """
-    Get the public key for verifying the JWT.
+    Get the public key for verifying the JWT, and its algorithm.
     Matches the key ID (kid) from the token header with JWKS.
     """
     # If static key is configured, return it
     if JWT_PUBLIC_KEY:
-        return JWT_PUBLIC_KEY
+        return _prepared_pem_key(JWT_PUBLIC_KEY), 'RS256'
 
     try:
         # Get the key ID from the token header
-        unverified_header = jwt.get_unverified_header(token)
-        kid = unverified_header.get('kid')
+        kid = _header_kid(token.split('.', 1)[0])
 
         if not kid:
             logger.warning("No 'kid' in token header")
             return None
 
         # Get JWKS and find matching key
-        jwks = get_jwks_keys()
-        keys = jwks.get('keys', [])
-
-        for key in keys:
-            if key.get('kid') == kid:
-                try:
-                    return jwk.construct(key)
-                except JWKError as e:
-                    logger.error(f"Failed to construct key: {e}")
-                    return None
-
-        logger.warning(f"No matching key found for kid: {kid}")
-        return None
+        key = _find_jwk(get_jwks_keys(), kid)
+        if key is None and cache.add(JWKS_REFRESH_LOCK_KEY, True, JWKS_REFRESH_LOCK_SECONDS):
+            # An unknown kid may be a newly rotated key. Refetch at most once
+            # per lock period, so bogus kids can't force a fetch per request
+            logger.info("Unknown kid %s, refreshing JWKS", kid)
+            key = _find_jwk(_fetch_jwks() or {}, kid)
+
+        if key is None:
+            logger.warning(f"No matching key found for kid: {kid}")
+            return None
+
+        try:
+            return _constructed_jwk(key)
+        except JWKError as e:
+            logger.error(f"Failed to construct key: {e}")
+            return None
 
     except JWTError as e:
         logger.error(f"Failed to get unverified header: {e}")
         return None
 
 
+@lru_cache(maxsize=8)
+def _decode_kwargs(algorithm: str, issuer: str, audience: str) -> dict:
+    # Built once per algorithm/issuer/audience and shared; jose copies the
+    # options it is given, so the dicts are never mutated. jose verifies
+    # with a prepared key's own algorithm whatever the header names, so
+    # only the key's algorithm is allowed in the header.
+    return {
+        'algorithms': [algorithm],
+        'audience': audience,
+        'issuer': issuer,
+        'options': {
+            'verify_aud': bool(audience),
+            'verify_iss': bool(issuer),
+        },
+    }
+
+
 def verify_jwt_token(token: str) -> Tuple[bool, Optional[dict], Optional[str]]:
     """
-    Verify a JWT token using RS256 (or HS256 in test mode).
+    Verify a JWT token using RS256 or ES256 (or HS256 in test mode).
 
     Returns:
         Tuple of (is_valid, payload, error_message)
@@ -195,6 +467,18 @@ def verify_jwt_token(token: str) -> Tuple[bool, Optional[dict], Optional[str]]:
     if not token:
         return False, None, "No token provided"
 
+    payload = _verified_token_cache.get(token)
+    if payload is not None:
+        return True, payload, None
+
+    is_valid, payload, error = _decode_jwt_token(token)
+    if is_valid:
+        # Failures are never cached
+        _verified_token_cache.set(token, payload)
+    return is_valid, payload, error
+
+
+def _decode_jwt_token(token: str) -> Tuple[bool, Optional[dict], Optional[str]]:
     try:
         # Test mode - accept HS256 tokens with shared secret
         if JWT_TEST_MODE:
@@ -211,40 +495,20 @@ def verify_jwt_token(token: str) -> Tuple[bool, Optional[dict], Optional[str]]:
                 logger.debug("Token verified in test mode (HS256)")
                 return True, payload, None
             except JWTError:
-                # Fall through to try RS256 if HS256 fails
+                # Fall through to the public key if HS256 fails
                 pass
 
-        # For development/testing with static key
-        if JWT_PUBLIC_KEY:
-            payload = jwt.decode(
-                token,
-                JWT_PUBLIC_KEY,
-                algorithms=['RS256'],
-                audience=PASSPORT_AUDIENCE,
-                issuer=PASSPORT_ISSUER,
-                options={
-                    'verify_aud': bool(PASSPORT_AUDIENCE),
-                    'verify_iss': bool(PASSPORT_ISSUER),
-                }
-            )
-            return True, payload, None
-
-        # Get the public key for this token
-        public_key = get_public_key(token)
-        if not public_key:
+        # Get the public key for this token (or the static key)
+        found = get_public_key(token)
+        if found is None:
             return False, None, "Could not find public key for token"
+        public_key, algorithm = found
 
         # Verify and decode the token
         payload = jwt.decode(
             token,
             public_key,
-            algorithms=['RS256'],
-            audience=PASSPORT_AUDIENCE,
-            issuer=PASSPORT_ISSUER,
-            options={
-                'verify_aud': bool(PASSPORT_AUDIENCE),
-                'verify_iss': bool(PASSPORT_ISSUER),
-            }
+            **_decode_kwargs(algorithm, PASSPORT_ISSUER, PASSPORT_AUDIENCE),
         )
 
         return True, payload, None
@@ -255,6 +519,8 @@ def verify_jwt_token(token: str) -> Tuple[bool, Optional[dict], Optional[str]]:
         return False, None, f"Invalid claims: {e}"
     except JWTError as e:
         return False, None, f"Invalid token: {e}"
+    except JWKError as e:
+        return False, None, f"Invalid public key: {e}"
 
 
 class JWTAuthentication(authentication.BaseAuthentication):
@@ -316,11 +582,13 @@ class JWTAuthenticationMiddleware:
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # str.startswith takes a tuple and checks every prefix in one call
+        self._public_prefixes = tuple(self.PUBLIC_PATHS)
 
     def __call__(self, request):
         # Skip public paths
         path = request.path
-        if any(path.startswith(p) for p in self.PUBLIC_PATHS):
+        if path.startswith(self._public_prefixes):
             return self.get_response(request)
 
         # Extract token from header
@@ -1,50 +1,46 @@
 """
 Tests for JWT authentication middleware.
 """
+import threading
 import time
 import json
 from unittest.mock import patch, MagicMock
 
-from django.test import TestCase, RequestFactory
+import requests
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase
 from rest_framework.test import APIRequestFactory
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from jose import jwt
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt
+
+from watson.testing import (
+    TEST_PUBLIC_KEY,
+    get_test_signing_key,
+)
 
 from .jwt_auth import (
+    JWKS_REFRESH_AFTER_SECONDS,
+    JWKS_REFRESH_LOCK_KEY,
+    JWKS_SHARED_CACHE_KEY,
     JWTAuthentication,
     JWTAuthenticationMiddleware,
     JWTUser,
+    _constructed_keys,
+    _jwks_cache,
+    _jwks_session,
+    get_jwks_keys,
+    VerifiedTokenCache,
     verify_jwt_token,
     clear_jwks_cache,
+    clear_verified_token_cache,
+    warm_jwks_cache,
 )
 
 
-# Generate test RSA key pair dynamically for testing
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.backends import default_backend
-
-_test_private_key = rsa.generate_private_key(
-    public_exponent=65537,
-    key_size=2048,
-    backend=default_backend()
-)
-
-TEST_PRIVATE_KEY = _test_private_key.private_bytes(
-    encoding=serialization.Encoding.PEM,
-    format=serialization.PrivateFormat.TraditionalOpenSSL,
-    encryption_algorithm=serialization.NoEncryption()
-).decode('utf-8')
-
-TEST_PUBLIC_KEY = _test_private_key.public_key().public_bytes(
-    encoding=serialization.Encoding.PEM,
-    format=serialization.PublicFormat.SubjectPublicKeyInfo
-).decode('utf-8')
-
-
 def create_test_token(
     sub='user-123',
     email='test@example.com',
@@ -64,10 +60,10 @@ def create_test_token(
         'iss': iss,
         'aud': aud,
     }
-    return jwt.encode(payload, TEST_PRIVATE_KEY, algorithm='RS256')
+    return jwt.encode(payload, get_test_signing_key(), algorithm='RS256')
 
 
-class JWTUserTestCase(TestCase):
+class JWTUserTestCase(SimpleTestCase):
     """Tests for JWTUser class."""
 
     def test_create_user_from_payload(self):
@@ -97,11 +93,12 @@ class JWTUserTestCase(TestCase):
         self.assertEqual(user.pk, 'user-123')
 
 
-class VerifyJWTTokenTestCase(TestCase):
+class VerifyJWTTokenTestCase(SimpleTestCase):
     """Tests for verify_jwt_token function."""
 
     def setUp(self):
         clear_jwks_cache()
+        clear_verified_token_cache()
 
     @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', TEST_PUBLIC_KEY)
     @patch('watson.middleware.jwt_auth.PASSPORT_ISSUER', 'https://passport.oceanheart.ai')
@@ -139,34 +136,25 @@ class VerifyJWTTokenTestCase(TestCase):
     @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', TEST_PUBLIC_KEY)
     def test_verify_invalid_signature(self):
         """Test verifying a token with invalid signature."""
-        # Create token with a different key (not the one we're verifying against)
-        other_private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
-        other_key_pem = other_private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.TraditionalOpenSSL,
-            encryption_algorithm=serialization.NoEncryption()
-        ).decode('utf-8')
-
-        bad_token = jwt.encode(
-            {'sub': 'hacker', 'exp': int(time.time()) + 3600},
-            other_key_pem,
-            algorithm='RS256'
-        )
+        # A genuine RS256 signature, but over different claims: the same
+        # mismatch a token signed with another key produces, without
+        # generating one
+        token = create_test_token()
+        other = create_test_token(sub='hacker')
+        bad_token = token.rsplit('.', 1)[0] + '.' + other.rsplit('.', 1)[1]
+
         is_valid, payload, error = verify_jwt_token(bad_token)
         self.assertFalse(is_valid)
 
 
-class JWTAuthenticationTestCase(TestCase):
+class JWTAuthenticationTestCase(SimpleTestCase):
     """Tests for JWTAuthentication DRF class."""
 
     def setUp(self):
         self.factory = APIRequestFactory()
         self.auth = JWTAuthentication()
         clear_jwks_cache()
+        clear_verified_token_cache()
 
     @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', TEST_PUBLIC_KEY)
     @patch('watson.middleware.jwt_auth.PASSPORT_ISSUER', 'https://passport.oceanheart.ai')
@@ -218,13 +206,14 @@ class JWTAuthenticationTestCase(TestCase):
         self.assertEqual(header, 'Bearer realm="watson-api"')
 
 
-class JWTAuthenticationMiddlewareTestCase(TestCase):
+class JWTAuthenticationMiddlewareTestCase(SimpleTestCase):
     """Tests for JWTAuthenticationMiddleware."""
 
     def setUp(self):
         self.factory = RequestFactory()
         self.middleware = JWTAuthenticationMiddleware(lambda r: r)
         clear_jwks_cache()
+        clear_verified_token_cache()
 
     def test_public_path_skipped(self):
         """Test that public paths are not authenticated."""
@@ -260,12 +249,287 @@ class JWTAuthenticationMiddlewareTestCase(TestCase):
         self.assertTrue(hasattr(request, 'jwt_error'))
 
 
-class IntegrationTestCase(TestCase):
+class JWKSCacheTestCase(SimpleTestCase):
+    """Tests for the process-local and shared JWKS caches."""
+
+    JWKS = {'keys': [{'kid': 'key-1'}]}
+
+    def setUp(self):
+        clear_jwks_cache()
+        clear_verified_token_cache()
+        patcher = patch('watson.middleware.jwt_auth._jwks_session.get')
+        self.mock_get = patcher.start()
+        self.mock_get.return_value = MagicMock(json=MagicMock(return_value=self.JWKS))
+        self.addCleanup(patcher.stop)
+        self.addCleanup(clear_jwks_cache)
+
+    def test_fetched_keys_are_shared(self):
+        """Test that a worker with an empty process cache reuses shared keys."""
+        self.assertEqual(get_jwks_keys(), self.JWKS)
+        _jwks_cache.clear()  # as seen by another worker
+
+        self.assertEqual(get_jwks_keys(), self.JWKS)
+        self.assertEqual(self.mock_get.call_count, 1)
+
+    def test_concurrent_cold_fetches_coalesce(self):
+        """Test that threads missing a cold cache together share one fetch."""
+        started, release = threading.Event(), threading.Event()
+        response = self.mock_get.return_value
+
+        def slow_get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return response
+
+        self.mock_get.side_effect = slow_get
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_jwks_keys())) for _ in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+            thread.join(0.05)  # let it block on the fetch lock
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.mock_get.call_count, 1)
+        self.assertEqual(results, [self.JWKS] * 3)
+
+    def test_failed_fetch_not_repeated_by_waiting_threads(self):
+        """Test that threads queued behind a failed fetch don't each refetch."""
+        started, release = threading.Event(), threading.Event()
+
+        def failing_get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            raise requests.ConnectionError('passport unreachable')
+
+        self.mock_get.side_effect = failing_get
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_jwks_keys())) for _ in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+            thread.join(0.05)  # let it block on the fetch lock
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.mock_get.call_count, 1)
+        self.assertEqual(results, [{}] * 3)
+
+    def test_only_gateway_errors_retried(self):
+        """Test that JWKS fetches retry 502/503/504 but not connect or read failures."""
+        retries = _jwks_session.get_adapter('https://passport.oceanheart.ai').max_retries
+        self.assertEqual(retries.connect, 0)
+        self.assertEqual(retries.read, 0)
+        self.assertEqual(set(retries.status_forcelist), {502, 503, 504})
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', None)
+    def test_malformed_header_has_no_key(self):
+        """Test that an undecodable token header fails without a JWKS fetch."""
+        is_valid, payload, error = verify_jwt_token('bad.token.here')
+        self.assertFalse(is_valid)
+        self.assertEqual(error, "Could not find public key for token")
+        self.mock_get.assert_not_called()
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', None)
+    def test_warm_jwks_cache(self):
+        """Test that warming fetches JWKS and constructs its keys up front."""
+        key = {**jwk.construct(TEST_PUBLIC_KEY, 'RS256').to_dict(), 'kid': 'key-1'}
+        self.mock_get.return_value.json.return_value = {'keys': [key]}
+
+        warm_jwks_cache()
+
+        self.mock_get.assert_called_once()
+        self.assertIn('key-1', _constructed_keys)
+        self.assertIsNotNone(_jwks_cache.get())
+
+    def test_stale_keys_served_during_refresh(self):
+        """Test that stale keys are returned while another worker refreshes."""
+        stale = {'keys': [{'kid': 'old'}]}
+        fetched_at = time.time() - JWKS_REFRESH_AFTER_SECONDS - 1
+        cache.set(JWKS_SHARED_CACHE_KEY, {'keys': stale, 'fetched_at': fetched_at})
+        cache.add(JWKS_REFRESH_LOCK_KEY, True)
+
+        self.assertEqual(get_jwks_keys(), stale)
+        self.mock_get.assert_not_called()
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', None)
+    @patch('watson.middleware.jwt_auth.PASSPORT_ISSUER', 'https://passport.oceanheart.ai')
+    @patch('watson.middleware.jwt_auth.PASSPORT_AUDIENCE', 'watson.oceanheart.ai')
+    def test_jwks_key_constructed_once(self):
+        """Test that a JWKS key is parsed once and reused across verifies."""
+        key = {**jwk.construct(TEST_PUBLIC_KEY, 'RS256').to_dict(), 'kid': 'key-1'}
+        self.mock_get.return_value.json.return_value = {'keys': [key]}
+        token = jwt.encode(
+            jwt.get_unverified_claims(create_test_token()),
+            get_test_signing_key(),
+            algorithm='RS256',
+            headers={'kid': 'key-1'},
+        )
+
+        self.assertTrue(verify_jwt_token(token)[0])
+        clear_verified_token_cache()
+        with patch('watson.middleware.jwt_auth.jwk.construct') as construct:
+            is_valid, payload, error = verify_jwt_token(token)
+        construct.assert_not_called()
+        self.assertTrue(is_valid, error)
+        self.assertEqual(payload['sub'], 'user-123')
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', None)
+    @patch('watson.middleware.jwt_auth.PASSPORT_ISSUER', 'https://passport.oceanheart.ai')
+    @patch('watson.middleware.jwt_auth.PASSPORT_AUDIENCE', 'watson.oceanheart.ai')
+    def test_unknown_kid_refreshes_once(self):
+        """Test that an unknown kid refetches JWKS, rate limited by the lock."""
+        rotated = {**jwk.construct(TEST_PUBLIC_KEY, 'RS256').to_dict(), 'kid': 'key-2'}
+        get_jwks_keys()  # caches JWKS without key-2
+        self.mock_get.return_value.json.return_value = {'keys': [rotated]}
+
+        def token_for(kid):
+            return jwt.encode(
+                jwt.get_unverified_claims(create_test_token()),
+                get_test_signing_key(),
+                algorithm='RS256',
+                headers={'kid': kid},
+            )
+
+        self.assertTrue(verify_jwt_token(token_for('key-2'))[0])
+        self.assertEqual(self.mock_get.call_count, 2)
+
+        self.assertFalse(verify_jwt_token(token_for('key-3'))[0])
+        self.assertEqual(self.mock_get.call_count, 2)
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', None)
+    @patch('watson.middleware.jwt_auth.PASSPORT_ISSUER', 'https://passport.oceanheart.ai')
+    @patch('watson.middleware.jwt_auth.PASSPORT_AUDIENCE', 'watson.oceanheart.ai')
+    def test_es256_jwks_key(self):
+        """Test that tokens signed with an EC JWKS key verify."""
+        signing_key = jwk.construct(ec.generate_private_key(ec.SECP256R1()), 'ES256')
+        key = {**signing_key.public_key().to_dict(), 'kid': 'ec-1'}
+        del key['alg']  # inferred from kty
+        self.mock_get.return_value.json.return_value = {'keys': [key]}
+        claims = jwt.get_unverified_claims(create_test_token())
+        token = jwt.encode(claims, signing_key, algorithm='ES256', headers={'kid': 'ec-1'})
+
+        is_valid, payload, error = verify_jwt_token(token)
+        self.assertTrue(is_valid, error)
+        self.assertEqual(payload['sub'], 'user-123')
+
+        # An RSA signature under the EC key's kid fails verification
+        forged = jwt.encode(claims, get_test_signing_key(), algorithm='RS256', headers={'kid': 'ec-1'})
+        self.assertFalse(verify_jwt_token(forged)[0])
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', None)
+    @patch('watson.middleware.jwt_auth.PASSPORT_ISSUER', 'https://passport.oceanheart.ai')
+    @patch('watson.middleware.jwt_auth.PASSPORT_AUDIENCE', 'watson.oceanheart.ai')
+    def test_header_alg_must_match_key(self):
+        """Test that a token whose header alg differs from its key's is rejected."""
+        key = {**jwk.construct(TEST_PUBLIC_KEY, 'RS256').to_dict(), 'kid': 'key-1'}
+        self.mock_get.return_value.json.return_value = {'keys': [key]}
+        token = jwt.encode(
+            jwt.get_unverified_claims(create_test_token()),
+            get_test_signing_key(),
+            algorithm='RS256',
+            headers={'kid': 'key-1', 'alg': 'ES256'},
+        )
+        self.assertEqual(jwt.get_unverified_header(token)['alg'], 'ES256')
+
+        is_valid, payload, error = verify_jwt_token(token)
+        self.assertFalse(is_valid)
+        self.assertIn("alg", error)
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', None)
+    def test_symmetric_jwks_key_rejected(self):
+        """Test that an HMAC key published in JWKS is never used to verify."""
+        secret = 'published-secret'
+        key = {**jwk.construct(secret, 'HS256').to_dict(), 'kid': 'oct-1'}
+        self.mock_get.return_value.json.return_value = {'keys': [key]}
+        token = jwt.encode(
+            jwt.get_unverified_claims(create_test_token()),
+            secret,
+            algorithm='HS256',
+            headers={'kid': 'oct-1'},
+        )
+
+        is_valid, payload, error = verify_jwt_token(token)
+        self.assertFalse(is_valid)
+        self.assertEqual(error, "Could not find public key for token")
+
+    def test_stale_keys_refreshed_in_background(self):
+        """Test that the refresh lock winner refetches without blocking."""
+        stale = {'keys': []}
+        fetched_at = time.time() - JWKS_REFRESH_AFTER_SECONDS - 1
+        cache.set(JWKS_SHARED_CACHE_KEY, {'keys': stale, 'fetched_at': fetched_at})
+
+        self.assertEqual(get_jwks_keys(), stale)
+        for thread in threading.enumerate():
+            if thread.name == 'jwks-refresh':
+                thread.join()
+
+        self.assertEqual(self.mock_get.call_count, 1)
+        self.assertEqual(cache.get(JWKS_SHARED_CACHE_KEY)['keys'], self.JWKS)
+        self.assertEqual(get_jwks_keys(), self.JWKS)
+
+
+class VerifiedTokenCacheTestCase(SimpleTestCase):
+    """Tests for reusing verified token claims."""
+
+    def setUp(self):
+        clear_verified_token_cache()
+        self.addCleanup(clear_verified_token_cache)
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', TEST_PUBLIC_KEY)
+    @patch('watson.middleware.jwt_auth.PASSPORT_ISSUER', 'https://passport.oceanheart.ai')
+    @patch('watson.middleware.jwt_auth.PASSPORT_AUDIENCE', 'watson.oceanheart.ai')
+    def test_repeated_token_skips_verification(self):
+        """Test that a token verified once isn't decoded again."""
+        token = create_test_token()
+        self.assertTrue(verify_jwt_token(token)[0])
+
+        with patch('watson.middleware.jwt_auth.jwt.decode') as decode:
+            is_valid, payload, error = verify_jwt_token(token)
+        decode.assert_not_called()
+        self.assertTrue(is_valid)
+        self.assertEqual(payload['email'], 'test@example.com')
+
+    @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', TEST_PUBLIC_KEY)
+    def test_invalid_token_not_cached(self):
+        """Test that failed verifications are retried on the next request."""
+        token = create_test_token(exp_offset=-3600)
+        self.assertFalse(verify_jwt_token(token)[0])
+
+        with patch('watson.middleware.jwt_auth.jwt.decode', side_effect=jwt.JWTError) as decode:
+            self.assertFalse(verify_jwt_token(token)[0])
+        self.assertTrue(decode.called)
+
+    def test_entry_expires_with_token(self):
+        """Test that cached claims never outlive the token's exp."""
+        cache = VerifiedTokenCache(ttl_seconds=60)
+        cache.set('token', {'exp': int(time.time()) - 1})
+        self.assertIsNone(cache.get('token'))
+
+    def test_least_recently_used_evicted(self):
+        """Test that the cache is bounded, evicting the oldest lookup."""
+        cache = VerifiedTokenCache(max_entries=2)
+        cache.set('a', {'sub': 'a'})
+        cache.set('b', {'sub': 'b'})
+        cache.get('a')
+        cache.set('c', {'sub': 'c'})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'sub': 'a'})
+        self.assertEqual(cache.get('c'), {'sub': 'c'})
+
+
+class IntegrationTestCase(SimpleTestCase):
     """Integration tests for JWT authentication with DRF views."""
 
     def setUp(self):
         self.factory = APIRequestFactory()
         clear_jwks_cache()
+        clear_verified_token_cache()
 
     @patch('watson.middleware.jwt_auth.JWT_PUBLIC_KEY', TEST_PUBLIC_KEY)
     @patch('watson.middleware.jwt_auth.PASSPORT_ISSUER', 'https://passport.oceanheart.ai')
@@ -0,0 +1,46 @@
+"""
+DRF renderers for the Watson API.
+"""
+import orjson
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+# Types orjson can't serialize natively (Decimal, lazy translation strings,
+# querysets, ...) fall back to DRF's own encoder.
+_fallback_default = JSONEncoder().default
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Drop-in replacement for rest_framework.renderers.JSONRenderer: output is
+    compact UTF-8 (no ASCII escaping), UTC datetimes end in 'Z', and an
+    ``indent`` media type parameter switches to two-space indentation.
+    Data orjson can't encode (integers past 64 bits) is rendered by
+    JSONRenderer instead.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = self.options
+        if accepted_media_type and 'indent' in accepted_media_type:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            ret = orjson.dumps(data, default=_fallback_default, option=option)
+        except orjson.JSONEncodeError:
+            return JSONRenderer().render(data, accepted_media_type, renderer_context)
+
+        # Match JSONRenderer: escape line/paragraph separators so the
+        # output is also valid JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
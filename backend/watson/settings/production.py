@@ -21,10 +21,41 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'HOST': os.environ.get('DB_HOST'),
         'PORT': os.environ.get('DB_PORT', '5432'),
-        'CONN_MAX_AGE': 60,
+        # Keep connections open for the life of the worker so views and
+        # health probes don't pay a TCP + auth handshake each time; stale
+        # connections are checked before reuse, and gunicorn's
+        # max_requests recycles workers (and their connections). Set
+        # DB_CONN_MAX_AGE to a number of seconds to cap connection age.
+        'CONN_MAX_AGE': int(os.environ['DB_CONN_MAX_AGE']) if os.environ.get('DB_CONN_MAX_AGE') else None,
+        'CONN_HEALTH_CHECKS': True,
     }
 } if os.environ.get('DATABASE_URL') else DATABASES
 
+# Behind pgbouncer in transaction pooling mode, server-side cursors can't
+# survive across pooled transactions.
+if os.environ.get('DB_PGBOUNCER', 'false').lower() == 'true':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Cache shared by every worker: analytics, health probes, pagination
+# counts and the JWKS keys and refresh lock (cache.add) in
+# watson.middleware.jwt_auth all rely on it. Redis when REDIS_URL is set;
+# otherwise a file cache, which is shared by the workers on one host only
+# and whose add() is not atomic, so concurrent JWKS refreshes may overlap.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_DIR', '/tmp/watson-cache'),
+        }
+    }
+
 # Security settings for production
 SECURE_SSL_REDIRECT = os.environ.get('SECURE_SSL_REDIRECT', 'true').lower() == 'true'
 SESSION_COOKIE_SECURE = True
@@ -50,9 +81,11 @@ LOGGING = {
         },
     },
     'handlers': {
+        # File IO runs on a listener thread, so request threads (e.g.
+        # django.request logging every 4xx) never block on a write
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            '()': 'watson.log.QueuedFileHandler',
             'filename': '/var/log/watson/django.log',
             'formatter': 'verbose',
         },
@@ -15,6 +15,19 @@ DATABASES = {
     }
 }
 
+# Optional Postgres run (exercises the pg_trgm and JSON expression
+# indexes SQLite skips). Reuse the database between runs with
+# `manage.py test --keepdb`; in CI, point WATSON_TEST_DB_TEMPLATE at a
+# pre-built database so creation is a file copy instead of a schema build.
+if os.environ.get('WATSON_TEST_DATABASE_URL'):
+    DATABASES = {
+        'default': dj_database_url.parse(os.environ['WATSON_TEST_DATABASE_URL'])
+    }
+    DATABASES['default']['TEST'] = {
+        'NAME': os.environ.get('WATSON_TEST_DB_NAME', 'test_watson'),
+        'TEMPLATE': os.environ.get('WATSON_TEST_DB_TEMPLATE'),
+    }
+
 # Disable migrations during tests for speed
 class DisableMigrations:
     def __contains__(self, item):
@@ -66,10 +79,13 @@ COVERAGE_MODULE_EXCLUDES = [
 # Disable CORS during tests
 CORS_ALLOW_ALL_ORIGINS = True
 
-# Disable throttling during tests
+# Disable throttling during tests; the test client sends JSON bodies by
+# default, the only format the API parses
 REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
     'DEFAULT_THROTTLE_CLASSES': [],
     'DEFAULT_THROTTLE_RATES': {},
+    'TEST_REQUEST_DEFAULT_FORMAT': 'json',
 }
 
 # JWT Test Configuration
@@ -0,0 +1,159 @@
+"""
+Tests for shared Watson JSON helpers.
+"""
+import datetime
+import decimal
+import json
+import logging
+import os
+import tempfile
+import uuid
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core.models import Document
+
+from .encoders import OrjsonDecoder, OrjsonEncoder
+from .log import QueuedFileHandler
+from .renderers import ORJSONRenderer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    """Tests for the orjson-backed DRF renderer."""
+
+    def setUp(self):
+        self.renderer = ORJSONRenderer()
+
+    def test_render_none(self):
+        """Test that None renders as an empty body."""
+        self.assertEqual(self.renderer.render(None), b'')
+
+    def test_render_unicode_unescaped(self):
+        """Test that non-ASCII text is emitted as UTF-8."""
+        ret = self.renderer.render({'name': 'Zoë'})
+        self.assertEqual(ret, '{"name":"Zoë"}'.encode('utf-8'))
+
+    def test_render_native_types(self):
+        """Test UUIDs, UTC datetimes, decimals and non-string keys."""
+        value = uuid.uuid4()
+        ret = self.renderer.render({
+            'id': value,
+            'at': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+            'score': decimal.Decimal('1.5'),
+            1: 'one',
+        })
+        self.assertEqual(json.loads(ret), {
+            'id': str(value),
+            'at': '2024-01-01T00:00:00Z',
+            'score': 1.5,
+            '1': 'one',
+        })
+
+    def test_render_escapes_line_separators(self):
+        """Test that U+2028/U+2029 are escaped like JSONRenderer."""
+        ret = self.renderer.render({'text': 'a\u2028b\u2029c'})
+        self.assertEqual(ret, b'{"text":"a\\u2028b\\u2029c"}')
+
+    def test_render_indent(self):
+        """Test that an indent media type parameter pretty-prints."""
+        ret = self.renderer.render({'a': 1}, 'application/json; indent=2')
+        self.assertEqual(ret, b'{\n  "a": 1\n}')
+
+    def test_render_large_integer(self):
+        """Test integers past 64 bits fall back to JSONRenderer."""
+        ret = self.renderer.render({'n': 10**20, 'name': 'Zoë'})
+        self.assertEqual(json.loads(ret), {'n': 10**20, 'name': 'Zoë'})
+
+
+class OrjsonJSONFieldTestCase(TestCase):
+    """Tests for the orjson JSONField encoder/decoder."""
+
+    def test_encoder_matches_stdlib(self):
+        """Test that encoded output parses back to the same value."""
+        value = {'text': 'Zoë', 'items': [1, 2.5, None, True]}
+        encoded = json.dumps(value, cls=OrjsonEncoder)
+        self.assertEqual(json.loads(encoded), value)
+        self.assertIn('Zoë', encoded)
+
+    def test_decoder_raises_json_decode_error(self):
+        """Test that invalid input raises the stdlib error type."""
+        with self.assertRaises(json.JSONDecodeError):
+            json.loads('{invalid', cls=OrjsonDecoder)
+
+    def test_document_round_trip(self):
+        """Test that Document JSON fields round-trip through the database."""
+        content = {'text': 'Zoë', 'sections': [{'title': 'Plan', 'items': [1, 2]}]}
+        doc = Document.objects.create(raw_content=content, metadata={'n': 1})
+        doc.refresh_from_db()
+        self.assertEqual(doc.raw_content, content)
+        self.assertEqual(doc.metadata, {'n': 1})
+
+    def test_large_integer_round_trip(self):
+        """Test integers past 64 bits are stored and read back exactly."""
+        doc = Document.objects.create(raw_content={'n': 10**20, 'm': -2**63 - 1})
+        doc.refresh_from_db()
+        self.assertEqual(doc.raw_content, {'n': 10**20, 'm': -2**63 - 1})
+        self.assertIsInstance(doc.raw_content['n'], int)
+
+
+class URLConfTestCase(SimpleTestCase):
+    """Tests that the API paths the app tests hardcode still resolve."""
+
+    def test_api_paths(self):
+        """Test router names reverse to the literal paths used in tests."""
+        pk = uuid.uuid4()
+        for name, kwargs, path in [
+            ('document-list', {}, '/api/documents/'),
+            ('document-detail', {'pk': pk}, f'/api/documents/{pk}/'),
+            ('document-raw', {'pk': pk}, f'/api/documents/{pk}/raw/'),
+            ('output-list', {}, '/api/outputs/'),
+            ('output-detail', {'pk': pk}, f'/api/outputs/{pk}/'),
+            ('label-list', {}, '/api/labels/'),
+            ('label-detail', {'pk': pk}, f'/api/labels/{pk}/'),
+            ('edit-list', {}, '/api/edits/'),
+            ('edit-detail', {'pk': pk}, f'/api/edits/{pk}/'),
+            ('edit-submit', {'pk': pk}, f'/api/edits/{pk}/submit/'),
+            ('analytics', {}, '/api/analytics/'),
+            ('exports', {}, '/api/exports/'),
+        ]:
+            with self.subTest(name=name):
+                self.assertEqual(reverse(name, kwargs=kwargs), path)
+
+
+class QueuedFileHandlerTestCase(SimpleTestCase):
+    """Tests for the background-thread file log handler."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'django.log')
+        self.handler = QueuedFileHandler(self.path)
+        self.handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        self.logger = logging.getLogger('watson.tests.queued')
+        self.logger.addHandler(self.handler)
+        self.logger.propagate = False
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def read_log(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_close_flushes_records(self):
+        """Test that queued records are written to the file on close."""
+        self.logger.warning('first %s', 'record')
+        self.logger.warning('second')
+        self.handler.close()
+        self.assertEqual(self.read_log(), 'WARNING first record\nWARNING second\n')
+
+    def test_listener_restarts_after_fork(self):
+        """Test that a new process starts its own listener and queue."""
+        self.logger.warning('parent')
+        parent_queue = self.handler.queue
+        self.addCleanup(self.handler._listener.stop)
+        with patch('watson.log.os.getpid', return_value=-1):
+            self.logger.warning('child')
+            self.assertIsNot(self.handler.queue, parent_queue)
+            self.handler.close()
+        self.assertIn('WARNING child\n', self.read_log())
@@ -8,7 +8,11 @@ backlog = 2048
 
 # Worker processes
 workers = int(os.environ.get('GUNICORN_WORKERS', 3))
-worker_class = "sync"
+# Threaded workers keep serving other requests while one waits on the
+# database or streams an export. Each thread holds its own persistent
+# database connection, so workers * threads connections are kept open.
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
 worker_connections = 1000
 timeout = 30
 keepalive = 2
@@ -40,5 +44,14 @@ tmp_upload_dir = None
 # Preload application for better memory usage
 preload_app = True
 
+
+def when_ready(server):
+    # Runs in the master before workers fork. With preload_app, Django is
+    # already set up here, so fetch JWKS once and let workers inherit it
+    if server.cfg.preload_app:
+        from watson.middleware.jwt_auth import warm_jwks_cache
+
+        warm_jwks_cache()
+
 # Application module and variable name
 wsgi_module = 'watson.wsgi'
\ No newline at end of file